@@ -0,0 +1 @@
+"""Performance benchmarks for AI Talent Matcher."""
@@ -0,0 +1,169 @@
+"""Synthetic resume/JD corpus generation for benchmarks."""
+from pathlib import Path
+from typing import Dict, List
+import json
+import random
+
+FIRST_NAMES = ["Maria", "Juan", "Ana", "Carlos", "Laura", "David", "Sofia", "Miguel", "Elena", "Pablo", "Lucia", "Jorge"]
+LAST_NAMES = ["Garcia", "Martinez", "Lopez", "Sanchez", "Torres", "Ruiz", "Morales", "Diaz", "Vega", "Castro", "Romero", "Navarro"]
+SKILLS = [
+    "Python", "FastAPI", "Django", "Flask", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Docker",
+    "Kubernetes", "AWS", "GCP", "Azure", "Terraform", "Git", "Linux", "JavaScript", "TypeScript",
+    "React", "Angular", "Vue", "Node", "Java", "Spring", "Kafka", "Spark", "SQL", "CI/CD",
+]
+POSITIONS = ["Backend Developer", "Frontend Developer", "Fullstack Engineer", "Data Engineer", "DevOps Engineer", "Cloud Architect"]
+COMPANIES = ["Tech Solutions S.A.", "StartupXYZ", "Digital Innovations Corp.", "CloudWorks", "DataLab", "FinTech Iberia"]
+INSTITUTIONS = ["Universidad Politecnica de Madrid", "Universidad de Barcelona", "Universidad de Sevilla", "Universidad de Valencia"]
+
+SCALES = {"10": 10, "1k": 1_000, "100k": 100_000}
+
+
+def parse_scale(scale: str) -> int:
+    """Convert a scale label (10, 1k, 100k) or plain integer to a count."""
+    return SCALES.get(scale, None) or int(scale)
+
+
+def make_resume(index: int, rng: random.Random) -> Dict:
+    """Generate one structured resume in the repo's JSON format."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = rng.sample(SKILLS, rng.randint(4, 10))
+    experience = []
+    year = 2024
+    for _ in range(rng.randint(1, 3)):
+        years = rng.randint(1, 4)
+        experience.append({
+            "company": rng.choice(COMPANIES),
+            "position": rng.choice(POSITIONS),
+            "dates": f"{year - years}-{year}",
+            "duration_years": years,
+            "description": f"Built services with {', '.join(rng.sample(skills, min(3, len(skills))))}.",
+        })
+        year -= years
+    education = [{"institution": rng.choice(INSTITUTIONS), "degree": "Ingenieria Informatica", "year": str(year)}]
+
+    lines = [name, experience[0]["position"], "", f"Skills: {', '.join(skills)}", "", "Experience:"]
+    for exp in experience:
+        lines.append(f"{exp['company']} ({exp['dates']}) - {exp['position']}")
+        lines.append(exp["description"])
+    lines += ["", "Education:", f"{education[0]['degree']} - {education[0]['institution']} university ({education[0]['year']})"]
+
+    return {
+        "candidate_id": f"BENCH_CAND_{index:06d}",
+        "name": name,
+        "skills": skills,
+        "experience": experience,
+        "education": education,
+        "raw_text": "\n".join(lines),
+    }
+
+
+def make_jd(index: int, rng: random.Random) -> Dict:
+    """Generate one structured job description in the repo's JSON format."""
+    position = rng.choice(POSITIONS)
+    must_have = rng.sample(SKILLS, 4)
+    nice_to_have = rng.sample([s for s in SKILLS if s not in must_have], 3)
+    description = f"We are hiring a {position} to build scalable products."
+    raw_text = "\n".join(
+        [position, "", description, "", "Required:"]
+        + [f"- {req}" for req in must_have]
+        + ["", "Nice to have:"]
+        + [f"- {req}" for req in nice_to_have]
+    )
+    return {
+        "jd_id": f"BENCH_JD_{index:04d}",
+        "title": position,
+        "must_have_requirements": must_have,
+        "nice_to_have": nice_to_have,
+        "description": description,
+        "experience_years_required": rng.randint(1, 6),
+        "raw_text": raw_text,
+    }
+
+
+def _pdf_escape(text: str) -> str:
+    """Escape text for a PDF string literal."""
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: Path, text: str):
+    """
+    Write a minimal single-page text PDF (Helvetica, WinAnsi).
+
+    Args:
+        path: Output file path
+        text: Text content, one PDF line per text line
+    """
+    body = ["BT", "/F1 10 Tf", "12 TL", "50 800 Td"]
+    for line in text.splitlines():
+        body.append(f"({_pdf_escape(line)}) Tj T*")
+    body.append("ET")
+    stream = "\n".join(body).encode("latin-1", errors="replace")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+    ]
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode()
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+
+    path.write_bytes(bytes(output))
+
+
+def generate_corpus(
+    resumes_dir: Path,
+    jds_dir: Path,
+    num_resumes: int,
+    num_jds: int,
+    formats: List[str],
+    seed: int = 42,
+) -> Dict[str, int]:
+    """
+    Write a synthetic corpus of resumes and JDs, cycling through the given formats.
+
+    Args:
+        resumes_dir: Directory for raw resume files
+        jds_dir: Directory for raw JD files
+        num_resumes: Number of resumes to generate
+        num_jds: Number of job descriptions to generate
+        formats: File formats to cycle through (json, txt, pdf)
+        seed: Random seed
+
+    Returns:
+        Count of generated files per format
+    """
+    rng = random.Random(seed)
+    resumes_dir.mkdir(parents=True, exist_ok=True)
+    jds_dir.mkdir(parents=True, exist_ok=True)
+    counts = {fmt: 0 for fmt in formats}
+
+    for kind, directory, total, factory in (
+        ("resume", resumes_dir, num_resumes, make_resume),
+        ("jd", jds_dir, num_jds, make_jd),
+    ):
+        for index in range(total):
+            data = factory(index, rng)
+            fmt = formats[index % len(formats)]
+            path = directory / f"{kind}_{index:06d}.{fmt}"
+            if fmt == "json":
+                path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            elif fmt == "txt":
+                path.write_text(data["raw_text"], encoding="utf-8")
+            elif fmt == "pdf":
+                write_pdf(path, data["raw_text"])
+            else:
+                raise ValueError(f"Unsupported corpus format: {fmt}")
+            counts[fmt] += 1
+
+    return counts
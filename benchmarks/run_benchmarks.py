@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+End-to-end performance benchmarks for AI Talent Matcher.
+
+Generates a synthetic corpus, then times ingestion (AutoProcessor), storage
+reads, the scoring loop against the mock LLM, the /api/results endpoint, CSV
+export and JSON serialization (json module vs orjson). Reports throughput and p50/p99 latency and saves a JSON report.
+
+Usage:
+    python benchmarks/run_benchmarks.py --scale 1k
+    python benchmarks/run_benchmarks.py --scale 10 --save-baseline
+    python benchmarks/run_benchmarks.py --scale 10 --formats json,txt,pdf --skip scoring
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.corpus import generate_corpus, parse_scale
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+BENCHMARKS = ["ingestion", "storage", "scoring", "results_api", "csv_export", "semantic_scoring", "serialization"]
+
+
+def configure_environment(workdir: Path, mock_latency_ms: float):
+    """Point every data path at the benchmark workspace (must run before importing src)."""
+    os.environ.update({
+        "STORAGE_PATH": str(workdir / "storage"),
+        "CACHE_PATH": str(workdir / "cache"),
+        "OUTPUT_DIR": str(workdir / "output"),
+        "RESUMES_RAW_DIR": str(workdir / "resumes" / "raw"),
+        "RESUMES_PROCESSED_DIR": str(workdir / "resumes" / "processed"),
+        "JD_RAW_DIR": str(workdir / "job_descriptions" / "raw"),
+        "JD_PROCESSED_DIR": str(workdir / "job_descriptions" / "processed"),
+        "LLM_PROVIDER": "mock",
+        "LLM_PROVIDERS": "",
+        "MOCK_LLM_LATENCY_MS": str(mock_latency_ms),
+    })
+    # Measure the pipeline, not the client-side throttle, unless explicitly configured
+    os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "0")
+    os.environ.setdefault("LLM_TOKENS_PER_MINUTE", "0")
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float], wall_seconds: Optional[float] = None, items: Optional[int] = None) -> Dict:
+    """
+    Summarize latency samples (seconds).
+
+    Args:
+        samples: Per-operation latencies
+        wall_seconds: Wall-clock time of the whole run (defaults to the sum of samples)
+        items: Items processed (defaults to the number of samples)
+
+    Returns:
+        Summary with throughput and p50/p99 latency in milliseconds
+    """
+    ordered = sorted(samples)
+    wall = wall_seconds if wall_seconds is not None else sum(samples)
+    count = items if items is not None else len(samples)
+    return {
+        "count": count,
+        "wall_seconds": round(wall, 4),
+        "throughput_per_second": round(count / wall, 2) if wall > 0 else None,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+def timed(samples: List[float], fn: Callable) -> Callable:
+    """Wrap `fn` so each call appends its latency to `samples`."""
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+    return wrapper
+
+
+def repeat(fn: Callable, times: int) -> Dict:
+    """Call `fn` `times` times and summarize."""
+    samples = []
+    call = timed(samples, fn)
+    for _ in range(times):
+        call()
+    return summarize(samples)
+
+
+def bench_ingestion(ctx: Dict) -> Dict:
+    """Time AutoProcessor.process_all over the raw corpus."""
+    from src.startup import AutoProcessor
+
+    processor = AutoProcessor()
+    resume_samples, jd_samples = [], []
+    processor._process_resume_file = timed(resume_samples, processor._process_resume_file)
+    processor._process_jd_file = timed(jd_samples, processor._process_jd_file)
+
+    started = time.perf_counter()
+    stats = processor.process_all()
+    wall = time.perf_counter() - started
+
+    return {
+        "process_all": summarize(resume_samples + jd_samples, wall),
+        "resume_file": summarize(resume_samples),
+        "jd_file": summarize(jd_samples),
+        "failed": stats["resumes"]["failed"] + stats["job_descriptions"]["failed"],
+    }
+
+
+def bench_storage(ctx: Dict) -> Dict:
+    """Time LocalStorage list/search/get."""
+    from src.storage import LocalStorage
+
+    storage = LocalStorage()
+    summaries = storage.list_resumes()
+    rng = random.Random(7)
+    sample = rng.sample(summaries, min(ctx["samples"], len(summaries)))
+
+    get_by_id, get_by_file = [], []
+    for summary in sample:
+        timed(get_by_id, storage.get_resume)(summary["candidate_id"])
+        timed(get_by_file, storage.get_resume)(summary["file_id"])
+
+    return {
+        "list_resumes": repeat(storage.list_resumes, ctx["repeat"]),
+        "list_jds": repeat(storage.list_jds, ctx["repeat"]),
+        "page_resumes_summary": repeat(lambda: storage.page_resumes(["candidate_id", "name"], 0, 50), ctx["repeat"]),
+        "page_resumes_full": repeat(lambda: storage.page_resumes(None, 0, 50), ctx["repeat"]),
+        "search_hit": repeat(lambda: storage.search("python", "resume"), ctx["repeat"]),
+        "search_miss": repeat(lambda: storage.search("cobol-mainframe", "resume"), ctx["repeat"]),
+        "get_resume_by_id": summarize(get_by_id),
+        "get_resume_by_file": summarize(get_by_file),
+    }
+
+
+def bench_scoring(ctx: Dict) -> Dict:
+    """Time the process_pipeline scoring loop against the mock LLM."""
+    from src import main
+    from src.config import config
+
+    jd_files = sorted(config.storage_jd_path.glob("*.json"))
+    resume_files = sorted(str(path) for path in config.storage_resume_path.glob("*.json"))
+    if ctx["max_scored"]:
+        resume_files = resume_files[:ctx["max_scored"]]
+
+    samples = []
+    original = main.score_resume
+    main.score_resume = timed(samples, original)
+    try:
+        main.processing_state.update(status="processing", progress=0, total=len(resume_files), results=[], errors=[])
+        started = time.perf_counter()
+        main.process_pipeline(resume_files, str(jd_files[0]), None, True)
+        wall = time.perf_counter() - started
+    finally:
+        main.score_resume = original
+
+    return {
+        "score_resume": summarize(samples, wall),
+        "errors": len(main.processing_state["errors"]),
+    }
+
+
+def bench_semantic_scoring(ctx: Dict) -> Dict:
+    """Time process_pipeline in embedding mode (no LLM calls), cold and with cached vectors."""
+    from src import main
+    from src.config import config
+
+    jd_files = sorted(config.storage_jd_path.glob("*.json"))
+    resume_files = sorted(str(path) for path in config.storage_resume_path.glob("*.json"))
+
+    report = {}
+    for run in ("cold", "warm"):
+        main.processing_state.update(status="processing", progress=0, total=len(resume_files), results=[], errors=[])
+        started = time.perf_counter()
+        main.process_pipeline(resume_files, str(jd_files[0]), None, True, scoring_mode="embedding")
+        wall = time.perf_counter() - started
+        report[f"pipeline_{run}"] = summarize([wall], wall, items=len(resume_files))
+    report["errors"] = len(main.processing_state["errors"])
+    return report
+
+
+def bench_results_api(ctx: Dict) -> Dict:
+    """Time GET /api/results through the ASGI app."""
+    from fastapi.testclient import TestClient
+    from src import main
+
+    client = TestClient(main.app)
+    response = client.get("/api/results")
+    if response.status_code != 200:
+        return {"skipped": f"/api/results returned {response.status_code}"}
+
+    return {
+        "get_results": repeat(lambda: client.get("/api/results"), ctx["repeat"]),
+        "response_bytes": len(response.content),
+    }
+
+
+def bench_csv_export(ctx: Dict) -> Dict:
+    """Time CSVExporter.export_results on the latest results."""
+    from src import main
+    from src.export import CSVExporter
+
+    latest = main.result_store.latest()
+    if latest is None or not len(latest):
+        return {"skipped": "no results to export"}
+    results = latest.page()
+
+    exporter = CSVExporter()
+    counter = iter(range(ctx["repeat"]))
+    return {
+        "export_results": repeat(lambda: exporter.export_results(results, f"bench_{next(counter)}.csv"), ctx["repeat"]),
+        "rows": len(results),
+    }
+
+
+def bench_serialization(ctx: Dict) -> Dict:
+    """Time JSON encode/decode of stored resumes and a 10k-row result set with each available backend."""
+    from src import serialization
+    from src.config import config
+
+    resumes = [serialization.read_json(path) for path in sorted(config.storage_resume_path.glob("*.json"))[:ctx["samples"]]]
+    if not resumes:
+        return {"skipped": "no stored resumes"}
+    rng = random.Random(7)
+    rows = [
+        {
+            "candidate_id": f"cand-{i}",
+            "name": f"Candidate {i}",
+            "final_score": round(rng.uniform(0, 100), 2),
+            "similarity_score": round(rng.random(), 4),
+            "must_have_matches": ["Python", "SQL"][: i % 3],
+            "reason_codes": ["SKILL_MATCH", "RECENT_EXPERIENCE"],
+            "rank": i + 1,
+        }
+        for i in range(10_000)
+    ]
+    payloads = {"resume": resumes, "results_10k": [{"results": rows, "total": len(rows)}]}
+
+    report = {"default_backend": serialization.BACKEND}
+    backends = ["stdlib"] + (["orjson"] if serialization.orjson is not None else [])
+    original = serialization.BACKEND
+    try:
+        for backend in backends:
+            serialization.BACKEND = backend
+            for name, documents in payloads.items():
+                encoded = [serialization.dumps(document) for document in documents]
+                size = sum(len(data) for data in encoded)
+                times = max(1, ctx["repeat"])
+                dumps = repeat(lambda: [serialization.dumps(document) for document in documents], times)
+                loads = repeat(lambda: [serialization.loads(data) for data in encoded], times)
+                for label, summary in (("dumps", dumps), ("loads", loads)):
+                    summary["mb_per_second"] = round(size / 1e6 / (summary["mean_ms"] / 1000), 1) if summary["mean_ms"] else None
+                    report[f"{backend}_{name}_{label}"] = summary
+                report[f"{name}_bytes"] = size
+    finally:
+        serialization.BACKEND = original
+    return report
+
+
+def compare(report: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Compare p50/p99 latencies against a baseline report.
+
+    Returns:
+        List of regression descriptions (empty if none)
+    """
+    regressions = []
+    print(f"\n{'operation':<40}{'p50 ms':>12}{'base':>12}{'p99 ms':>12}{'base':>12}")
+    for bench, ops in report["benchmarks"].items():
+        base_ops = baseline.get("benchmarks", {}).get(bench, {})
+        for op, current in ops.items():
+            previous = base_ops.get(op)
+            if not isinstance(current, dict) or not isinstance(previous, dict) or "p99_ms" not in current:
+                continue
+            name = f"{bench}.{op}"
+            print(f"{name:<40}{current['p50_ms']:>12.2f}{previous['p50_ms']:>12.2f}{current['p99_ms']:>12.2f}{previous['p99_ms']:>12.2f}")
+            for key in ("p50_ms", "p99_ms"):
+                if previous[key] > 0 and current[key] > previous[key] * (1 + threshold):
+                    regressions.append(f"{name} {key}: {previous[key]:.2f} -> {current[key]:.2f}")
+    return regressions
+
+
+def print_report(report: Dict):
+    """Print a readable summary of the report."""
+    print(f"\nScale: {report['scale']} resumes, {report['num_jds']} JDs, formats: {', '.join(report['formats'])}")
+    print(f"{'operation':<40}{'count':>8}{'items/s':>12}{'p50 ms':>12}{'p99 ms':>12}")
+    for bench, ops in report["benchmarks"].items():
+        for op, summary in ops.items():
+            if isinstance(summary, dict) and "p50_ms" in summary:
+                throughput = summary["throughput_per_second"] or 0.0
+                print(f"{bench + '.' + op:<40}{summary['count']:>8}{throughput:>12.1f}{summary['p50_ms']:>12.2f}{summary['p99_ms']:>12.2f}")
+            else:
+                print(f"{bench + '.' + op:<40}{summary}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Talent Matcher benchmarks")
+    parser.add_argument("--scale", default="10", help="Number of resumes: 10, 1k, 100k or an integer")
+    parser.add_argument("--jds", type=int, default=5, help="Number of job descriptions")
+    parser.add_argument("--formats", default="json,txt,pdf", help="Corpus formats to cycle through")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions for read benchmarks")
+    parser.add_argument("--samples", type=int, default=50, help="Random resumes fetched by get_resume")
+    parser.add_argument("--max-scored", type=int, default=0, help="Cap on resumes scored (0 = all)")
+    parser.add_argument("--mock-latency-ms", type=float, default=20.0, help="Median mock LLM latency")
+    parser.add_argument("--skip", default="", help="Comma separated benchmarks to skip")
+    parser.add_argument("--workdir", help="Keep the corpus and storage in this directory")
+    parser.add_argument("--output", help="Report path (defaults to benchmarks/results/)")
+    parser.add_argument("--baseline", help="Baseline report to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Also save the report as the baseline for this scale")
+    parser.add_argument("--regression-threshold", type=float, default=0.2, help="Allowed relative p50/p99 increase")
+    parser.add_argument("--verbose", action="store_true", help="Keep INFO logging from the application")
+    args = parser.parse_args()
+
+    num_resumes = parse_scale(args.scale)
+    formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    skip = {name.strip() for name in args.skip.split(",") if name.strip()}
+
+    temp_dir = None
+    if args.workdir:
+        workdir = Path(args.workdir)
+    else:
+        temp_dir = tempfile.TemporaryDirectory(prefix="talent_bench_")
+        workdir = Path(temp_dir.name)
+
+    configure_environment(workdir, args.mock_latency_ms)
+
+    print(f"Generating corpus in {workdir} ...")
+    started = time.perf_counter()
+    counts = generate_corpus(
+        Path(os.environ["RESUMES_RAW_DIR"]),
+        Path(os.environ["JD_RAW_DIR"]),
+        num_resumes,
+        args.jds,
+        formats,
+    )
+    print(f"Corpus ready in {time.perf_counter() - started:.1f}s: {counts}")
+
+    # Importing the app configures logging; quiet it down for the measurements
+    from src import main as app_main  # noqa: F401
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    ctx = {"repeat": args.repeat, "samples": args.samples, "max_scored": args.max_scored}
+    runners = {
+        "ingestion": bench_ingestion,
+        "storage": bench_storage,
+        "scoring": bench_scoring,
+        "results_api": bench_results_api,
+        "csv_export": bench_csv_export,
+        "semantic_scoring": bench_semantic_scoring,
+        "serialization": bench_serialization,
+    }
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "scale": num_resumes,
+        "num_jds": args.jds,
+        "formats": formats,
+        "mock_latency_ms": args.mock_latency_ms,
+        "python": sys.version.split()[0],
+        "benchmarks": {},
+    }
+    for name in BENCHMARKS:
+        if name in skip:
+            continue
+        print(f"Running {name} ...")
+        report["benchmarks"][name] = runners[name](ctx)
+
+    print_report(report)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench_{args.scale}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nReport saved to {output}")
+
+    baseline_path = RESULTS_DIR / f"baseline_{args.scale}.json"
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Baseline saved to {baseline_path}")
+
+    exit_code = 0
+    compare_path = Path(args.baseline) if args.baseline else (baseline_path if not args.save_baseline else None)
+    if compare_path and compare_path.exists():
+        regressions = compare(report, json.loads(compare_path.read_text(encoding="utf-8")), args.regression_threshold)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            exit_code = 1
+        else:
+            print("\nNo regressions against baseline")
+
+    if temp_dir:
+        temp_dir.cleanup()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
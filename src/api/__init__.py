@@ -0,0 +1,12 @@
+"""HTTP helpers for the API."""
+from .http_cache import CompressionMiddleware, conditional_get, etag_matches, make_etag
+from .responses import FastJSONResponse, json_response
+
+__all__ = [
+    "CompressionMiddleware",
+    "conditional_get",
+    "etag_matches",
+    "make_etag",
+    "FastJSONResponse",
+    "json_response",
+]
@@ -0,0 +1,158 @@
+"""Conditional GET (ETag / If-None-Match) and response compression for the API."""
+from typing import Optional
+import gzip
+import hashlib
+import logging
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.monitoring import metrics
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Content types worth compressing
+_COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/x-ndjson")
+
+
+def make_etag(*parts) -> str:
+    """
+    Weak ETag for a representation identified by version parts.
+
+    Weak, because the same version is served both compressed and uncompressed.
+
+    Args:
+        parts: Values that change whenever the response would (revision counters, query parameters)
+
+    Returns:
+        ETag header value
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    return any(tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == opaque for tag in tags)
+
+
+def conditional_get(request: Request, response: Response, endpoint: str, *version_parts) -> Optional[Response]:
+    """
+    Tag a response with its version and answer a matching If-None-Match with 304.
+
+    Args:
+        request: Incoming request
+        response: Response the endpoint's body will be sent with (gets the ETag)
+        endpoint: Endpoint name (part of the ETag, and the metrics label)
+        version_parts: Values identifying the response version
+
+    Returns:
+        A 304 response if the client already has this version, else None
+    """
+    etag = make_etag(endpoint, *version_parts)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        metrics.inc("talent_http_not_modified_total", labels={"endpoint": endpoint})
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def _accepted_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br (if available) or gzip from an Accept-Encoding header."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Compress large responses with brotli (when installed) or gzip.
+
+    Only complete bodies are compressed; streamed responses (more than one
+    body message) and already-encoded responses pass through unchanged.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        """
+        Initialize middleware.
+
+        Args:
+            app: ASGI application
+            minimum_size: Smallest body (bytes) worth compressing
+            gzip_level: gzip compression level
+            brotli_quality: brotli quality (low values compress fast enough for every request)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = _accepted_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=list(start["headers"]))
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES)
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            if encoding == "br":
+                compressed = brotli.compress(body, quality=self.brotli_quality)
+            else:
+                compressed = gzip.compress(body, compresslevel=self.gzip_level)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            start["headers"] = headers.raw
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
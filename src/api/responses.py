@@ -0,0 +1,33 @@
+"""JSON responses rendered by the configured serializer."""
+from typing import Any, Optional
+
+from starlette.responses import JSONResponse, Response
+
+from src import serialization
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with src.serialization (orjson when available)."""
+
+    def render(self, content: Any) -> bytes:
+        return serialization.dumps(content)
+
+
+def json_response(content: Any, response: Optional[Response] = None) -> FastJSONResponse:
+    """
+    Render plain JSON data directly, skipping FastAPI's jsonable_encoder pass.
+
+    Only for content that is already JSON-compatible (dicts/lists read from
+    storage or result logs); large payloads are where the encoder pass costs most.
+
+    Args:
+        content: JSON-compatible data
+        response: Injected endpoint response whose headers (ETag, X-Total-Count, ...) to keep
+
+    Returns:
+        Response to return from the endpoint
+    """
+    headers = None
+    if response is not None:
+        headers = {key: value for key, value in response.headers.items() if key not in ("content-length", "content-type")}
+    return FastJSONResponse(content, headers=headers)
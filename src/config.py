@@ -2,6 +2,7 @@
 from dataclasses import dataclass
 import os
 from pathlib import Path
+from typing import List
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,6 +14,8 @@ class Config:
     
     # LLM Provider Configuration (LangChain Unified)
     llm_provider: str = os.getenv("LLM_PROVIDER", "openai")
+    # Ordered failover chain, e.g. "openai,anthropic" (defaults to LLM_PROVIDER only)
+    llm_providers: str = os.getenv("LLM_PROVIDERS", "")
     
     # OpenAI Configuration
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
@@ -30,10 +33,50 @@ class Config:
     ollama_base_url: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     ollama_model: str = os.getenv("OLLAMA_MODEL", "llama2")
     
+    # Mock Provider Configuration (offline load testing, LLM_PROVIDER=mock)
+    mock_llm_latency_ms: float = float(os.getenv("MOCK_LLM_LATENCY_MS", "300"))
+    mock_llm_latency_sigma: float = float(os.getenv("MOCK_LLM_LATENCY_SIGMA", "0.5"))
+    mock_llm_error_rate: float = float(os.getenv("MOCK_LLM_ERROR_RATE", "0.0"))
+    mock_llm_rate_limit_rate: float = float(os.getenv("MOCK_LLM_RATE_LIMIT_RATE", "0.0"))
+    mock_llm_seed: int = int(os.getenv("MOCK_LLM_SEED", "42"))
+    
     # Common LLM Parameters
     llm_temperature: float = float(os.getenv("LLM_TEMPERATURE", "0.3"))
     llm_max_tokens: int = int(os.getenv("LLM_MAX_TOKENS", "2000"))
     llm_timeout: int = int(os.getenv("LLM_TIMEOUT", "60"))
+    # Native structured output (JSON schema / tool calling) for scoring, where the provider supports it
+    llm_structured_output: bool = os.getenv("LLM_STRUCTURED_OUTPUT", "true").lower() == "true"
+    # Stream scoring responses and publish provisional scores as soon as they arrive
+    llm_streaming: bool = os.getenv("LLM_STREAMING", "false").lower() == "true"
+    
+    # LLM Rate Limiting (per provider, 0 = unlimited)
+    llm_requests_per_minute: int = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+    llm_tokens_per_minute: int = int(os.getenv("LLM_TOKENS_PER_MINUTE", "150000"))
+    llm_initial_concurrency: int = int(os.getenv("LLM_INITIAL_CONCURRENCY", "4"))
+    llm_min_concurrency: int = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+    llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    # Fraction of the concurrency limit bulk jobs may occupy (the rest stays free for interactive calls)
+    llm_bulk_max_share: float = float(os.getenv("LLM_BULK_MAX_SHARE", "0.75"))
+    # Provider SDKs do not retry; an overloaded last provider in the chain is retried this often
+    llm_overload_retries: int = int(os.getenv("LLM_OVERLOAD_RETRIES", "2"))
+    
+    # Hedged Requests (race a backup provider when the primary is slower than its p95)
+    llm_hedge_enabled: bool = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+    llm_hedge_quantile: float = float(os.getenv("LLM_HEDGE_QUANTILE", "0.95"))
+    llm_hedge_initial_delay: float = float(os.getenv("LLM_HEDGE_INITIAL_DELAY", "10.0"))
+    llm_hedge_min_delay: float = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))
+    
+    # LLM Budgets (0 = no cap); once a cap is reached, remaining resumes get lexical scores
+    job_max_tokens: int = int(os.getenv("JOB_MAX_TOKENS", "0"))
+    job_max_cost_usd: float = float(os.getenv("JOB_MAX_COST_USD", "0"))
+    daily_max_tokens: int = int(os.getenv("DAILY_MAX_TOKENS", "0"))
+    daily_max_cost_usd: float = float(os.getenv("DAILY_MAX_COST_USD", "0"))
+    # JSON object of model -> [input, output] or [input, cached_input, output] USD per million tokens
+    llm_prices: str = os.getenv("LLM_PRICES", "")
+    
+    # Scoring Mode: llm, embedding (local, no LLM calls) or auto (embedding when no LLM is available)
+    scoring_mode: str = os.getenv("SCORING_MODE", "auto")
+    embedding_dim: int = int(os.getenv("EMBEDDING_DIM", "1024"))
     
     # Scoring Weights
     similarity_weight: float = float(os.getenv("SIMILARITY_WEIGHT", "0.6"))
@@ -43,6 +86,12 @@ class Config:
     # Storage Configuration
     storage_type: str = os.getenv("STORAGE_TYPE", "local")
     storage_path: str = os.getenv("STORAGE_PATH", "./data/storage")
+    # Also treat resumes with the same name + skill set as duplicates
+    resume_dedup_fingerprint: bool = os.getenv("RESUME_DEDUP_FINGERPRINT", "false").lower() == "true"
+    # Estimated Jaccard similarity (MinHash) above which resumes are versions of one CV
+    near_duplicate_threshold: float = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+    # Seconds between rescans for resumes edited in place when computing ETags (added/removed files are seen at once)
+    storage_sync_interval: float = float(os.getenv("STORAGE_SYNC_INTERVAL", "5.0"))
     
     # Cache Configuration
     enable_cache: bool = os.getenv("ENABLE_CACHE", "true").lower() == "true"
@@ -52,12 +101,29 @@ class Config:
     cache_scores: bool = os.getenv("CACHE_SCORES", "true").lower() == "true"
     cache_ttl: int = int(os.getenv("CACHE_TTL", "2592000"))  # 30 days default
     
+    # Bulk Ingestion Configuration
+    ingest_workers: int = int(os.getenv("INGEST_WORKERS", "4"))
+    archive_max_size_mb: int = int(os.getenv("ARCHIVE_MAX_SIZE_MB", "1024"))
+    archive_max_members: int = int(os.getenv("ARCHIVE_MAX_MEMBERS", "20000"))
+    
     # Output Configuration
     output_dir: str = os.getenv("OUTPUT_DIR", "./data/output")
+    # Resume the most recent interrupted processing run at startup (runs are checkpointed under OUTPUT_DIR/jobs)
+    resume_interrupted_jobs: bool = os.getenv("RESUME_INTERRUPTED_JOBS", "false").lower() == "true"
     csv_encoding: str = os.getenv("CSV_ENCODING", "utf-8")
+    # JSON for storage, result logs and API responses: auto (orjson if installed), orjson or stdlib
+    json_backend: str = os.getenv("JSON_BACKEND", "auto")
+    # Write stored resumes/JDs and matrix rankings without indentation (smaller, faster to write and read)
+    storage_json_compact: bool = os.getenv("STORAGE_JSON_COMPACT", "false").lower() == "true"
     
     # Prompt Paths
     prompts_dir: str = os.getenv("PROMPTS_DIR", "./src/prompts")
+    # Re-read prompt files when they are edited, checking at most every PROMPT_RELOAD_INTERVAL seconds
+    prompt_hot_reload: bool = os.getenv("PROMPT_HOT_RELOAD", "true").lower() == "true"
+    prompt_reload_interval: float = float(os.getenv("PROMPT_RELOAD_INTERVAL", "1.0"))
+    
+    # HTTP responses: compress bodies of at least this many bytes (brotli if installed, else gzip; 0 disables)
+    response_compression_min_bytes: int = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
     
     # Data Paths
     resumes_raw_dir: Path = Path(os.getenv("RESUMES_RAW_DIR", "./data/resumes/raw"))
@@ -75,6 +141,12 @@ class Config:
         """Path to storage for job descriptions."""
         return Path(self.storage_path) / "job_descriptions"
     
+    @property
+    def llm_provider_chain(self) -> List[str]:
+        """Ordered list of LLM providers to try (primary first)."""
+        providers = [p.strip().lower() for p in self.llm_providers.split(",") if p.strip()]
+        return providers or [self.llm_provider.lower()]
+    
     @property
     def output_path(self) -> Path:
         """Path to output directory."""
@@ -0,0 +1,18 @@
+"""Local text embeddings for LLM-free semantic similarity."""
+from .text_embedder import HashingTextEmbedder, document_text, tokenize
+from .embedding_cache import EmbeddingCache
+from .semantic_scorer import SemanticScorer
+from .vector_index import VectorIndex
+from .retriever import CandidateRetriever
+from .job_matcher import JobMatcher
+
+__all__ = [
+    "HashingTextEmbedder",
+    "document_text",
+    "tokenize",
+    "EmbeddingCache",
+    "SemanticScorer",
+    "VectorIndex",
+    "CandidateRetriever",
+    "JobMatcher",
+]
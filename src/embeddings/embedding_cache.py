@@ -0,0 +1,75 @@
+"""On-disk cache of document vectors keyed by content hash."""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+import logging
+import threading
+
+import numpy as np
+
+from src.config import config
+from src.monitoring import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """Store one .npy file per vector under cache_path/embeddings, with a small in-memory LRU."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, enabled: Optional[bool] = None, memory_items: int = 4096):
+        """
+        Initialize embedding cache.
+
+        Args:
+            cache_dir: Directory for vectors (defaults to cache_path/embeddings)
+            enabled: Whether to persist vectors (defaults to ENABLE_CACHE and CACHE_EMBEDDINGS)
+            memory_items: Vectors kept in memory
+        """
+        self.cache_dir = Path(cache_dir or Path(config.cache_path) / "embeddings")
+        self.enabled = (config.enable_cache and config.cache_embeddings) if enabled is None else enabled
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        # Two-level fan-out keeps directories small for large pools
+        return self.cache_dir / key[:2] / f"{key}.npy"
+
+    def _remember(self, key: str, vector: np.ndarray):
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Cached vector for a key, if any."""
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+        if vector is None and self.enabled:
+            path = self._path(key)
+            if path.exists():
+                try:
+                    vector = np.load(path)
+                    self._remember(key, vector)
+                except Exception as e:
+                    logger.warning(f"Could not read cached embedding {path.name}: {e}")
+        metrics.record_cache("embeddings", hit=vector is not None)
+        return vector
+
+    def set(self, key: str, vector: np.ndarray):
+        """Store a vector."""
+        self._remember(key, vector)
+        if not self.enabled:
+            return
+        try:
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, vector)
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.error(f"Could not cache embedding: {e}")
@@ -0,0 +1,137 @@
+"""Reverse matching: shortlist stored job descriptions for one candidate."""
+from pathlib import Path
+from typing import Dict, List
+import json
+import logging
+import threading
+
+import numpy as np
+
+from src.monitoring import metrics
+from src.scoring import jd_content_hash
+from src.storage import LocalStorage
+from .semantic_scorer import SemanticScorer
+from .text_embedder import document_text, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Weight of vector similarity in the shortlist pre-score (the rest is must-have coverage)
+SIMILARITY_WEIGHT = 0.7
+
+
+class JobMatcher:
+    """
+    Keep a profile of every stored JD (parsed JSON, vector, content hash and
+    tokenized must-haves) so a resume can be compared against all of them
+    with one matrix product instead of one pipeline run per JD.
+    """
+
+    def __init__(self, storage: LocalStorage, semantic_scorer: SemanticScorer):
+        """
+        Initialize job matcher.
+
+        Args:
+            storage: Storage holding the job descriptions
+            semantic_scorer: Provides cached JD/resume vectors
+        """
+        self.storage = storage
+        self.semantic_scorer = semantic_scorer
+        self._profiles: Dict[str, Dict] = {}
+        self._order: List[str] = []
+        self._matrix = np.zeros((0, semantic_scorer.embedder.dim), dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def _build_profile(self, path: Path, mtime: float) -> Dict:
+        with open(path, "r", encoding="utf-8") as f:
+            jd_data = json.load(f)
+        return {
+            "file_id": path.name,
+            "jd_id": jd_data.get("jd_id"),
+            "title": jd_data.get("title"),
+            "jd_data": jd_data,
+            "jd_hash": jd_content_hash(jd_data),
+            "vector": self.semantic_scorer.embed(jd_data),
+            "requirements": SemanticScorer.requirement_terms(jd_data),
+            "mtime": mtime,
+        }
+
+    def refresh(self) -> int:
+        """
+        Reload profiles of JDs added, changed or deleted since the last call.
+
+        Returns:
+            Number of JD profiles
+        """
+        with self._lock:
+            current = {}
+            for path in self.storage.jds_dir.glob("*.json"):
+                try:
+                    current[path.name] = (path, path.stat().st_mtime)
+                except OSError:
+                    continue
+
+            changed = set(self._profiles) - set(current)
+            for name in changed:
+                del self._profiles[name]
+            for name, (path, mtime) in current.items():
+                profile = self._profiles.get(name)
+                if profile is not None and profile["mtime"] == mtime:
+                    continue
+                try:
+                    self._profiles[name] = self._build_profile(path, mtime)
+                    changed.add(name)
+                except Exception as e:
+                    logger.warning(f"Could not profile job description {name}: {e}")
+
+            if changed:
+                self._order = sorted(self._profiles)
+                if self._order:
+                    self._matrix = np.vstack([self._profiles[name]["vector"] for name in self._order])
+                else:
+                    self._matrix = np.zeros((0, self.semantic_scorer.embedder.dim), dtype=np.float32)
+                logger.info(f"JD profiles refreshed: {len(changed)} changed, {len(self._order)} total")
+            return len(self._order)
+
+    def shortlist(self, resume_data: Dict, top_n: int = 20) -> List[Dict]:
+        """
+        Rank all stored JDs for a resume by cheap signals and keep the best.
+
+        The pre-score blends vector similarity with the share of the JD's
+        must-have requirements whose terms appear in the resume.
+
+        Args:
+            resume_data: Structured resume JSON
+            top_n: Number of JDs to keep
+
+        Returns:
+            Shortlisted JDs, best first, each with its profile, prescore,
+            similarity (0-1) and must_have_matches
+        """
+        self.refresh()
+        with self._lock:
+            order, matrix = self._order, self._matrix
+            profiles = [self._profiles[name] for name in order]
+        if not order:
+            return []
+
+        with metrics.time_stage("similarity"):
+            similarities = np.clip(matrix @ self.semantic_scorer.embed(resume_data), 0.0, 1.0)
+
+        resume_terms = set(tokenize(document_text(resume_data)))
+        entries = []
+        for profile, similarity in zip(profiles, similarities):
+            matches = SemanticScorer.covered_requirements(profile["requirements"], resume_terms)
+            # JDs without must-haves are ranked on similarity alone
+            coverage = len(matches) / len(profile["requirements"]) if profile["requirements"] else float(similarity)
+            entries.append({
+                "profile": profile,
+                "similarity": float(similarity),
+                "must_have_matches": matches,
+                "prescore": round((SIMILARITY_WEIGHT * float(similarity) + (1 - SIMILARITY_WEIGHT) * coverage) * 100.0, 2),
+            })
+
+        entries.sort(key=lambda entry: entry["prescore"], reverse=True)
+        return entries[:max(1, top_n)]
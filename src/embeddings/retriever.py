@@ -0,0 +1,119 @@
+"""Top-N candidate retrieval for a job description over the stored resume pool."""
+from pathlib import Path
+from typing import Dict, Optional
+import json
+import logging
+import time
+
+from src.config import config
+from src.monitoring import metrics
+from src.storage import LocalStorage
+from .semantic_scorer import SemanticScorer
+from .vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+_SYNC_BATCH = 1024
+
+
+class CandidateRetriever:
+    """Keep stored resumes in a VectorIndex and answer "best candidates for this JD" queries."""
+
+    def __init__(
+        self,
+        storage: LocalStorage,
+        semantic_scorer: Optional[SemanticScorer] = None,
+        index_dir: Optional[Path] = None,
+    ):
+        """
+        Initialize candidate retriever.
+
+        Args:
+            storage: Resume storage (saves and deletes are mirrored into the index)
+            semantic_scorer: Provides cached resume/JD vectors
+            index_dir: Index directory (defaults to cache_path/embeddings/index)
+        """
+        self.storage = storage
+        self.semantic_scorer = semantic_scorer or SemanticScorer()
+        embedder = self.semantic_scorer.embedder
+        self.index = VectorIndex(
+            Path(index_dir or Path(config.cache_path) / "embeddings" / "index"),
+            dim=embedder.dim,
+            signature=embedder.signature,
+        )
+        storage.add_resume_listener(self._on_resume_change)
+
+    @staticmethod
+    def _info(resume_data: Dict) -> Dict:
+        return {"candidate_id": resume_data.get("candidate_id"), "name": resume_data.get("name", "Unknown")}
+
+    def _on_resume_change(self, event: str, filename: str, resume_data: Optional[Dict]):
+        if event == "saved":
+            self.index.add(filename, self.semantic_scorer.embed(resume_data), self._info(resume_data))
+        elif event == "deleted":
+            self.index.remove(filename)
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Bring the index in line with storage (resumes saved by other processes, first start).
+
+        Returns:
+            Counts of added and removed resumes
+        """
+        stored = set(self.storage.resume_index.filenames())
+        indexed = set(self.index.ids())
+
+        removed = indexed - stored
+        for filename in removed:
+            self.index.remove(filename)
+
+        missing = sorted(stored - indexed)
+        batch = []
+        for filename in missing:
+            try:
+                with open(self.storage.resumes_dir / filename, "r", encoding="utf-8") as f:
+                    resume_data = json.load(f)
+            except Exception as e:
+                logger.warning(f"Could not index resume {filename}: {e}")
+                continue
+            batch.append((filename, self.semantic_scorer.embed(resume_data), self._info(resume_data)))
+            if len(batch) >= _SYNC_BATCH:
+                self.index.add_many(batch)
+                batch = []
+        self.index.add_many(batch)
+        self.index.flush()
+
+        if missing or removed:
+            logger.info(f"Candidate index synced: {len(missing)} added, {len(removed)} removed, {len(self.index)} total")
+        return {"added": len(missing), "removed": len(removed), "total": len(self.index)}
+
+    def top_candidates(self, jd_data: Dict, top_n: int = 20, nprobe: int = 16, exact: bool = False) -> Dict:
+        """
+        Most similar stored resumes for a job description.
+
+        Args:
+            jd_data: Structured JD JSON
+            top_n: Number of candidates
+            nprobe: IVF lists to scan (higher = better recall, slower)
+            exact: Scan the whole matrix instead of the IVF lists
+
+        Returns:
+            Dict with candidates (file_id, candidate_id, name, similarity), pool size and timing
+        """
+        started = time.perf_counter()
+        query = self.semantic_scorer.embed(jd_data)
+        with metrics.time_stage("candidate_search"):
+            hits = self.index.search(query, top_n=top_n, nprobe=nprobe, exact=exact)
+        return {
+            "total_indexed": len(self.index),
+            "search_ms": round((time.perf_counter() - started) * 1000, 3),
+            "candidates": [
+                {
+                    "file_id": hit["id"],
+                    "candidate_id": hit.get("candidate_id"),
+                    "name": hit.get("name"),
+                    "similarity": round(max(0.0, hit["score"]) * 100.0, 2),
+                }
+                for hit in hits
+            ],
+        }
@@ -0,0 +1,145 @@
+"""LLM-free candidate scoring from cached text embeddings."""
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+
+import numpy as np
+
+from src.config import config
+from src.monitoring import metrics
+from .embedding_cache import EmbeddingCache
+from .text_embedder import HashingTextEmbedder, document_text, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Share of a requirement's terms that must appear in the resume to count as met
+MUST_HAVE_COVERAGE = 0.5
+
+
+class SemanticScorer:
+    """Score a resume pool against a job description with one matrix product."""
+
+    def __init__(self, embedder: Optional[HashingTextEmbedder] = None, cache: Optional[EmbeddingCache] = None):
+        """
+        Initialize semantic scorer.
+
+        Args:
+            embedder: Text embedder (defaults to HashingTextEmbedder with EMBEDDING_DIM)
+            cache: Vector cache (defaults to EmbeddingCache)
+        """
+        self.embedder = embedder or HashingTextEmbedder(config.embedding_dim)
+        self.cache = cache or EmbeddingCache()
+
+    def embed(self, data: Dict) -> np.ndarray:
+        """
+        Vector of a resume or JD, computed once per content hash.
+
+        Args:
+            data: Structured resume or JD JSON
+
+        Returns:
+            L2-normalized float32 vector
+        """
+        text = document_text(data)
+        key = self.embedder.text_hash(text)
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = self.embedder.embed(text)
+            self.cache.set(key, vector)
+        return vector
+
+    def embed_many(self, documents: List[Dict]) -> np.ndarray:
+        """Stack document vectors into an (n, dim) matrix."""
+        if not documents:
+            return np.zeros((0, self.embedder.dim), dtype=np.float32)
+        return np.vstack([self.embed(document) for document in documents])
+
+    def similarities(self, jd_data: Dict, resumes: List[Dict]) -> np.ndarray:
+        """
+        Cosine similarity of every resume to the JD.
+
+        Args:
+            jd_data: Structured JD JSON
+            resumes: Structured resumes
+
+        Returns:
+            Array of similarities in [0, 1], aligned with `resumes`
+        """
+        with metrics.time_stage("embedding"):
+            matrix = self.embed_many(resumes)
+            query = self.embed(jd_data)
+        with metrics.time_stage("similarity"):
+            return np.clip(matrix @ query, 0.0, 1.0)
+
+    def similarity_matrix(self, jds: List[Dict], resumes: List[Dict]) -> np.ndarray:
+        """
+        Cosine similarity of every resume to every JD.
+
+        Args:
+            jds: Structured JDs
+            resumes: Structured resumes
+
+        Returns:
+            (len(jds), len(resumes)) array of similarities in [0, 1]
+        """
+        with metrics.time_stage("embedding"):
+            resume_matrix = self.embed_many(resumes)
+            jd_matrix = self.embed_many(jds)
+        with metrics.time_stage("similarity"):
+            return np.clip(jd_matrix @ resume_matrix.T, 0.0, 1.0)
+
+    @staticmethod
+    def requirement_terms(jd_data: Dict) -> List[Tuple[str, Set[str]]]:
+        """Must-have requirements of a JD with their content terms."""
+        return [(requirement, set(tokenize(requirement))) for requirement in jd_data.get("must_have_requirements", [])]
+
+    @staticmethod
+    def covered_requirements(requirements: List[Tuple[str, Set[str]]], resume_terms: Set[str]) -> List[str]:
+        """Requirements (from requirement_terms) whose terms are mostly in `resume_terms`."""
+        return [
+            requirement for requirement, terms in requirements
+            if terms and len(terms & resume_terms) / len(terms) >= MUST_HAVE_COVERAGE
+        ]
+
+    @classmethod
+    def must_have_matches(cls, jd_data: Dict, resume_data: Dict) -> List[str]:
+        """Requirements whose terms are mostly present in the resume."""
+        resume_terms = set(tokenize(document_text(resume_data)))
+        return cls.covered_requirements(cls.requirement_terms(jd_data), resume_terms)
+
+    def analyze_pool(self, jd_data: Dict, resumes: List[Dict]) -> List[Dict]:
+        """
+        Build LLM-style analyses from embedding similarity, for use with HybridScorer.
+
+        Args:
+            jd_data: Structured JD JSON
+            resumes: Structured resumes
+
+        Returns:
+            One analysis dict per resume (same keys as LLMAnalyzer.analyze_candidate)
+        """
+        scores = self.similarities(jd_data, resumes)
+        return [
+            self.similarity_analysis(float(similarity), self.must_have_matches(jd_data, resume_data))
+            for resume_data, similarity in zip(resumes, scores)
+        ]
+
+    @staticmethod
+    def similarity_analysis(similarity: float, must_have_matches: List[str]) -> Dict:
+        """
+        LLM-style analysis dict for an embedding similarity.
+
+        Args:
+            similarity: Cosine similarity in [0, 1]
+            must_have_matches: Requirements met by the resume
+
+        Returns:
+            Dict with the keys of LLMAnalyzer.analyze_candidate
+        """
+        similarity_score = round(similarity * 100.0, 2)
+        return {
+            "overall_score": similarity_score,
+            "similarity_score": similarity_score,
+            "must_have_matches": must_have_matches,
+            "reason_codes": [f"SEMANTIC_SIMILARITY: {similarity_score:.0f}% similitud semántica con la vacante"],
+            "matched_sections": {},
+        }
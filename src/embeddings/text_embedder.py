@@ -0,0 +1,132 @@
+"""CPU-only text vectorization with signed feature hashing."""
+from typing import Dict, Iterable, List
+import hashlib
+import re
+import unicodedata
+import zlib
+
+import numpy as np
+
+# Fields that identify a stored copy rather than the document content
+_SKIPPED_FIELDS = {"candidate_id", "jd_id", "_metadata", "raw_text"}
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+# Function words (English and Spanish) that carry no matching signal
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it of on or that the this to was were will with
+you your we our they their he she his her i my me over than then there these those into about
+al algo como con de del el en entre es esta este estos la las lo los mas muy no o para pero
+por que se sin sobre su sus tambien un una unos y ya ser sera anos ano
+""".split())
+
+
+def strip_accents(text: str) -> str:
+    """Remove diacritics so "sólida" and "solida" hash to the same feature."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, accent-free content tokens (keeps tech terms like c++, c#, node.js)."""
+    return [token for token in _TOKEN.findall(strip_accents(text.lower())) if token not in STOPWORDS]
+
+
+def document_text(data: Dict) -> str:
+    """
+    Text to embed for a resume or job description.
+
+    Uses raw_text when present and otherwise flattens the structured field
+    values (keys and ids are left out so they do not act as shared terms).
+
+    Args:
+        data: Structured resume or JD JSON
+
+    Returns:
+        Plain text
+    """
+    if data.get("raw_text"):
+        return data["raw_text"]
+
+    parts: List[str] = []
+
+    def collect(value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key not in _SKIPPED_FIELDS:
+                    collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+        elif value is not None and not isinstance(value, bool):
+            parts.append(str(value))
+
+    collect(data)
+    return "\n".join(parts)
+
+
+class HashingTextEmbedder:
+    """
+    Embed text as L2-normalized, sublinear-TF vectors of hashed unigrams and bigrams.
+
+    Vectors need no fitted vocabulary, so each document is embedded once and
+    can be cached independently of the rest of the pool; cosine similarity is
+    a plain dot product.
+    """
+
+    version = "hash-tf-v1"
+
+    def __init__(self, dim: int = 1024):
+        """
+        Initialize embedder.
+
+        Args:
+            dim: Vector dimension (number of hash buckets)
+        """
+        self.dim = dim
+
+    @property
+    def signature(self) -> str:
+        """Identifies vectors produced by this configuration (part of cache keys)."""
+        return f"{self.version}:{self.dim}"
+
+    def features(self, text: str) -> Iterable[str]:
+        """Unigram and bigram features of a text."""
+        tokens = tokenize(text)
+        yield from tokens
+        for first, second in zip(tokens, tokens[1:]):
+            yield f"{first} {second}"
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Embed a text.
+
+        Args:
+            text: Document text
+
+        Returns:
+            float32 vector of length dim (all zeros for empty text)
+        """
+        counts: Dict[int, float] = {}
+        for feature in self.features(text):
+            hashed = zlib.crc32(feature.encode("utf-8"))
+            index = hashed % self.dim
+            # An independent bit picks the sign so bucket collisions cancel out on average
+            sign = 1.0 if (hashed >> 31) & 1 else -1.0
+            counts[index] = counts.get(index, 0.0) + sign
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if not counts:
+            return vector
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        # Sublinear term frequency; buckets whose signed counts cancelled out stay zero
+        magnitude = np.abs(values)
+        vector[indices] = np.sign(values) * (1.0 + np.log(np.maximum(magnitude, 1.0)))
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def text_hash(self, text: str) -> str:
+        """Cache key of a text's vector under this embedder."""
+        return hashlib.sha256(f"{self.signature}|{text}".encode("utf-8")).hexdigest()
@@ -0,0 +1,389 @@
+"""Memory-mapped resume vector matrix with an IVF (inverted file) ANN index."""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_INITIAL_CAPACITY = 1024
+# Rows scanned exactly below this size; the IVF index is trained above it
+_MIN_TRAIN_ROWS = 2048
+_TRAIN_SAMPLE_PER_LIST = 32
+_ASSIGN_CHUNK = 8192
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VectorIndex:
+    """
+    Contiguous float32 matrix on disk (memory-mapped .npy) plus an IVF index.
+
+    Rows are addressed by an id (the stored resume file name). The IVF
+    coarse quantizer is trained with spherical k-means on a sample; each row
+    is assigned to its nearest centroid and a search only scans the rows of
+    the `nprobe` lists closest to the query. Only the centroids, the list
+    layout, the id map and one offset per row stay resident; vectors are
+    paged in on demand and a hit's id and info are read back from its line
+    in the id log.
+
+    Updates reach the memory-mapped files through the page cache; flush()
+    (or close()) writes them to disk, e.g. once after a batch of adds.
+
+    Files in `directory`:
+        vectors.npy      float32 (capacity, dim), memory-mapped
+        assignments.npy  int32 (capacity,) IVF list per row, -1 when deleted
+        ids.jsonl        append-only id log ({"id", "row", ...} / {"id", "deleted"})
+        centroids.npy    float32 (nlist, dim)
+        meta.json        dim, row count, signature of the vectors
+    """
+
+    def __init__(self, directory: Path, dim: int, signature: str = ""):
+        """
+        Initialize vector index.
+
+        Args:
+            directory: Directory holding the index files
+            dim: Vector dimension
+            signature: Embedder signature; the index is reset when it changes
+        """
+        self.directory = Path(directory)
+        self.dim = dim
+        self.signature = signature
+        self._lock = threading.RLock()
+
+        self.count = 0
+        self._rows: Dict[str, int] = {}
+        # Byte offset of each row's record in ids.jsonl, -1 when deleted
+        self._offsets: np.ndarray = np.empty(0, dtype=np.int64)
+        self._vectors: Optional[np.ndarray] = None
+        self._assignments: Optional[np.ndarray] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_rows = 0
+        # Inverted lists: rows sorted by list, with per-list offsets
+        self._list_rows: Optional[np.ndarray] = None
+        self._list_offsets: Optional[np.ndarray] = None
+        # Rows added since the lists were built (always scanned)
+        self._unlisted: List[int] = []
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    # ----- persistence -----
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.directory / "meta.json"
+
+    @property
+    def _ids_path(self) -> Path:
+        return self.directory / "ids.jsonl"
+
+    def _load(self):
+        """Open existing files, or start empty when missing or built with another embedder."""
+        meta = {}
+        if self._meta_path.exists():
+            try:
+                meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning(f"Could not read vector index metadata: {e}")
+
+        vectors_path = self.directory / "vectors.npy"
+        if meta.get("dim") != self.dim or meta.get("signature") != self.signature or not vectors_path.exists():
+            self._reset()
+            return
+
+        self._vectors = np.load(vectors_path, mmap_mode="r+")
+        self._assignments = np.load(self.directory / "assignments.npy", mmap_mode="r+")
+        self.count = meta.get("count", 0)
+        self._trained_rows = meta.get("trained_rows", 0)
+
+        self._offsets = np.full(self._vectors.shape[0], -1, dtype=np.int64)
+        offset = 0
+        with open(self._ids_path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if record.get("deleted"):
+                        row = self._rows.pop(record["id"], None)
+                        if row is not None:
+                            self._offsets[row] = -1
+                    elif record["row"] < self.count:
+                        self._rows[record["id"]] = record["row"]
+                        self._offsets[record["row"]] = offset
+                offset += len(line)
+
+        centroids_path = self.directory / "centroids.npy"
+        if centroids_path.exists():
+            self._centroids = np.load(centroids_path)
+            self._build_lists()
+
+    def _reset(self):
+        """Create empty index files."""
+        for name in ("vectors.npy", "assignments.npy", "ids.jsonl", "centroids.npy"):
+            (self.directory / name).unlink(missing_ok=True)
+        self._vectors = np.lib.format.open_memmap(
+            self.directory / "vectors.npy", mode="w+", dtype=np.float32, shape=(_INITIAL_CAPACITY, self.dim)
+        )
+        self._assignments = np.lib.format.open_memmap(
+            self.directory / "assignments.npy", mode="w+", dtype=np.int32, shape=(_INITIAL_CAPACITY,)
+        )
+        self._assignments[:] = -1
+        self.count = 0
+        self._rows = {}
+        self._offsets = np.full(_INITIAL_CAPACITY, -1, dtype=np.int64)
+        self._centroids = None
+        self._trained_rows = 0
+        self._list_rows = self._list_offsets = None
+        self._unlisted = []
+        self._ids_path.touch()
+        self._save_meta()
+
+    def _save_meta(self):
+        self._meta_path.write_text(json.dumps({
+            "dim": self.dim,
+            "signature": self.signature,
+            "count": self.count,
+            "trained_rows": self._trained_rows,
+        }), encoding="utf-8")
+
+    def _append_ids(self, records: List[Dict]) -> List[int]:
+        """Append records to the id log; returns the byte offset of each."""
+        offsets = []
+        with open(self._ids_path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            for record in records:
+                line = (json.dumps(record) + "\n").encode("utf-8")
+                f.write(line)
+                offsets.append(offset)
+                offset += len(line)
+        return offsets
+
+    def _read_record(self, f, row: int) -> Dict:
+        """Id log record of a live row (f: ids.jsonl opened in binary mode)."""
+        f.seek(int(self._offsets[row]))
+        return json.loads(f.readline())
+
+    def _grow(self, needed: int):
+        """Double the on-disk capacity until `needed` rows fit."""
+        capacity = self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+
+        for name, array, shape, fill in (
+            ("vectors.npy", self._vectors, (capacity, self.dim), 0.0),
+            ("assignments.npy", self._assignments, (capacity,), -1),
+        ):
+            tmp_path = self.directory / f"{name}.tmp"
+            grown = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=array.dtype, shape=shape)
+            for start in range(0, self.count, _ASSIGN_CHUNK):
+                end = min(start + _ASSIGN_CHUNK, self.count)
+                grown[start:end] = array[start:end]
+            grown[self.count:] = fill
+            grown.flush()
+            del grown
+            tmp_path.replace(self.directory / name)
+
+        self._vectors = np.load(self.directory / "vectors.npy", mmap_mode="r+")
+        self._assignments = np.load(self.directory / "assignments.npy", mmap_mode="r+")
+        grown_offsets = np.full(capacity, -1, dtype=np.int64)
+        grown_offsets[:self.count] = self._offsets[:self.count]
+        self._offsets = grown_offsets
+
+    def flush(self):
+        """Write pending memory-mapped changes and metadata to disk."""
+        with self._lock:
+            self._vectors.flush()
+            self._assignments.flush()
+            self._save_meta()
+
+    def close(self):
+        """Flush before shutdown."""
+        self.flush()
+
+    # ----- updates -----
+
+    def _nearest_list(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def add_many(self, items: List[Tuple[str, np.ndarray, Dict]]):
+        """
+        Add or replace vectors.
+
+        Args:
+            items: (id, vector, info) tuples; info is returned with search hits
+        """
+        if not items:
+            return
+        with self._lock:
+            records = []
+            new_rows = []
+            for item_id, vector, info in items:
+                row = self._rows.get(item_id)
+                if row is None:
+                    row = self.count
+                    self._grow(row + 1)
+                    self.count += 1
+                    self._rows[item_id] = row
+                self._vectors[row] = vector
+                records.append({"id": item_id, "row": row, "info": info})
+                new_rows.append(row)
+
+            rows = np.array(new_rows)
+            if self._centroids is not None:
+                self._assignments[rows] = self._nearest_list(np.asarray(self._vectors[rows]))
+                self._unlisted.extend(new_rows)
+            else:
+                self._assignments[rows] = 0
+
+            for row, offset in zip(new_rows, self._append_ids(records)):
+                self._offsets[row] = offset
+            # The row count must cover the logged rows; vectors are flushed in batches (flush())
+            self._save_meta()
+
+            if self._needs_training():
+                self.train()
+            elif self._centroids is not None and len(self._unlisted) > max(1024, self.count // 20):
+                self._build_lists()
+
+    def add(self, item_id: str, vector: np.ndarray, info: Optional[Dict] = None):
+        """Add or replace one vector."""
+        self.add_many([(item_id, vector, info or {})])
+
+    def remove(self, item_id: str) -> bool:
+        """Delete a vector (its row is left empty)."""
+        with self._lock:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                return False
+            self._offsets[row] = -1
+            self._vectors[row] = 0.0
+            self._assignments[row] = -1
+            self._append_ids([{"id": item_id, "deleted": True}])
+            return True
+
+    def ids(self) -> List[str]:
+        """Ids currently indexed."""
+        with self._lock:
+            return list(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # ----- IVF -----
+
+    def _needs_training(self) -> bool:
+        live = len(self._rows)
+        return live >= _MIN_TRAIN_ROWS and live >= 2 * max(self._trained_rows, _MIN_TRAIN_ROWS // 2)
+
+    def train(self, nlist: Optional[int] = None, iterations: int = 10, seed: int = 0):
+        """
+        Train the coarse quantizer (spherical k-means) and assign every row.
+
+        Args:
+            nlist: Number of inverted lists (defaults to ~sqrt(rows))
+            iterations: k-means iterations
+            seed: Sampling seed
+        """
+        with self._lock:
+            live_rows = np.array(sorted(self._rows.values()), dtype=np.int64)
+            if live_rows.size == 0:
+                return
+            nlist = nlist or int(np.clip(np.sqrt(live_rows.size), 8, 4096))
+            nlist = min(nlist, live_rows.size)
+            rng = np.random.default_rng(seed)
+
+            sample_rows = np.sort(rng.choice(live_rows, size=min(live_rows.size, nlist * _TRAIN_SAMPLE_PER_LIST), replace=False))
+            sample = _normalize_rows(np.asarray(self._vectors[sample_rows], dtype=np.float32))
+            centroids = sample[rng.choice(sample.shape[0], size=nlist, replace=False)].copy()
+
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                empty = np.bincount(labels, minlength=nlist) == 0
+                # Re-seed empty lists with random sample points
+                sums[empty] = sample[rng.choice(sample.shape[0], size=int(empty.sum()))]
+                centroids = _normalize_rows(sums)
+
+            self._centroids = centroids.astype(np.float32)
+            for start in range(0, self.count, _ASSIGN_CHUNK):
+                chunk = np.asarray(self._vectors[start:start + _ASSIGN_CHUNK])
+                self._assignments[start:start + len(chunk)] = self._nearest_list(chunk)
+            deleted = np.flatnonzero(self._offsets[:self.count] < 0)
+            if deleted.size:
+                self._assignments[deleted] = -1
+
+            np.save(self.directory / "centroids.npy", self._centroids)
+            self._trained_rows = live_rows.size
+            self.flush()
+            self._build_lists()
+            logger.info(f"Trained IVF index: {live_rows.size} vectors in {nlist} lists")
+
+    def _build_lists(self):
+        """Rebuild inverted lists from the row assignments."""
+        assignments = np.asarray(self._assignments[:self.count])
+        order = np.argsort(assignments, kind="stable")
+        live = assignments[order] >= 0
+        self._list_rows = order[live].astype(np.int64)
+        self._list_offsets = np.searchsorted(assignments[self._list_rows], np.arange(len(self._centroids) + 1))
+        self._unlisted = []
+
+    # ----- search -----
+
+    def search(self, query: np.ndarray, top_n: int = 10, nprobe: int = 16, exact: bool = False) -> List[Dict]:
+        """
+        Find the rows most similar (dot product) to a query vector.
+
+        Args:
+            query: Query vector (normalized like the stored vectors)
+            top_n: Number of hits
+            nprobe: IVF lists to scan
+            exact: Scan every row instead of using the IVF index
+
+        Returns:
+            Hits with id, score and the info stored with the vector
+        """
+        with self._lock:
+            if not self._rows:
+                return []
+            query = np.asarray(query, dtype=np.float32)
+
+            if exact or self._centroids is None or self._list_rows is None:
+                rows = np.arange(self.count)
+            else:
+                nearest = np.argsort(-(self._centroids @ query))[:nprobe]
+                parts = [self._list_rows[self._list_offsets[l]:self._list_offsets[l + 1]] for l in nearest]
+                if self._unlisted:
+                    parts.append(np.array(self._unlisted, dtype=np.int64))
+                rows = np.unique(np.concatenate(parts)) if parts else np.arange(0)
+
+            scores = np.empty(rows.size, dtype=np.float32)
+            for start in range(0, rows.size, _ASSIGN_CHUNK):
+                chunk = rows[start:start + _ASSIGN_CHUNK]
+                scores[start:start + chunk.size] = self._vectors[chunk] @ query
+
+            # Deleted rows are marked with assignment -1
+            live = self._assignments[rows] >= 0
+            rows, scores = rows[live], scores[live]
+            if rows.size > top_n:
+                best = np.argpartition(-scores, top_n)[:top_n]
+                rows, scores = rows[best], scores[best]
+            order = np.argsort(-scores)
+
+            hits = []
+            with open(self._ids_path, "rb") as f:
+                for i in order:
+                    record = self._read_record(f, rows[i])
+                    hits.append({"id": record["id"], "score": float(scores[i]), **record.get("info", {})})
+            return hits
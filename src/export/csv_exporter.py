@@ -1,7 +1,7 @@
 """CSV export functionality."""
 import csv
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterable, Dict, Optional
 from datetime import datetime
 import logging
 
@@ -23,12 +23,12 @@ class CSVExporter:
         self.output_dir = Path(output_dir or config.output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
-    def export_results(self, results: List[Dict], filename: Optional[str] = None) -> str:
+    def export_results(self, results: Iterable[Dict], filename: Optional[str] = None) -> str:
         """
         Export ranked results to CSV.
         
         Args:
-            results: List of ranked candidate results
+            results: Ranked candidate results (iterated once)
             filename: Optional filename (auto-generated if not provided)
             
         Returns:
@@ -58,6 +58,7 @@ class CSVExporter:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
             
+            rows = 0
             for result in results:
                 row = {
                     "rank": result.get("rank", ""),
@@ -71,7 +72,8 @@ class CSVExporter:
                     "matched_requirements": "; ".join(result.get("must_have_matches", [])),
                 }
                 writer.writerow(row)
+                rows += 1
         
-        logger.info(f"Exported {len(results)} results to {file_path}")
+        logger.info(f"Exported {rows} results to {file_path}")
         return str(file_path)
 
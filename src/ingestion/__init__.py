@@ -0,0 +1,6 @@
+"""Upload ingestion module."""
+from .streaming_upload import StreamedUpload, UploadReader, UploadRejected, read_upload
+from .upload_processor import UploadProcessor
+from .archive_ingest import ArchiveError, ArchiveIngestor
+
+__all__ = ["StreamedUpload", "UploadReader", "UploadRejected", "read_upload", "UploadProcessor", "ArchiveError", "ArchiveIngestor"]
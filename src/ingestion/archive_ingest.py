@@ -0,0 +1,419 @@
+"""Bulk resume ingestion from streamed ZIP/tar archives."""
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+import queue
+import struct
+import tarfile
+import threading
+import uuid
+import zlib
+
+from src.config import config
+from .streaming_upload import MAX_UPLOAD_SIZES, UploadReader
+from .upload_processor import UploadProcessor
+
+logger = logging.getLogger(__name__)
+
+_ZIP_LOCAL_HEADER = b"PK\x03\x04"
+_ZIP_CENTRAL_DIR = b"PK\x01\x02"
+_ZIP_END_OF_CD = b"PK\x05\x06"
+_ZIP_DATA_DESCRIPTOR = b"PK\x07\x08"
+
+_READ_SIZE = 64 * 1024
+_SUPPORTED_SUFFIXES = {".pdf", ".json", ".txt"}
+_MAX_MEMBER_SIZE = max(MAX_UPLOAD_SIZES.values())
+# Extracted members waiting for a parse worker, per worker (bounds memory on fast uploads)
+_PENDING_MEMBERS_PER_WORKER = 2
+
+# (member name, content or None, error message or None)
+ArchiveMember = Tuple[str, Optional[bytes], Optional[str]]
+
+
+class ArchiveError(ValueError):
+    """The archive is malformed or uses an unsupported feature."""
+
+
+class ChunkStream:
+    """Blocking byte stream fed by the request handler and read by the extraction thread."""
+
+    def __init__(self, max_bytes: int, max_pending_chunks: int = 32):
+        """
+        Initialize chunk stream.
+
+        Args:
+            max_bytes: Maximum total archive size
+            max_pending_chunks: Chunks buffered before the producer blocks (backpressure)
+        """
+        self.max_bytes = max_bytes
+        self.received_bytes = 0
+        self.aborted = False
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending_chunks)
+        self._buffer = bytearray()
+        self._eof = False
+
+    def _put(self, item: Optional[bytes]):
+        while not self.aborted:
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def put(self, chunk: bytes):
+        """Add a received chunk (blocks while the consumer is behind)."""
+        self.received_bytes += len(chunk)
+        if self.received_bytes > self.max_bytes:
+            raise ArchiveError(f"Archive too large (max {self.max_bytes // (1024 * 1024)}MB)")
+        self._put(chunk)
+
+    def close(self):
+        """Signal the end of the upload."""
+        self._put(None)
+
+    def abort(self):
+        """Stop the stream on either side (the upload failed or the consumer gave up)."""
+        self.aborted = True
+        self._eof = True
+        # Wake a reader blocked on an empty queue; a full queue keeps it busy until it sees `aborted`
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def discard_remaining(self):
+        """Consume and drop whatever is still arriving (e.g. a ZIP central directory)."""
+        self._buffer.clear()
+        while not self._eof and not self.aborted:
+            if self._queue.get() is None:
+                self._eof = True
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read up to `size` bytes (all remaining when negative), blocking for more data.
+
+        Raises:
+            ArchiveError: If the stream was aborted
+        """
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            chunk = self._queue.get()
+            if self.aborted:
+                break
+            if chunk is None:
+                self._eof = True
+                break
+            self._buffer += chunk
+        if self.aborted:
+            raise ArchiveError("Archive upload aborted")
+
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        return data
+
+
+class _PushbackReader:
+    """Reader that can return bytes to the front of the stream."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self._pending = b""
+
+    def read(self, size: int = -1) -> bytes:
+        if self._pending:
+            if size < 0:
+                data, self._pending = self._pending + self.raw.read(-1), b""
+                return data
+            data, self._pending = self._pending[:size], self._pending[size:]
+            return data
+        return self.raw.read(size)
+
+    def read_exact(self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.read(size - len(data))
+            if not chunk:
+                raise ArchiveError("Truncated archive")
+            data += chunk
+        return bytes(data)
+
+    def unread(self, data: bytes):
+        self._pending = data + self._pending
+
+
+def _zip64_sizes(extra: bytes, compressed: int, uncompressed: int) -> Tuple[int, int]:
+    """Resolve ZIP64 sizes from the local header extra field."""
+    offset = 0
+    while offset + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<HH", extra, offset)
+        if header_id == 0x0001:
+            field = extra[offset + 4:offset + 4 + length]
+            position = 0
+            if uncompressed == 0xFFFFFFFF and position + 8 <= len(field):
+                uncompressed = struct.unpack_from("<Q", field, position)[0]
+                position += 8
+            if compressed == 0xFFFFFFFF and position + 8 <= len(field):
+                compressed = struct.unpack_from("<Q", field, position)[0]
+            break
+        offset += 4 + length
+    return compressed, uncompressed
+
+
+def iter_zip_members(raw, max_member_size: int = _MAX_MEMBER_SIZE) -> Iterator[ArchiveMember]:
+    """
+    Stream ZIP members by walking local file headers (no central directory needed).
+
+    Args:
+        raw: Object with read(n)
+        max_member_size: Members larger than this are reported as errors
+
+    Yields:
+        (name, content, error) per member
+    """
+    reader = raw if isinstance(raw, _PushbackReader) else _PushbackReader(raw)
+
+    while True:
+        signature = reader.read(4)
+        if len(signature) < 4 or signature in (_ZIP_CENTRAL_DIR, _ZIP_END_OF_CD):
+            return
+        if signature != _ZIP_LOCAL_HEADER:
+            raise ArchiveError("Invalid ZIP local file header")
+
+        (_, flags, method, _, _, _, compressed, uncompressed, name_len, extra_len) = struct.unpack(
+            "<HHHHHIIIHH", reader.read_exact(26)
+        )
+        name = reader.read_exact(name_len).decode("utf-8" if flags & 0x800 else "cp437")
+        extra = reader.read_exact(extra_len)
+        compressed, uncompressed = _zip64_sizes(extra, compressed, uncompressed)
+        has_descriptor = bool(flags & 0x08)
+
+        if not has_descriptor:
+            if flags & 0x01 or method not in (0, 8) or uncompressed > max_member_size:
+                # Skip the payload without keeping it in memory
+                remaining = compressed
+                while remaining > 0:
+                    remaining -= len(reader.read_exact(min(_READ_SIZE, remaining)))
+                if flags & 0x01:
+                    error = "Encrypted members are not supported"
+                elif method not in (0, 8):
+                    error = f"Unsupported compression method {method}"
+                else:
+                    error = f"Member too large (max {max_member_size // (1024 * 1024)}MB)"
+                yield name, None, error
+                continue
+
+            data = reader.read_exact(compressed)
+            if method == 8:
+                # The header size is not trusted: cap the output to catch zip bombs
+                data = zlib.decompressobj(-15).decompress(data, max_member_size + 1)
+            if len(data) > max_member_size:
+                yield name, None, f"Member too large (max {max_member_size // (1024 * 1024)}MB)"
+                continue
+            yield name, data, None
+            continue
+
+        # Sizes follow the data in a descriptor: only deflate streams can be delimited
+        if method != 8 or flags & 0x01:
+            raise ArchiveError("Streamed ZIP entries without sizes must be unencrypted deflate")
+
+        decompressor = zlib.decompressobj(-15)
+        output = bytearray()
+        too_large = False
+        while not decompressor.eof:
+            chunk = decompressor.unconsumed_tail or reader.read(_READ_SIZE)
+            if not chunk:
+                raise ArchiveError("Truncated archive")
+            # Bounded output per call, so a highly compressed chunk cannot balloon in memory
+            data = decompressor.decompress(chunk, _READ_SIZE)
+            if not too_large:
+                output += data
+                if len(output) > max_member_size:
+                    too_large = True
+                    output = bytearray()
+        if decompressor.unused_data:
+            reader.unread(decompressor.unused_data)
+
+        # Data descriptor: optional signature, then crc32 + sizes
+        if reader.read_exact(4) == _ZIP_DATA_DESCRIPTOR:
+            reader.read_exact(12)
+        else:
+            reader.read_exact(8)
+
+        if too_large:
+            yield name, None, f"Member too large (max {max_member_size // (1024 * 1024)}MB)"
+        else:
+            yield name, bytes(output), None
+
+
+def iter_tar_members(raw, max_member_size: int = _MAX_MEMBER_SIZE) -> Iterator[ArchiveMember]:
+    """
+    Stream tar members (plain, gzip, bz2 or xz) without seeking.
+
+    Args:
+        raw: Object with read(n)
+        max_member_size: Members larger than this are reported as errors
+
+    Yields:
+        (name, content, error) per regular file
+    """
+    try:
+        with tarfile.open(fileobj=raw, mode="r|*") as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                if member.size > max_member_size:
+                    yield member.name, None, f"Member too large (max {max_member_size // (1024 * 1024)}MB)"
+                    continue
+                extracted = archive.extractfile(member)
+                yield member.name, extracted.read() if extracted else b"", None
+    except tarfile.TarError as e:
+        raise ArchiveError(f"Invalid tar archive: {str(e)}")
+
+
+def iter_archive_members(raw, max_member_size: int = _MAX_MEMBER_SIZE) -> Iterator[ArchiveMember]:
+    """Detect ZIP vs tar from the first bytes and stream the members."""
+    reader = _PushbackReader(raw)
+    head = reader.read(4)
+    reader.unread(head)
+
+    if head in (_ZIP_LOCAL_HEADER, _ZIP_END_OF_CD):
+        return iter_zip_members(reader, max_member_size)
+    return iter_tar_members(reader, max_member_size)
+
+
+class ArchiveIngestJob:
+    """Progress of one archive upload, with a status entry per member."""
+
+    def __init__(self, filename: str, stream: ChunkStream):
+        self.job_id = str(uuid.uuid4())
+        self.filename = filename
+        self.stream = stream
+        self.status = "receiving"
+        self.error: Optional[str] = None
+        self.started_at = datetime.now().isoformat()
+        self.finished_at: Optional[str] = None
+        self.members: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def add_member(self, name: str, status: str = "queued", error: Optional[str] = None) -> Dict:
+        """Register a member and return its (mutable) status entry."""
+        member = {"name": name, "status": status}
+        if error:
+            member["error"] = error
+        with self._lock:
+            self.members.append(member)
+        return member
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly job status."""
+        with self._lock:
+            members = [dict(member) for member in self.members]
+        counts = {"total": len(members)}
+        for member in members:
+            counts[member["status"]] = counts.get(member["status"], 0) + 1
+        return {
+            "job_id": self.job_id,
+            "filename": self.filename,
+            "status": self.status,
+            "error": self.error,
+            "received_bytes": self.stream.received_bytes,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "counts": counts,
+            "members": members,
+        }
+
+
+class ArchiveIngestor:
+    """Extract streamed archives and dispatch members to parallel parse workers."""
+
+    def __init__(self, upload_processor: UploadProcessor, max_workers: Optional[int] = None):
+        """
+        Initialize archive ingestor.
+
+        Args:
+            upload_processor: Processor used to parse and store each member
+            max_workers: Parse worker threads (defaults to config.ingest_workers)
+        """
+        self.upload_processor = upload_processor
+        max_workers = max_workers or config.ingest_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="archive-parse")
+        # Extraction blocks (and with it the upload) while this many members wait for a worker
+        self._pending = threading.BoundedSemaphore(max_workers * _PENDING_MEMBERS_PER_WORKER)
+        self.jobs: Dict[str, ArchiveIngestJob] = {}
+
+    def start(self, filename: str) -> ArchiveIngestJob:
+        """
+        Create a job and start extracting from its stream in the background.
+
+        Args:
+            filename: Archive file name (for reporting)
+
+        Returns:
+            Job whose `stream` must be fed with the archive bytes and then closed
+        """
+        job = ArchiveIngestJob(filename, ChunkStream(config.archive_max_size_mb * 1024 * 1024))
+        self.jobs[job.job_id] = job
+        threading.Thread(target=self._run, args=(job,), name=f"archive-{job.job_id[:8]}", daemon=True).start()
+        return job
+
+    def get_job(self, job_id: str) -> Optional[ArchiveIngestJob]:
+        """Look up a job by id."""
+        return self.jobs.get(job_id)
+
+    def _ingest_member(self, member: Dict, name: str, content: bytes):
+        """Parse and store one archive member."""
+        try:
+            reader = UploadReader(Path(name).name)
+            reader.feed(content)
+            record = self.upload_processor.ingest_resume(reader.finish())
+            member["candidate_id"] = record["id"]
+            member["path"] = record["path"]
+            member["status"] = "duplicate" if record["duplicate"] else "ingested"
+        except Exception as e:
+            member["error"] = str(e)
+            member["status"] = "failed"
+
+    def _run(self, job: ArchiveIngestJob):
+        """Extraction loop (runs in its own thread while the upload is still arriving)."""
+        futures = []
+        try:
+            job.status = "extracting"
+            for name, content, error in iter_archive_members(job.stream):
+                base_name = Path(name).name
+                if name.endswith("/") or not base_name or base_name.startswith(".") or "__MACOSX" in name:
+                    continue
+                if len(job.members) >= config.archive_max_members:
+                    raise ArchiveError(f"Too many members (max {config.archive_max_members})")
+                if error:
+                    job.add_member(name, "failed", error)
+                    continue
+                if Path(base_name).suffix.lower() not in _SUPPORTED_SUFFIXES:
+                    job.add_member(name, "skipped", "Unsupported file type")
+                    continue
+
+                member = job.add_member(name)
+                self._pending.acquire()
+                future = self.executor.submit(self._ingest_member, member, name, content)
+                future.add_done_callback(lambda _: self._pending.release())
+                futures.append(future)
+
+            job.stream.discard_remaining()
+            job.status = "processing"
+            wait(futures)
+            job.status = "completed"
+            logger.info(f"Archive {job.filename} ingested: {job.to_dict()['counts']}")
+
+        except Exception as e:
+            logger.error(f"Error ingesting archive {job.filename}: {str(e)}")
+            job.stream.abort()
+            wait(futures)
+            job.status = "error"
+            job.error = str(e)
+
+        job.finished_at = datetime.now().isoformat()
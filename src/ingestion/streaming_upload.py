@@ -0,0 +1,149 @@
+"""Single-pass upload reading: sniff type, enforce size limits and hash while receiving."""
+from pathlib import Path
+from typing import Optional
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Same limits as PDFValidator
+MAX_UPLOAD_SIZES = {
+    "pdf": 50 * 1024 * 1024,  # 50MB
+    "json": 10 * 1024 * 1024,  # 10MB
+    "txt": 10 * 1024 * 1024,  # 10MB
+}
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+class UploadRejected(ValueError):
+    """Upload failed validation (type, size or content)."""
+
+
+def sniff_file_type(head: bytes, filename: str) -> Optional[str]:
+    """
+    Determine the upload type from its first bytes and file name.
+
+    PDFs are recognised by their magic bytes regardless of the extension;
+    JSON and TXT follow the extension, falling back to content sniffing
+    when the extension is unknown.
+
+    Args:
+        head: First bytes of the upload
+        filename: Original file name
+
+    Returns:
+        "pdf", "json", "txt", or None if unsupported
+    """
+    suffix = Path(filename or "").suffix.lower()
+
+    if head.startswith(b"%PDF"):
+        return "pdf"
+    if suffix == ".pdf":
+        raise UploadRejected("Invalid PDF header")
+    if suffix == ".json":
+        return "json"
+    if suffix == ".txt":
+        return "txt"
+    if suffix:
+        return None
+
+    stripped = head[len(_UTF8_BOM):] if head.startswith(_UTF8_BOM) else head
+    stripped = stripped.lstrip()
+    if stripped[:1] in (b"{", b"["):
+        return "json"
+    if b"\x00" not in head:
+        return "txt"
+    return None
+
+
+def decode_text(content: bytes) -> str:
+    """Decode text content (UTF-8 with latin-1 fallback, like PDFExtractor)."""
+    try:
+        return content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return content.decode("latin-1")
+
+
+class StreamedUpload:
+    """An upload read exactly once, with its type, size and content hash."""
+
+    def __init__(self, filename: str, file_type: str, content: bytes, sha256: str):
+        """
+        Initialize streamed upload.
+
+        Args:
+            filename: Original file name
+            file_type: Sniffed type (pdf, json, txt)
+            content: Raw bytes
+            sha256: Hex digest of the content
+        """
+        self.filename = filename
+        self.file_type = file_type
+        self.content = content
+        self.sha256 = sha256
+
+    @property
+    def size(self) -> int:
+        """Size in bytes."""
+        return len(self.content)
+
+
+class UploadReader:
+    """Incrementally consume upload chunks, validating and hashing as bytes arrive."""
+
+    def __init__(self, filename: str):
+        """
+        Initialize upload reader.
+
+        Args:
+            filename: Original file name
+        """
+        self.filename = filename
+        self.file_type: Optional[str] = None
+        self._hasher = hashlib.sha256()
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes):
+        """Add a chunk; the type is sniffed on the first one and limits are enforced."""
+        if not chunk:
+            return
+        if self.file_type is None:
+            self.file_type = sniff_file_type(chunk[:512], self.filename)
+            if self.file_type is None:
+                raise UploadRejected("Unsupported file type")
+
+        max_size = MAX_UPLOAD_SIZES[self.file_type]
+        if len(self._buffer) + len(chunk) > max_size:
+            raise UploadRejected(f"{self.file_type.upper()} file too large (max {max_size // (1024 * 1024)}MB)")
+
+        self._hasher.update(chunk)
+        self._buffer += chunk
+
+    def finish(self) -> StreamedUpload:
+        """Complete the upload."""
+        if not self._buffer:
+            raise UploadRejected("File is empty")
+        return StreamedUpload(self.filename, self.file_type, bytes(self._buffer), self._hasher.hexdigest())
+
+
+async def read_upload(file, chunk_size: int = CHUNK_SIZE) -> StreamedUpload:
+    """
+    Read a FastAPI UploadFile once, in chunks.
+
+    Args:
+        file: UploadFile from the request
+        chunk_size: Bytes per read
+
+    Returns:
+        StreamedUpload with content and hash
+    """
+    reader = UploadReader(file.filename)
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        reader.feed(chunk)
+    return reader.finish()
@@ -0,0 +1,141 @@
+"""Turn uploaded bytes into stored resumes/JDs without re-reading files."""
+from pathlib import Path
+from typing import Dict, Optional
+import json
+import logging
+import threading
+
+from src.config import config
+from src.monitoring import metrics
+from src.pdf_processing import PDFExtractor
+from src.preprocessing import ResumeParser, JDParser
+from src.storage import LocalStorage
+from .streaming_upload import StreamedUpload, UploadRejected, decode_text
+
+logger = logging.getLogger(__name__)
+
+
+class UploadProcessor:
+    """Parse streamed uploads straight into storage, skipping byte-identical re-uploads."""
+
+    def __init__(self, storage: Optional[LocalStorage] = None, index_path: Optional[Path] = None):
+        """
+        Initialize upload processor.
+
+        Args:
+            storage: Storage backend (defaults to LocalStorage)
+            index_path: Upload hash log (defaults to cache_path/upload_hashes.jsonl)
+        """
+        self.storage = storage or LocalStorage()
+        self.pdf_extractor = PDFExtractor(require_pdfplumber=False)
+        self.resume_parser = ResumeParser()
+        self.jd_parser = JDParser()
+        self.index_path = Path(index_path or Path(config.cache_path) / "upload_hashes.jsonl")
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Replay the content-hash log of previous uploads."""
+        index = {}
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            index[record.pop("key")] = record
+            except Exception as e:
+                logger.warning(f"Could not load upload hash index: {e}")
+        return index
+
+    def _append_index(self, key: str, record: Dict):
+        """Append one upload to the hash log (caller holds the lock)."""
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, **record}) + "\n")
+        except Exception as e:
+            logger.error(f"Could not save upload hash index: {e}")
+
+    def _lookup(self, key: str) -> Optional[Dict]:
+        """Previous record for this upload hash, if its stored file still exists."""
+        with self._lock:
+            record = self._index.get(key)
+        if record and Path(record["path"]).exists():
+            return record
+        return None
+
+    def _extract_text(self, upload: StreamedUpload) -> str:
+        """Text content of a PDF or TXT upload."""
+        if upload.file_type == "pdf":
+            return self.pdf_extractor.extract_text_from_bytes(upload.content, upload.filename)["text"]
+
+        text = decode_text(upload.content)
+        if not text.strip():
+            raise UploadRejected("TXT file is empty")
+        return text
+
+    def _load_json(self, upload: StreamedUpload) -> Dict:
+        """Decode a JSON upload (validation and parsing in one pass)."""
+        try:
+            return json.loads(decode_text(upload.content))
+        except json.JSONDecodeError as e:
+            raise UploadRejected(f"Invalid JSON format: {str(e)}")
+
+    def _ingest(self, upload: StreamedUpload, kind: str) -> Dict:
+        """Parse and store an upload of the given kind ("resume" or "jd")."""
+        key = f"{kind}:{upload.sha256}"
+        existing = self._lookup(key)
+        if existing:
+            metrics.record_cache("uploads", hit=True)
+            logger.info(f"Duplicate upload {upload.filename}, reusing {existing['id']}")
+            return {**existing, "duplicate": True}
+        metrics.record_cache("uploads", hit=False)
+
+        if kind == "resume":
+            if upload.file_type == "json":
+                data = self.resume_parser.parse_from_json_data(self._load_json(upload), upload.filename)
+            else:
+                data = self.resume_parser.parse_from_text(self._extract_text(upload))
+            # Same content under different bytes (re-export, whitespace) resolves to the stored copy
+            path, duplicate = self.storage.save_resume_unique(data)
+            record_id = data["candidate_id"]
+        else:
+            if upload.file_type == "json":
+                data = self.jd_parser.parse_from_json_data(self._load_json(upload), upload.filename)
+            else:
+                data = self.jd_parser.parse_from_text(self._extract_text(upload))
+            path = self.storage.save_jd(data)
+            record_id = data["jd_id"]
+            duplicate = False
+
+        record = {"id": record_id, "path": path, "content_hash": upload.sha256}
+        with self._lock:
+            self._index[key] = record
+            self._append_index(key, record)
+
+        return {**record, "duplicate": duplicate, "data": data}
+
+    def ingest_resume(self, upload: StreamedUpload) -> Dict:
+        """
+        Parse and store an uploaded resume.
+
+        Args:
+            upload: Streamed upload
+
+        Returns:
+            Record with id (candidate_id), stored path, content_hash and duplicate flag
+        """
+        return self._ingest(upload, "resume")
+
+    def ingest_jd(self, upload: StreamedUpload) -> Dict:
+        """
+        Parse and store an uploaded job description.
+
+        Args:
+            upload: Streamed upload
+
+        Returns:
+            Record with id (jd_id), stored path, content_hash and duplicate flag
+        """
+        return self._ingest(upload, "jd")
@@ -1,5 +1,29 @@
 """LLM module."""
 from .client import LLMClient
-from .analyzer import LLMAnalyzer
+from .chat_request import ChatRequest
+from .analyzer import AnalysisError, LLMAnalyzer
+from .budget import Budget, BudgetExceeded, current_budget, get_budget_tracker
+from .json_repair import IncrementalJSONParser, JSONRepairError, repair_json
+from .rate_limiter import ProviderRateLimiter, get_all_rate_limiter_metrics
+from .scheduler import LLMScheduler, WorkCancelled, WorkTicket, current_work, new_job_id
 
-__all__ = ["LLMClient", "LLMAnalyzer"]
+__all__ = [
+    "LLMClient",
+    "ChatRequest",
+    "LLMAnalyzer",
+    "AnalysisError",
+    "Budget",
+    "BudgetExceeded",
+    "current_budget",
+    "get_budget_tracker",
+    "IncrementalJSONParser",
+    "JSONRepairError",
+    "repair_json",
+    "ProviderRateLimiter",
+    "get_all_rate_limiter_metrics",
+    "LLMScheduler",
+    "WorkCancelled",
+    "WorkTicket",
+    "current_work",
+    "new_job_id",
+]
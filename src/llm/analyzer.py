@@ -1,12 +1,29 @@
 """LLM-based resume/JD analysis."""
-from typing import Dict
+from typing import Callable, Dict, Optional
+import json
 import logging
 
 from .client import LLMClient
+from .json_repair import JSONRepairError
+from .response_parser import ANALYSIS_SCHEMA, ResponseParser
+from src.monitoring import metrics
 from src.prompts.prompt_loader import PromptLoader
 
 logger = logging.getLogger(__name__)
 
+# Follow-up sent once when an answer cannot be parsed or fails validation
+REASK_PROMPT = (
+    "Your previous answer could not be used: {problem}. "
+    "Reply with only a JSON object with the fields overall_score (number 0-100), "
+    "similarity_score (number 0-100), must_have_matches (list of strings), "
+    "reason_codes (list of strings) and matched_sections (object mapping requirement to resume section). "
+    "No other text."
+)
+
+
+class AnalysisError(ValueError):
+    """Raised when the LLM gives no usable analysis; the candidate is reported as failed, not ranked."""
+
 
 class LLMAnalyzer:
     """Analyze resumes against job descriptions using LLM."""
@@ -22,57 +39,109 @@ class LLMAnalyzer:
         self.llm_client = llm_client
         self.prompt_loader = prompt_loader
     
-    def analyze_candidate(self, resume: Dict, job_description: Dict) -> Dict:
+    def analyze_candidate(
+        self,
+        resume: Dict,
+        job_description: Dict,
+        on_provisional: Optional[Callable[[Dict], None]] = None,
+    ) -> Dict:
         """
         Analyze candidate resume against job description.
         
         Args:
             resume: Structured resume JSON
             job_description: Structured JD JSON
+            on_provisional: With LLM_STREAMING, called once with the analysis
+                as soon as both scores have streamed in (lists may still be partial)
             
         Returns:
             Analysis results with scores and reason codes
+            
+        Raises:
+            AnalysisError: If the response is unusable even after one re-ask
         """
         logger.info(f"Analyzing candidate {resume.get('candidate_id', 'unknown')} against JD {job_description.get('jd_id', 'unknown')}")
         
-        # Load and format scoring prompt
-        prompt = self.prompt_loader.format_prompt(
-            "scoring_prompt",
-            job_description=job_description.get("description", ""),
-            must_have_requirements="\n".join(job_description.get("must_have_requirements", [])),
-            resume_text=resume.get("raw_text", ""),
-            candidate_name=resume.get("name", "Unknown"),
-            candidate_skills=", ".join(resume.get("skills", [])),
-        )
+        # Load and format scoring prompt (JD prefix first, so providers can cache it across candidates)
+        with metrics.time_stage("prompt_format"):
+            prompt = self.prompt_loader.format_scoring_prompt(
+                job_description=job_description.get("description", ""),
+                must_have_requirements="\n".join(job_description.get("must_have_requirements", [])),
+                resume_text=resume.get("raw_text", ""),
+                candidate_name=resume.get("name", "Unknown"),
+                candidate_skills=", ".join(resume.get("skills", [])),
+            )
         
-        # Invoke LLM
-        try:
-            response = self.llm_client.invoke(prompt, parse_json=True)
-            
-            # Validate response structure
-            if not isinstance(response, dict):
-                raise ValueError("LLM response is not a dictionary")
+        # Invoke LLM (provider errors propagate: the candidate fails instead of scoring 0)
+        return self._request_analysis(prompt, on_provisional)
+    
+    @staticmethod
+    def _provisional_listener(on_provisional: Callable[[Dict], None]) -> Callable[[Dict], None]:
+        """Partial-object handler that publishes the analysis once both scores are complete."""
+        published = False
+        
+        def on_partial(partial: Dict):
+            nonlocal published
+            if published:
+                return
+            try:
+                analysis = ResponseParser.normalize_analysis(partial)
+            except ValueError:
+                return
+            published = True
+            on_provisional(analysis)
+        
+        return on_partial
+    
+    def _request_analysis(self, prompt: Dict[str, str], on_provisional: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """
+        Ask for the analysis, re-asking once with the problem if the answer is unusable.
+        
+        The first attempt is streamed when LLM_STREAMING is on and a
+        provisional-score callback is given; the re-ask is not.
+        
+        Args:
+            prompt: Formatted scoring prompt parts (see PromptLoader.format_scoring_prompt)
+            on_provisional: Provisional analysis callback
             
-            # Ensure required fields
-            analysis = {
-                "overall_score": response.get("overall_score", 0.0),
-                "similarity_score": response.get("similarity_score", 0.0),
-                "must_have_matches": response.get("must_have_matches", []),
-                "reason_codes": response.get("reason_codes", []),
-                "matched_sections": response.get("matched_sections", {}),
-            }
+        Returns:
+            Normalized analysis
             
-            logger.info(f"Analysis complete. Overall score: {analysis['overall_score']}")
-            return analysis
+        Raises:
+            AnalysisError: If neither answer could be parsed into a valid analysis
+        """
+        history = None
+        for attempt in range(2):
+            try:
+                if attempt == 0 and on_provisional is not None and self.llm_client.config.llm_streaming:
+                    response = self.llm_client.stream_json(
+                        prompt["candidate"],
+                        self._provisional_listener(on_provisional),
+                        system=prompt["system"],
+                        prefix=prompt["prefix"],
+                    )
+                else:
+                    response = self.llm_client.invoke_structured(
+                        prompt["candidate"],
+                        ANALYSIS_SCHEMA,
+                        history,
+                        system=prompt["system"],
+                        prefix=prompt["prefix"],
+                    )
+            except JSONRepairError as e:
+                problem, previous = str(e), e.text or ""
+            else:
+                try:
+                    analysis = ResponseParser.normalize_analysis(response)
+                    logger.info(f"Analysis complete. Overall score: {analysis['overall_score']}")
+                    return analysis
+                except ValueError as e:
+                    problem, previous = str(e), json.dumps(response, ensure_ascii=False)
             
-        except Exception as e:
-            logger.error(f"Error analyzing candidate: {str(e)}")
-            # Return default analysis on error
-            return {
-                "overall_score": 0.0,
-                "similarity_score": 0.0,
-                "must_have_matches": [],
-                "reason_codes": ["ERROR: Analysis failed"],
-                "matched_sections": {},
-            }
-
+            logger.warning(f"Unusable analysis response (attempt {attempt + 1}): {problem}")
+            history = [("ai", previous), ("human", REASK_PROMPT.format(problem=problem))]
+            if attempt == 0:
+                metrics.inc("talent_llm_responses_total", labels={"outcome": "reask"})
+        
+        metrics.inc("talent_llm_responses_total", labels={"outcome": "failed"})
+        raise AnalysisError(f"LLM returned no usable analysis after a re-ask: {problem}")
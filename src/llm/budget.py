@@ -0,0 +1,314 @@
+"""Token and cost accounting for LLM calls, with per-job and per-day caps."""
+from contextvars import ContextVar
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import json
+import logging
+import threading
+
+from src.config import Config
+from src.monitoring import metrics
+
+logger = logging.getLogger(__name__)
+
+# USD per million tokens: (input, cached input, output). Matched by longest model-name prefix.
+MODEL_PRICES: Dict[str, Tuple[float, float, float]] = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4-turbo": (10.00, 10.00, 30.00),
+    "gpt-4": (30.00, 30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 0.50, 1.50),
+    "claude-3-haiku": (0.25, 0.03, 1.25),
+    "claude-3-5-haiku": (0.80, 0.08, 4.00),
+    "claude-3-5-sonnet": (3.00, 0.30, 15.00),
+    "claude-3-7-sonnet": (3.00, 0.30, 15.00),
+    "claude-sonnet-4": (3.00, 0.30, 15.00),
+    "claude-3-opus": (15.00, 1.50, 75.00),
+    "claude-opus-4": (15.00, 1.50, 75.00),
+    "gemini-pro": (0.50, 0.50, 1.50),
+    "gemini-1.0-pro": (0.50, 0.50, 1.50),
+    "gemini-1.5-flash": (0.075, 0.01875, 0.30),
+    "gemini-1.5-pro": (1.25, 0.3125, 5.00),
+    "gemini-2.0-flash": (0.10, 0.025, 0.40),
+    "gemini-2.5-flash": (0.30, 0.075, 2.50),
+    "gemini-2.5-pro": (1.25, 0.31, 10.00),
+}
+
+# Providers that cost nothing per token
+FREE_PROVIDERS = {"ollama", "mock"}
+
+# Budget of the job the current code runs for (set by the pipeline workers)
+current_budget: ContextVar[Optional["Budget"]] = ContextVar("current_budget", default=None)
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised instead of dispatching an LLM call once a budget cap is reached."""
+
+
+def parse_price_overrides(text: str) -> Dict[str, Tuple[float, float, float]]:
+    """
+    Parse LLM_PRICES: a JSON object of model -> [input, output] or [input, cached_input, output].
+
+    Args:
+        text: JSON text (empty for no overrides)
+
+    Returns:
+        Model prefix -> (input, cached input, output) USD per million tokens
+    """
+    if not text.strip():
+        return {}
+    try:
+        raw = json.loads(text)
+        prices = {}
+        for model, values in raw.items():
+            values = [float(value) for value in values]
+            if len(values) == 2:
+                values = [values[0], values[0], values[1]]
+            if len(values) != 3:
+                raise ValueError(f"{model}: expected 2 or 3 prices")
+            prices[model] = tuple(values)
+        return prices
+    except (AttributeError, TypeError, ValueError) as e:
+        logger.error(f"Ignoring invalid LLM_PRICES: {e}")
+        return {}
+
+
+class PriceTable:
+    """Per-model token prices."""
+
+    def __init__(self, overrides: Optional[Dict[str, Tuple[float, float, float]]] = None):
+        """
+        Initialize price table.
+
+        Args:
+            overrides: Prices replacing or extending MODEL_PRICES
+        """
+        self.prices = {**MODEL_PRICES, **(overrides or {})}
+        self._warned = set()
+
+    def price(self, provider: str, model: str) -> Tuple[float, float, float]:
+        """Prices for a model, zero for free providers and unknown models (logged once)."""
+        name = model.split("/")[-1].lower()
+        matches = [prefix for prefix in self.prices if name.startswith(prefix.lower())]
+        if matches:
+            return self.prices[max(matches, key=len)]
+        if provider not in FREE_PROVIDERS and name not in self._warned:
+            self._warned.add(name)
+            logger.warning(f"No price known for model {model}; its calls count tokens but no cost (set LLM_PRICES)")
+        return (0.0, 0.0, 0.0)
+
+    def cost(self, provider: str, model: str, usage: Dict) -> float:
+        """
+        Cost of one call from its LangChain usage metadata.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            usage: usage_metadata of the response (input_tokens includes cached tokens)
+
+        Returns:
+            Cost in USD
+        """
+        input_price, cached_price, output_price = self.price(provider, model)
+        cached = (usage.get("input_token_details") or {}).get("cache_read") or 0
+        uncached = max(0, (usage.get("input_tokens") or 0) - cached)
+        output = usage.get("output_tokens") or 0
+        return (uncached * input_price + cached * cached_price + output * output_price) / 1_000_000
+
+
+class Budget:
+    """Token and cost usage of one scope (a job or a day), with optional caps."""
+
+    def __init__(self, name: str, max_tokens: int = 0, max_cost: float = 0.0):
+        """
+        Initialize budget.
+
+        Args:
+            name: Scope name, used in messages and metrics
+            max_tokens: Token cap (0 for none)
+            max_cost: Cost cap in USD (0 for none)
+        """
+        self.name = name
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.tokens = 0
+        self.cost = 0.0
+        self.calls = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_job(cls, config: Config, name: str = "job") -> "Budget":
+        """Budget with the per-job caps from the configuration."""
+        return cls(name, config.job_max_tokens, config.job_max_cost_usd)
+
+    def exceeded(self) -> Optional[str]:
+        """Why the budget is used up, or None while calls may still be dispatched."""
+        if self.max_tokens and self.tokens >= self.max_tokens:
+            return f"{self.name} token budget reached ({self.tokens}/{self.max_tokens} tokens)"
+        if self.max_cost and self.cost >= self.max_cost:
+            return f"{self.name} cost budget reached (${self.cost:.4f}/${self.max_cost:.2f})"
+        return None
+
+    def charge(self, tokens: int, cost: float):
+        """Add one call's usage."""
+        with self._lock:
+            self.tokens += tokens
+            self.cost += cost
+            self.calls += 1
+
+    def reject(self):
+        """Count a call that was not dispatched because the budget was used up."""
+        with self._lock:
+            self.rejected += 1
+
+    def to_dict(self) -> Dict:
+        """Usage summary for status endpoints and result files."""
+        return {
+            "tokens": self.tokens,
+            "cost_usd": round(self.cost, 6),
+            "calls": self.calls,
+            "skipped_calls": self.rejected,
+            "max_tokens": self.max_tokens or None,
+            "max_cost_usd": self.max_cost or None,
+            "exhausted": self.exceeded() is not None,
+        }
+
+
+class DailyBudget(Budget):
+    """Budget that resets at midnight and survives restarts (persisted as JSON)."""
+
+    def __init__(self, path: Optional[Path], max_tokens: int = 0, max_cost: float = 0.0):
+        """
+        Initialize daily budget.
+
+        Args:
+            path: File holding today's usage (None to keep it in memory only)
+            max_tokens: Daily token cap (0 for none)
+            max_cost: Daily cost cap in USD (0 for none)
+        """
+        super().__init__("daily", max_tokens, max_cost)
+        self.path = Path(path) if path else None
+        self.day = date.today().isoformat()
+        if self.path is None:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("day") == self.day:
+                self.tokens = saved.get("tokens", 0)
+                self.cost = saved.get("cost_usd", 0.0)
+                self.calls = saved.get("calls", 0)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not read daily LLM usage {self.path}: {e}")
+
+    def _roll_over(self):
+        today = date.today().isoformat()
+        if today != self.day:
+            self.day = today
+            self.tokens, self.cost, self.calls, self.rejected = 0, 0.0, 0, 0
+
+    def exceeded(self) -> Optional[str]:
+        with self._lock:
+            self._roll_over()
+        return super().exceeded()
+
+    def charge(self, tokens: int, cost: float):
+        with self._lock:
+            self._roll_over()
+            self.tokens += tokens
+            self.cost += cost
+            self.calls += 1
+            state = {"day": self.day, "tokens": self.tokens, "cost_usd": self.cost, "calls": self.calls}
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            tmp_path.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Could not save daily LLM usage: {e}")
+
+    def to_dict(self) -> Dict:
+        return {"day": self.day, **super().to_dict()}
+
+
+class BudgetTracker:
+    """Charges every LLM call to the daily budget and the current job's budget."""
+
+    def __init__(self, config: Config):
+        """
+        Initialize tracker.
+
+        Args:
+            config: Configuration (LLM_PRICES, DAILY_MAX_TOKENS, DAILY_MAX_COST_USD, CACHE_PATH)
+        """
+        self.prices = PriceTable(parse_price_overrides(config.llm_prices))
+        # Usage only needs to survive restarts when there is a daily cap to enforce
+        capped = config.daily_max_tokens or config.daily_max_cost_usd
+        self.daily = DailyBudget(
+            Path(config.cache_path) / "budget" / "daily_usage.json" if capped else None,
+            config.daily_max_tokens,
+            config.daily_max_cost_usd,
+        )
+
+    def check(self):
+        """
+        Make sure another call may be dispatched.
+
+        Raises:
+            BudgetExceeded: If the current job's or today's cap is reached
+        """
+        for budget in (current_budget.get(), self.daily):
+            if budget is None:
+                continue
+            reason = budget.exceeded()
+            if reason:
+                budget.reject()
+                metrics.inc("talent_llm_budget_rejections_total", labels={"scope": budget.name})
+                raise BudgetExceeded(reason)
+
+    def record(self, provider: str, model: str, message: Any) -> float:
+        """
+        Charge a finished call.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            message: Response message carrying usage_metadata
+
+        Returns:
+            Cost of the call in USD
+        """
+        usage = getattr(message, "usage_metadata", None)
+        if not usage:
+            return 0.0
+        tokens = usage.get("total_tokens") or (usage.get("input_tokens", 0) + usage.get("output_tokens", 0))
+        cost = self.prices.cost(provider, model, usage)
+        if cost:
+            metrics.inc("talent_llm_cost_usd_total", cost, {"provider": provider, "model": model})
+        self.daily.charge(tokens, cost)
+        job_budget = current_budget.get()
+        if job_budget is not None:
+            job_budget.charge(tokens, cost)
+        return cost
+
+
+_trackers: Dict[str, BudgetTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_budget_tracker(config: Config) -> BudgetTracker:
+    """Get (or create) the shared budget tracker for a cache directory."""
+    with _trackers_lock:
+        if config.cache_path not in _trackers:
+            _trackers[config.cache_path] = BudgetTracker(config)
+        return _trackers[config.cache_path]
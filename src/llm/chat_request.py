@@ -0,0 +1,79 @@
+"""Chat messages laid out for provider prompt-prefix caching."""
+from typing import Any, List, Optional, Tuple
+import hashlib
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful assistant."
+
+
+class ChatRequest:
+    """
+    One LLM call as system instructions, a stable prefix and a per-call part.
+
+    The system message and prefix (e.g. scoring instructions and the job
+    description) are identical for every candidate of a run and are sent
+    first, so providers can reuse their processed prefix: Anthropic through
+    an explicit cache_control breakpoint, OpenAI and Gemini through their
+    automatic prefix caching (OpenAI additionally gets a prompt_cache_key so
+    calls sharing a prefix are routed to the same cache).
+    """
+
+    def __init__(
+        self,
+        prompt: str,
+        history: Optional[List[Tuple[str, str]]] = None,
+        system: Optional[str] = None,
+        prefix: Optional[str] = None,
+    ):
+        """
+        Initialize chat request.
+
+        Args:
+            prompt: Per-call text (sent after the prefix)
+            history: Follow-up (role, text) messages, e.g. a previous answer and a correction
+            system: System instructions (defaults to a generic assistant prompt)
+            prefix: Stable text shared by many calls (cacheable)
+        """
+        self.prompt = prompt
+        self.history = history or []
+        self.system = system or DEFAULT_SYSTEM_PROMPT
+        self.prefix = prefix
+
+    @property
+    def cache_key(self) -> str:
+        """Identifies the cacheable part (system + prefix)."""
+        return hashlib.sha256(f"{self.system}\x00{self.prefix or ''}".encode("utf-8")).hexdigest()[:32]
+
+    def template(self, provider: str) -> ChatPromptTemplate:
+        """
+        Messages for a provider (literal messages, no template variables).
+
+        Args:
+            provider: Provider name of the backend handling the call
+
+        Returns:
+            Prompt template to pipe into the model
+        """
+        if not self.prefix:
+            content: Any = self.prompt
+        elif provider == "anthropic":
+            content = [
+                {"type": "text", "text": self.prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": self.prompt},
+            ]
+        else:
+            content = f"{self.prefix}\n\n{self.prompt}"
+
+        messages = [SystemMessage(content=self.system), HumanMessage(content=content)]
+        for role, text in self.history:
+            messages.append(AIMessage(content=text) if role == "ai" else HumanMessage(content=text))
+        return ChatPromptTemplate.from_messages(messages)
+
+    def bind(self, provider: str, model: Any) -> Any:
+        """Attach provider cache routing hints to a plain chat model."""
+        if provider == "openai" and self.prefix and isinstance(model, BaseChatModel):
+            return model.bind(prompt_cache_key=self.cache_key)
+        return model
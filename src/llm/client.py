@@ -4,12 +4,25 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_anthropic import ChatAnthropic
 from langchain_community.llms import Ollama
 from langchain_core.language_models import BaseChatModel
-from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
+from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from typing import Dict, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import contextvars
+import json
 import logging
+import threading
+import time
 
 from src.config import Config
+from src.monitoring import metrics
+from .budget import BudgetExceeded, get_budget_tracker
+from .chat_request import ChatRequest
+from .failover import ProviderBackend
+from .json_repair import IncrementalJSONParser, JSONRepairError, strip_code_fence
+from .mock_llm import MockChatModel
+from .rate_limiter import get_rate_limiter, is_overload_error
+from .scheduler import get_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -25,13 +38,45 @@ class LLMClient:
             config: Configuration object
         """
         self.config = config
-        self.llm = self._initialize_llm()
-        self.json_parser = JsonOutputParser()
+        self.backends = self._initialize_backends()
+        self.budget = get_budget_tracker(config)
+        # Calls queue here by priority and job before reaching the provider limiter
+        self.scheduler = get_scheduler(self.backends[0].rate_limiter, config)
+        
+        # The first healthy provider is the primary one
+        self.provider = self.backends[0].name
+        self.llm = self.backends[0].llm
+        self.rate_limiter = self.backends[0].rate_limiter
+        
         self.str_parser = StrOutputParser()
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_stats = {"fired": 0, "won_by_backup": 0}
+        self._hedge_lock = threading.Lock()
+    
+    def _initialize_backends(self) -> List[ProviderBackend]:
+        """Initialize every provider in the failover chain, skipping misconfigured ones."""
+        backends = []
+        first_error = None
+        
+        for provider in self.config.llm_provider_chain:
+            try:
+                llm = self._initialize_llm(provider)
+            except ValueError as e:
+                if first_error is None:
+                    first_error = e
+                logger.warning(f"Skipping LLM provider {provider}: {e}")
+                continue
+            backends.append(ProviderBackend(provider, llm, get_rate_limiter(provider, self.config)))
+        
+        if not backends:
+            raise first_error or ValueError("No LLM provider configured")
+        
+        logger.info(f"LLM provider chain: {[b.name for b in backends]}")
+        return backends
     
-    def _initialize_llm(self) -> BaseChatModel:
+    def _initialize_llm(self, provider: Optional[str] = None) -> BaseChatModel:
         """Initialize LLM based on provider configuration."""
-        provider = self.config.llm_provider.lower()
+        provider = (provider or self.config.llm_provider).lower()
         
         logger.info(f"Initializing LLM provider: {provider}")
         
@@ -44,7 +89,8 @@ class LLMClient:
                 openai_api_key=self.config.openai_api_key,
                 temperature=self.config.llm_temperature,
                 max_tokens=self.config.llm_max_tokens,
-                max_retries=3,
+                # Retries are owned by the rate limiter and failover (see _generate_with_failover)
+                max_retries=0,
                 timeout=self.config.llm_timeout,
             )
         
@@ -57,7 +103,8 @@ class LLMClient:
                 google_api_key=self.config.google_api_key,
                 temperature=self.config.llm_temperature,
                 max_output_tokens=self.config.llm_max_tokens,
-                max_retries=3,
+                # Retries are owned by the rate limiter and failover (see _generate_with_failover)
+                max_retries=0,
             )
         
         elif provider == "anthropic":
@@ -69,7 +116,17 @@ class LLMClient:
                 anthropic_api_key=self.config.anthropic_api_key,
                 temperature=self.config.llm_temperature,
                 max_tokens=self.config.llm_max_tokens,
-                max_retries=3,
+                # Retries are owned by the rate limiter and failover (see _generate_with_failover)
+                max_retries=0,
+            )
+        
+        elif provider == "mock":
+            return MockChatModel(
+                latency_ms=self.config.mock_llm_latency_ms,
+                latency_sigma=self.config.mock_llm_latency_sigma,
+                error_rate=self.config.mock_llm_error_rate,
+                rate_limit_rate=self.config.mock_llm_rate_limit_rate,
+                seed=self.config.mock_llm_seed,
             )
         
         elif provider == "ollama":
@@ -82,6 +139,262 @@ class LLMClient:
         else:
             raise ValueError(f"Unsupported LLM provider: {provider}")
     
+    def _estimate_tokens(self, text: str) -> int:
+        """Rough token estimate (prompt + max completion) used to reserve TPM budget."""
+        return len(text) // 4 + self.config.llm_max_tokens
+    
+    @staticmethod
+    def _get_token_usage(message: Any) -> Optional[int]:
+        """Total tokens reported in the response metadata, if any."""
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            return usage.get("total_tokens")
+        return None
+    
+    @staticmethod
+    def _record_usage(provider: str, message: Any):
+        """Count input/output tokens (and input tokens served from the provider's prompt cache)."""
+        usage = getattr(message, "usage_metadata", None)
+        if not usage:
+            return
+        metrics.inc("talent_llm_tokens_total", usage.get("input_tokens", 0), {"provider": provider, "direction": "input"})
+        metrics.inc("talent_llm_tokens_total", usage.get("output_tokens", 0), {"provider": provider, "direction": "output"})
+        cache_read = (usage.get("input_token_details") or {}).get("cache_read")
+        if cache_read:
+            metrics.inc("talent_llm_tokens_total", cache_read, {"provider": provider, "direction": "cache_read"})
+    
+    @staticmethod
+    def _prepare(backend: ProviderBackend, template: ChatPromptTemplate | ChatRequest, model: Any) -> Tuple[ChatPromptTemplate, Any]:
+        """Lay out a ChatRequest for the backend's provider (prompt caching); plain templates pass through."""
+        if isinstance(template, ChatRequest):
+            return template.template(backend.name), template.bind(backend.name, model)
+        return template, model
+    
+    def _generate(
+        self,
+        backend: ProviderBackend,
+        template: ChatPromptTemplate | ChatRequest,
+        variables: Dict,
+        schema: Optional[Dict] = None,
+    ) -> Any:
+        """Run one rate-limited call against a single provider.
+        
+        With a schema, providers that support native structured output
+        (JSON schema / tool calling) are asked for it; the result is then a
+        {"raw", "parsed", "parsing_error"} dict instead of a message.
+        """
+        model = backend.llm
+        if schema is not None and self.config.llm_structured_output:
+            model = backend.structured_llm(schema) or backend.llm
+        template, model = self._prepare(backend, template, model)
+        estimated_tokens = self._estimate_tokens(template.format(**variables))
+        self.budget.check()
+        
+        started = time.monotonic()
+        try:
+            with backend.rate_limiter.slot(estimated_tokens) as slot:
+                output = (template | model).invoke(variables)
+                message = output["raw"] if isinstance(output, dict) else output
+                slot.record_tokens(self._get_token_usage(message))
+        except Exception as e:
+            backend.failures += 1
+            metrics.inc("talent_llm_requests_total", labels={"provider": backend.name, "outcome": "error"})
+            metrics.record_error("llm_provider", e)
+            raise
+        
+        backend.latency.record(time.monotonic() - started)
+        metrics.inc("talent_llm_requests_total", labels={"provider": backend.name, "outcome": "success"})
+        self._record_usage(backend.name, message)
+        self.budget.record(backend.name, backend.model, message)
+        return output
+    
+    def _stream(
+        self,
+        backend: ProviderBackend,
+        template: ChatPromptTemplate | ChatRequest,
+        variables: Dict,
+        on_text: Callable[[str], None],
+    ) -> str:
+        """Run one rate-limited streaming call against a single provider; returns the full text."""
+        template, model = self._prepare(backend, template, backend.llm)
+        estimated_tokens = self._estimate_tokens(template.format(**variables))
+        self.budget.check()
+        
+        started = time.monotonic()
+        parts = []
+        message = None
+        try:
+            with backend.rate_limiter.slot(estimated_tokens) as slot:
+                for chunk in (template | model).stream(variables):
+                    if message is None:
+                        metrics.observe("talent_llm_first_token_seconds", time.monotonic() - started, {"provider": backend.name})
+                    # Chunks add up to the complete message (including usage metadata)
+                    message = chunk if message is None else message + chunk
+                    text = self._message_text(chunk)
+                    if text:
+                        parts.append(text)
+                        on_text(text)
+                slot.record_tokens(self._get_token_usage(message))
+        except Exception as e:
+            backend.failures += 1
+            metrics.inc("talent_llm_requests_total", labels={"provider": backend.name, "outcome": "error"})
+            metrics.record_error("llm_provider", e)
+            raise
+        
+        backend.latency.record(time.monotonic() - started)
+        metrics.inc("talent_llm_requests_total", labels={"provider": backend.name, "outcome": "success"})
+        self._record_usage(backend.name, message)
+        self.budget.record(backend.name, backend.model, message)
+        return "".join(parts)
+    
+    def _generate_with_failover(
+        self,
+        backends: List[ProviderBackend],
+        template: ChatPromptTemplate | ChatRequest,
+        variables: Dict,
+        schema: Optional[Dict] = None,
+    ) -> Any:
+        """Try each provider in order until one answers.
+        
+        An overloaded provider (429/timeout) fails over to the next one at
+        once; the last provider is retried up to LLM_OVERLOAD_RETRIES times,
+        each retry waiting in its rate limiter until the buckets it drained
+        on the overload have refilled.
+        """
+        last_error = None
+        for position, backend in enumerate(backends):
+            retries = self.config.llm_overload_retries if position == len(backends) - 1 else 0
+            for attempt in range(retries + 1):
+                try:
+                    return self._generate(backend, template, variables, schema)
+                except BudgetExceeded:
+                    # Not a provider failure: no other provider may be called either
+                    raise
+                except Exception as e:
+                    last_error = e
+                    logger.warning(f"LLM provider {backend.name} failed: {str(e)}")
+                    if not is_overload_error(e):
+                        break
+                    if attempt < retries:
+                        logger.info(f"Retrying overloaded provider {backend.name} ({attempt + 1}/{retries})")
+        
+        raise last_error or ValueError("No LLM provider available")
+    
+    def _generate_hedged(self, template: ChatPromptTemplate | ChatRequest, variables: Dict, schema: Optional[Dict] = None) -> Any:
+        """Call the primary provider and, if it is slower than its p95, race a backup against it."""
+        primary, backups = self.backends[0], self.backends[1:]
+        
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=self.config.llm_max_concurrency * 2,
+                thread_name_prefix="llm-hedge",
+            )
+        
+        delay = primary.latency.hedge_delay(
+            self.config.llm_hedge_quantile,
+            default=self.config.llm_hedge_initial_delay,
+            minimum=self.config.llm_hedge_min_delay,
+        )
+        # Hedge threads run in a copy of the caller's context, so calls are charged to the caller's job budget
+        primary_future = self._hedge_executor.submit(
+            contextvars.copy_context().run, self._generate, primary, template, variables, schema
+        )
+        try:
+            return primary_future.result(timeout=delay)
+        except FutureTimeoutError:
+            logger.debug(f"Primary provider slower than {delay:.2f}s, sending hedged request")
+        except BudgetExceeded:
+            raise
+        except Exception:
+            return self._generate_with_failover(backups, template, variables, schema)
+        
+        with self._hedge_lock:
+            self._hedge_stats["fired"] += 1
+        backup_future = self._hedge_executor.submit(
+            contextvars.copy_context().run, self._generate_with_failover, backups, template, variables, schema
+        )
+        
+        # Take whichever answers first; the loser finishes in the background and is discarded
+        pending = {primary_future, backup_future}
+        last_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup_future:
+                        with self._hedge_lock:
+                            self._hedge_stats["won_by_backup"] += 1
+                    return future.result()
+                last_error = future.exception()
+        
+        raise last_error
+    
+    @staticmethod
+    def _message_text(message: Any) -> str:
+        """Text content of a chat message (or of a plain LLM string output)."""
+        content = getattr(message, "content", message)
+        if isinstance(content, list):
+            # Content blocks (e.g. Anthropic): keep the text parts
+            return "".join(
+                block.get("text", "") if isinstance(block, dict) else str(block)
+                for block in content
+            )
+        return str(content)
+    
+    @staticmethod
+    def _parse_json_text(text: str) -> Any:
+        """Parse JSON output, repairing malformed JSON when needed."""
+        try:
+            value = json.loads(strip_code_fence(text))
+            outcome = "valid"
+        except json.JSONDecodeError:
+            try:
+                value = IncrementalJSONParser().feed(text).result()
+            except JSONRepairError as e:
+                metrics.inc("talent_llm_responses_total", labels={"outcome": "unparseable"})
+                raise JSONRepairError(str(e), text) from e
+            outcome = "repaired"
+        metrics.inc("talent_llm_responses_total", labels={"outcome": outcome})
+        return value
+    
+    def _parse_structured(self, output: Any) -> Any:
+        """Parsed value of a structured call: native result, tool call arguments or repaired JSON text."""
+        if isinstance(output, dict):
+            if isinstance(output.get("parsed"), dict):
+                metrics.inc("talent_llm_responses_total", labels={"outcome": "native"})
+                return output["parsed"]
+            message = output["raw"]
+            for tool_call in getattr(message, "tool_calls", None) or []:
+                if isinstance(tool_call.get("args"), dict) and tool_call["args"]:
+                    metrics.inc("talent_llm_responses_total", labels={"outcome": "native"})
+                    return tool_call["args"]
+        else:
+            message = output
+        return self._parse_json_text(self._message_text(message))
+    
+    def _call(
+        self,
+        template: ChatPromptTemplate | ChatRequest,
+        variables: Dict,
+        parse_json: bool,
+        schema: Optional[Dict] = None,
+    ) -> Dict | str:
+        """Get a completion (with failover/hedging) and parse the output."""
+        with self.scheduler.permit(), metrics.time_stage("llm_call"):
+            if self.config.llm_hedge_enabled and len(self.backends) > 1:
+                output = self._generate_hedged(template, variables, schema)
+            else:
+                output = self._generate_with_failover(self.backends, template, variables, schema)
+        
+        if schema is not None:
+            with metrics.time_stage("json_parse"):
+                return self._parse_structured(output)
+        if parse_json:
+            with metrics.time_stage("json_parse"):
+                return self._parse_json_text(self._message_text(output))
+        with metrics.time_stage("text_parse"):
+            return self.str_parser.invoke(output)
+    
     def invoke(self, prompt: str, parse_json: bool = True) -> Dict | str:
         """
         Invoke LLM with prompt.
@@ -100,22 +413,119 @@ class LLMClient:
                 ("human", "{input}")
             ])
             
-            # Create chain
-            if parse_json:
-                chain = prompt_template | self.llm | self.json_parser
-            else:
-                chain = prompt_template | self.llm | self.str_parser
-            
-            # Invoke chain
-            result = chain.invoke({"input": prompt})
+            result = self._call(prompt_template, {"input": prompt}, parse_json)
             
             logger.debug(f"LLM response received: {type(result)}")
             return result
             
+        except BudgetExceeded as e:
+            logger.info(f"LLM call not dispatched: {e}")
+            raise
         except Exception as e:
             logger.error(f"Error invoking LLM: {str(e)}")
             raise
     
+    def stream_json(
+        self,
+        prompt: str,
+        on_partial: Callable[[Dict], None],
+        history: Optional[List[Tuple[str, str]]] = None,
+        system: Optional[str] = None,
+        prefix: Optional[str] = None,
+    ) -> Any:
+        """
+        Stream a JSON object response, reporting fields as soon as they are complete.
+        
+        The output is parsed incrementally; `on_partial` receives the object
+        built from the fully received fields every time a new one completes,
+        so early fields (e.g. scores) are usable while the rest streams in.
+        Providers are tried in failover order (no hedging).
+        
+        Args:
+            prompt: The prompt text
+            on_partial: Called with each new partial object
+            history: Follow-up (role, text) messages after the prompt
+            system: System instructions (see ChatRequest)
+            prefix: Stable, cacheable text sent before the prompt
+            
+        Returns:
+            Parsed JSON value of the complete response
+            
+        Raises:
+            JSONRepairError: If the response contains no recoverable JSON
+        """
+        request = ChatRequest(prompt, history, system, prefix)
+        
+        last_error = None
+        with self.scheduler.permit(), metrics.time_stage("llm_call"):
+            for backend in self.backends:
+                parser = IncrementalJSONParser("{")
+                last_snapshot = [None]
+                
+                def on_text(text: str, parser: IncrementalJSONParser = parser):
+                    parser.feed(text)
+                    snapshot = parser.snapshot(complete_only=True)
+                    if snapshot is None or snapshot == last_snapshot[0]:
+                        return
+                    last_snapshot[0] = snapshot
+                    try:
+                        on_partial(json.loads(snapshot))
+                    except Exception as e:
+                        logger.warning(f"Partial response handler failed: {e}")
+                
+                try:
+                    text = self._stream(backend, request, {}, on_text)
+                    break
+                except BudgetExceeded:
+                    raise
+                except Exception as e:
+                    last_error = e
+                    logger.warning(f"LLM provider {backend.name} failed while streaming: {str(e)}")
+            else:
+                raise last_error or ValueError("No LLM provider available")
+        
+        with metrics.time_stage("json_parse"):
+            return self._parse_json_text(text)
+    
+    def invoke_structured(
+        self,
+        prompt: str,
+        schema: Dict,
+        history: Optional[List[Tuple[str, str]]] = None,
+        system: Optional[str] = None,
+        prefix: Optional[str] = None,
+    ) -> Any:
+        """
+        Invoke LLM for a JSON object matching `schema`.
+        
+        Uses the provider's native structured output (JSON schema / tool
+        calling) when available and tolerant JSON repair otherwise.
+        
+        Args:
+            prompt: The prompt text
+            schema: JSON schema of the expected object (must have a "title")
+            history: Follow-up (role, text) messages after the prompt, e.g.
+                the previous answer and a correction request
+            system: System instructions (see ChatRequest)
+            prefix: Stable, cacheable text sent before the prompt (e.g. the JD)
+            
+        Returns:
+            Parsed JSON value
+            
+        Raises:
+            JSONRepairError: If the response contains no recoverable JSON
+        """
+        try:
+            result = self._call(ChatRequest(prompt, history, system, prefix), {}, True, schema)
+            logger.debug(f"LLM structured response received: {type(result)}")
+            return result
+        except BudgetExceeded as e:
+            logger.info(f"LLM call not dispatched: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error invoking LLM for structured output: {str(e)}")
+            raise
+    
     def invoke_with_template(self, template: ChatPromptTemplate, variables: Dict, parse_json: bool = True) -> Dict | str:
         """
         Invoke LLM with prompt template.
@@ -129,19 +539,27 @@ class LLMClient:
             Parsed JSON dict or raw string response
         """
         try:
-            # Create chain
-            if parse_json:
-                chain = template | self.llm | self.json_parser
-            else:
-                chain = template | self.llm | self.str_parser
-            
-            # Invoke chain
-            result = chain.invoke(variables)
+            result = self._call(template, variables, parse_json)
             
             logger.debug(f"LLM response received: {type(result)}")
             return result
             
+        except BudgetExceeded as e:
+            logger.info(f"LLM call not dispatched: {e}")
+            raise
         except Exception as e:
             logger.error(f"Error invoking LLM with template: {str(e)}")
             raise
-
+    
+    def get_rate_limit_metrics(self) -> Dict:
+        """Current rate limiter state (concurrency limit, queue depth, budgets)."""
+        return self.rate_limiter.metrics()
+    
+    def get_provider_metrics(self) -> Dict:
+        """Latency, failover and hedging statistics per provider."""
+        return {
+            "providers": [backend.metrics() for backend in self.backends],
+            "hedging_enabled": self.config.llm_hedge_enabled,
+            "hedges": dict(self._hedge_stats),
+            "scheduler": self.scheduler.metrics(),
+        }
@@ -0,0 +1,105 @@
+"""Provider backends, latency tracking and hedging support for the LLM client."""
+from collections import deque
+from typing import Any, Dict, Optional
+import logging
+import threading
+
+from .rate_limiter import ProviderRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies for one provider."""
+
+    def __init__(self, window: int = 200, min_samples: int = 10):
+        """
+        Initialize latency tracker.
+
+        Args:
+            window: Number of recent latencies kept
+            min_samples: Samples required before quantiles are trusted
+        """
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """Record the latency of a successful call."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Latency quantile over the window.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Latency in seconds, or None if there are not enough samples
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+    def hedge_delay(self, q: float, default: float, minimum: float) -> float:
+        """Delay before firing a hedged request (quantile, or default when cold)."""
+        value = self.quantile(q)
+        if value is None:
+            return default
+        return max(minimum, value)
+
+
+class ProviderBackend:
+    """One configured LLM provider with its own limiter and latency stats."""
+
+    def __init__(self, name: str, llm: Any, rate_limiter: ProviderRateLimiter):
+        """
+        Initialize provider backend.
+
+        Args:
+            name: Provider name (openai, gemini, anthropic, ollama)
+            llm: LangChain model instance
+            rate_limiter: Shared rate limiter for this provider
+        """
+        self.name = name
+        self.llm = llm
+        # Model name, for pricing
+        self.model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or name
+        self.rate_limiter = rate_limiter
+        self.latency = LatencyTracker()
+        self.failures = 0
+        self._structured: Dict[str, Any] = {}
+
+    def structured_llm(self, schema: Dict) -> Optional[Any]:
+        """
+        Model bound to the provider's native structured output for `schema`.
+
+        Args:
+            schema: JSON schema with a "title"
+
+        Returns:
+            Runnable returning {"raw", "parsed", "parsing_error"}, or None if
+            the provider has no structured output support
+        """
+        title = schema["title"]
+        if title not in self._structured:
+            try:
+                self._structured[title] = self.llm.with_structured_output(schema, include_raw=True)
+            except (NotImplementedError, AttributeError, ValueError) as e:
+                logger.info(f"Provider {self.name} has no native structured output ({e}); using JSON repair")
+                self._structured[title] = None
+        return self._structured[title]
+
+    def metrics(self) -> Dict:
+        """Latency and failover statistics for monitoring."""
+        return {
+            "provider": self.name,
+            "p50_seconds": self.latency.quantile(0.5),
+            "p95_seconds": self.latency.quantile(0.95),
+            "failures": self.failures,
+        }
@@ -0,0 +1,375 @@
+"""Tolerant, incremental JSON parser for LLM output."""
+from typing import Any, List, Optional
+import json
+import re
+
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_BAREWORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_+-.")
+_LITERALS = {
+    "true": "true", "false": "false", "null": "null",
+    "True": "true", "False": "false", "None": "null",
+    "NaN": "null", "Infinity": "null", "-Infinity": "null", "undefined": "null",
+}
+_VALID_ESCAPES = frozenset('"\\/bfnrtu')
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+_FENCE = re.compile(r"^\s*```[a-zA-Z]*\s*\n?(.*?)\n?\s*```\s*$", re.DOTALL)
+
+
+class JSONRepairError(ValueError):
+    """Raised when no JSON value can be recovered from a response."""
+
+    def __init__(self, message: str, text: Optional[str] = None):
+        super().__init__(message)
+        # The offending response, when known (used to re-ask the model)
+        self.text = text
+
+
+class IncrementalJSONParser:
+    """
+    Rewrite LLM output into valid JSON as it arrives, character by character.
+
+    Handles the usual ways models break JSON: prose or code fences around
+    the object, single-quoted strings, unquoted keys, Python literals
+    (True/None), trailing or missing commas, comments, raw newlines in
+    strings, and output cut off mid-way. `snapshot()` closes whatever is
+    still open, so a partially received object can be read at any time.
+    """
+
+    def __init__(self, roots: str = "{["):
+        """
+        Initialize parser.
+
+        Args:
+            roots: Characters that may open the top-level value; text before
+                the first of them (prose, code fences) is skipped
+        """
+        self.roots = roots
+        self._out: List[str] = []
+        # One [bracket, state, key_start] entry per open container. Object
+        # states: key, colon, value, comma; array states: value, comma.
+        self._stack: List[list] = []
+        self._started = False
+        self._done = False
+        self._quote: Optional[str] = None
+        self._string_is_key = False
+        self._string_start = 0
+        self._escape = False
+        self._unicode_left = 0
+        self._word: List[str] = []
+        self._comment: Optional[str] = None
+        self._slash = False
+        self._star = False
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level value has been closed."""
+        return self._done
+
+    def feed(self, chunk: str) -> "IncrementalJSONParser":
+        """
+        Consume the next piece of output.
+
+        Args:
+            chunk: Text received from the model
+
+        Returns:
+            The parser itself, for chaining
+        """
+        for char in chunk:
+            if self._done:
+                break
+            self._consume(char)
+        return self
+
+    # --- character handling ---------------------------------------------------
+
+    def _consume(self, char: str):
+        if self._quote is not None:
+            self._consume_string(char)
+            return
+
+        if self._comment is not None:
+            if self._comment == "line" and char == "\n":
+                self._comment = None
+            elif self._comment == "block":
+                if self._star and char == "/":
+                    self._comment = None
+                self._star = char == "*"
+            return
+
+        if self._slash:
+            self._slash = False
+            if char in "/*":
+                self._end_word()
+                self._comment = "line" if char == "/" else "block"
+                self._star = False
+                return
+            self._word.append("/")
+
+        if char in _BAREWORD_CHARS and self._started:
+            self._word.append(char)
+            return
+        if char == "/" and self._started:
+            self._slash = True
+            return
+
+        self._end_word()
+
+        if not self._started:
+            if char in self.roots:
+                self._started = True
+                self._out.append(char)
+                self._stack.append([char, "key" if char == "{" else "value", None])
+            return
+
+        if char in "{[":
+            self._begin_value(is_string=False)
+            self._out.append(char)
+            self._stack.append([char, "key" if char == "{" else "value", None])
+        elif char in "}]":
+            self._close_container(char)
+        elif char == ":":
+            top = self._stack[-1]
+            if top[0] == "{" and top[1] == "colon":
+                self._out.append(":")
+                top[1] = "value"
+        elif char == ",":
+            top = self._stack[-1]
+            if top[1] == "comma":
+                self._out.append(",")
+                top[1] = "key" if top[0] == "{" else "value"
+        elif char in "\"'":
+            self._string_is_key = self._begin_value(is_string=True)
+            self._string_start = len(self._out)
+            self._quote = char
+            self._out.append('"')
+        # Anything else (whitespace, stray punctuation) is dropped
+
+    def _consume_string(self, char: str):
+        if self._unicode_left:
+            self._unicode_left -= 1
+            self._out.append(char)
+            return
+        if self._escape:
+            self._escape = False
+            if char in _VALID_ESCAPES:
+                self._out.append("\\" + char)
+                if char == "u":
+                    self._unicode_left = 4
+            elif char == "'":
+                self._out.append("'")
+            else:
+                self._out.append("\\\\" + char)
+            return
+        if char == "\\":
+            self._escape = True
+        elif char == self._quote:
+            self._quote = None
+            self._out.append('"')
+            top = self._stack[-1]
+            top[1] = "colon" if self._string_is_key else "comma"
+        elif char == '"':
+            self._out.append('\\"')
+        elif char in _CONTROL_ESCAPES:
+            self._out.append(_CONTROL_ESCAPES[char])
+        elif ord(char) < 0x20:
+            self._out.append(f"\\u{ord(char):04x}")
+        else:
+            self._out.append(char)
+
+    def _begin_value(self, is_string: bool) -> bool:
+        """Prepare the output for a new string/value; returns True if it is an object key."""
+        top = self._stack[-1]
+        if top[0] == "{":
+            if top[1] == "comma":
+                # Missing comma between members
+                self._out.append(",")
+                top[1] = "key"
+            if top[1] == "key":
+                if is_string:
+                    top[2] = len(self._out)
+                    return True
+                # A container where a key should be: give it a placeholder key
+                self._out.append('"":')
+                top[1] = "value"
+            elif top[1] == "colon":
+                self._out.append(":")
+                top[1] = "value"
+        elif top[1] == "comma":
+            self._out.append(",")
+        top[1] = "comma"
+        return False
+
+    def _end_word(self):
+        if not self._word:
+            return
+        word = "".join(self._word)
+        self._word = []
+        top = self._stack[-1]
+        if top[0] == "{" and top[1] in ("key", "comma"):
+            # Unquoted key
+            if top[1] == "comma":
+                self._out.append(",")
+            top[2] = len(self._out)
+            self._out.append(json.dumps(word))
+            top[1] = "colon"
+            return
+        self._begin_value(is_string=False)
+        self._out.append(self._resolve_word(word))
+
+    @staticmethod
+    def _resolve_word(word: str) -> str:
+        if word in _LITERALS:
+            return _LITERALS[word]
+        if _NUMBER.fullmatch(word):
+            return word
+        # Truncated or sloppy numbers ("85.", "+3", "1e")
+        match = _NUMBER.match(word.lstrip("+"))
+        if match and match.end() >= len(word.lstrip("+")) - 1 and any(c.isdigit() for c in word):
+            return match.group()
+        return json.dumps(word)
+
+    def _close_container(self, char: str):
+        opener = "{" if char == "}" else "["
+        if not any(entry[0] == opener for entry in self._stack):
+            return
+        # Close anything left open inside (e.g. "[1, {" followed by "]")
+        while self._stack[-1][0] != opener:
+            self._close_top(self._out, self._stack)
+        self._close_top(self._out, self._stack)
+        if not self._stack:
+            self._done = True
+
+    @staticmethod
+    def _close_top(out: List[str], stack: List[list]):
+        bracket, state, key_start = stack.pop()
+        if bracket == "{":
+            if state == "colon" and key_start is not None:
+                # Key without a value
+                del out[key_start:]
+            elif state == "value":
+                out.append("null")
+        if out and out[-1] == ",":
+            out.pop()
+        out.append("}" if bracket == "{" else "]")
+        if stack:
+            stack[-1][1] = "comma"
+
+    # --- results ----------------------------------------------------------------
+
+    def snapshot(self, complete_only: bool = False) -> Optional[str]:
+        """
+        Valid JSON text for everything received so far (open containers closed).
+
+        Args:
+            complete_only: Leave out the scalar still being received, so a
+                number like 82 is never reported as 8 while it streams in
+
+        Returns:
+            JSON text, or None if no object or array has started yet
+        """
+        if not self._started:
+            return None
+        if self._done:
+            return "".join(self._out)
+
+        out = list(self._out)
+        stack = [list(entry) for entry in self._stack]
+
+        if self._quote is not None:
+            top = stack[-1]
+            if self._string_is_key:
+                del out[top[2]:]
+            elif complete_only:
+                del out[self._string_start:]
+                if top[0] == "{":
+                    # Drop the member's key too
+                    top[1] = "colon"
+            else:
+                if self._unicode_left:
+                    # Drop the incomplete \\uXXXX escape
+                    cut = 4 - self._unicode_left + 1
+                    del out[-cut:]
+                out.append('"')
+                top[1] = "comma"
+        elif self._word:
+            word = "".join(self._word)
+            top = stack[-1]
+            if not complete_only and not (top[0] == "{" and top[1] in ("key", "comma")):
+                if top[1] == "comma":
+                    out.append(",")
+                elif top[0] == "{" and top[1] == "colon":
+                    out.append(":")
+                out.append(self._resolve_word(word))
+                top[1] = "comma"
+
+        if complete_only and stack[-1][0] == "{" and stack[-1][1] == "value":
+            # A key whose value has not arrived yet
+            stack[-1][1] = "colon"
+
+        while stack:
+            self._close_top(out, stack)
+        return "".join(out)
+
+    def partial(self, complete_only: bool = False) -> Any:
+        """
+        Best-effort value of the output received so far.
+
+        Args:
+            complete_only: Only include values that have been fully received
+
+        Returns:
+            Parsed value, or None if nothing usable has arrived
+        """
+        text = self.snapshot(complete_only)
+        if text is None:
+            return None
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
+
+    def result(self) -> Any:
+        """
+        Parsed value of the complete output.
+
+        Raises:
+            JSONRepairError: If the output contained no recoverable JSON
+        """
+        text = self.snapshot()
+        if text is None:
+            raise JSONRepairError("No JSON object found in response")
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise JSONRepairError(f"Could not repair JSON response: {e}") from e
+
+
+def strip_code_fence(text: str) -> str:
+    """Remove a surrounding ```json ... ``` fence, if any."""
+    match = _FENCE.match(text)
+    return match.group(1) if match else text
+
+
+def repair_json(text: str, roots: str = "{[") -> Any:
+    """
+    Parse JSON from LLM output, repairing it when needed.
+
+    Well-formed JSON takes the fast path through json.loads; anything else
+    goes through IncrementalJSONParser.
+
+    Args:
+        text: Raw model output
+        roots: Characters that may open the top-level value ("{" for objects only)
+
+    Returns:
+        Parsed value
+
+    Raises:
+        JSONRepairError: If no JSON can be recovered
+    """
+    try:
+        return json.loads(strip_code_fence(text))
+    except (json.JSONDecodeError, TypeError):
+        pass
+    return IncrementalJSONParser(roots).feed(text).result()
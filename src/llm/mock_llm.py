@@ -0,0 +1,191 @@
+"""Deterministic offline chat model for load testing without API keys."""
+from typing import Any, Dict, Iterator, List, Optional
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+
+# Characters per streamed chunk (roughly a few tokens)
+_STREAM_CHUNK_CHARS = 16
+
+
+class MockRateLimitError(Exception):
+    """Simulated HTTP 429 from the mock provider."""
+
+    status_code = 429
+
+
+class MockProviderError(Exception):
+    """Simulated transient provider failure."""
+
+    status_code = 500
+
+
+def _section(prompt: str, header: str) -> str:
+    """Text following `header:` up to the next blank line."""
+    match = re.search(rf"{re.escape(header)}:\s*\n(.*?)(?:\n\s*\n|\Z)", prompt, re.DOTALL)
+    return match.group(1).strip() if match else ""
+
+
+def build_mock_analysis(prompt: str) -> Dict:
+    """
+    Build a schema-valid scoring response derived only from the prompt.
+
+    Must-have requirements found in the resume text or skills drive the score,
+    and a hash of the prompt adds stable per-candidate variation.
+
+    Args:
+        prompt: Formatted scoring prompt
+
+    Returns:
+        Analysis dict with the fields expected by LLMAnalyzer
+    """
+    digest = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+    jitter = (digest % 1000) / 100.0  # 0-10
+
+    requirements = [line.strip("-• \t") for line in _section(prompt, "Must-Have Requirements").splitlines()]
+    requirements = [req for req in requirements if req]
+    resume_text = _section(prompt, "Candidate Resume").lower()
+    skills_match = re.search(r"Candidate Skills:\s*(.*)", prompt)
+    skills_text = skills_match.group(1).lower() if skills_match else ""
+
+    must_have_matches = []
+    matched_sections = {}
+    for requirement in requirements:
+        req_lower = requirement.lower()
+        if req_lower in skills_text:
+            must_have_matches.append(requirement)
+            matched_sections[requirement] = "skills"
+        elif req_lower in resume_text:
+            must_have_matches.append(requirement)
+            matched_sections[requirement] = "experience"
+
+    coverage = len(must_have_matches) / len(requirements) if requirements else 0.5
+    similarity_score = round(min(100.0, 40.0 + 50.0 * coverage + jitter), 2)
+    overall_score = round(min(100.0, similarity_score * 0.7 + coverage * 30.0), 2)
+
+    reason_codes = []
+    if must_have_matches:
+        reason_codes.append(f"SKILL_MATCH: {', '.join(must_have_matches[:5])}")
+    missing = [req for req in requirements if req not in must_have_matches]
+    if missing:
+        reason_codes.append(f"MISSING_REQUIREMENT: {', '.join(missing[:5])}")
+
+    return {
+        "overall_score": overall_score,
+        "similarity_score": similarity_score,
+        "must_have_matches": must_have_matches,
+        "reason_codes": reason_codes,
+        "matched_sections": matched_sections,
+    }
+
+
+class MockChatModel(BaseChatModel):
+    """Offline chat model with simulated latency, errors and rate limits.
+
+    Response content depends only on the prompt, so runs are reproducible.
+    Latency is log-normal around `latency_ms`; errors and 429s are drawn
+    from a seeded generator so a given call sequence always behaves the same.
+    """
+
+    latency_ms: float = 300.0
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    seed: int = 42
+
+    _rng: random.Random = PrivateAttr(default=None)
+    _rng_lock: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        """Create the seeded random generator."""
+        self._rng = random.Random(self.seed)
+        self._rng_lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock"
+
+    def _draw(self) -> tuple:
+        """Draw (latency_seconds, roll) from the shared generator."""
+        with self._rng_lock:
+            latency = self.latency_ms * math.exp(self._rng.gauss(0.0, self.latency_sigma)) / 1000.0
+            roll = self._rng.random()
+        return latency, roll
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        prompt = "\n\n".join(str(message.content) for message in messages)
+        latency, roll = self._draw()
+
+        if roll < self.rate_limit_rate:
+            time.sleep(latency * 0.1)
+            raise MockRateLimitError("Error code: 429 - Rate limit exceeded (mock provider)")
+        if roll < self.rate_limit_rate + self.error_rate:
+            time.sleep(latency * 0.5)
+            raise MockProviderError("Error code: 500 - Internal error (mock provider)")
+
+        time.sleep(latency)
+
+        content = self._respond(prompt)
+        message = AIMessage(content=content, usage_metadata=self._usage(prompt, content))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        prompt = "\n\n".join(str(message.content) for message in messages)
+        latency, roll = self._draw()
+
+        if roll < self.rate_limit_rate:
+            time.sleep(latency * 0.1)
+            raise MockRateLimitError("Error code: 429 - Rate limit exceeded (mock provider)")
+        if roll < self.rate_limit_rate + self.error_rate:
+            time.sleep(latency * 0.5)
+            raise MockProviderError("Error code: 500 - Internal error (mock provider)")
+
+        # First token after a fifth of the latency, the rest spread over the chunks
+        content = self._respond(prompt)
+        chunks = [content[i:i + _STREAM_CHUNK_CHARS] for i in range(0, len(content), _STREAM_CHUNK_CHARS)]
+        time.sleep(latency * 0.2)
+        for i, text in enumerate(chunks):
+            if i:
+                time.sleep(latency * 0.8 / max(1, len(chunks) - 1))
+            usage = self._usage(prompt, content) if i == len(chunks) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text, usage_metadata=usage))
+            if run_manager:
+                run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+
+    @staticmethod
+    def _respond(prompt: str) -> str:
+        if "json" in prompt.lower():
+            return json.dumps(build_mock_analysis(prompt), ensure_ascii=False)
+        return "OK (mock provider)"
+
+    @staticmethod
+    def _usage(prompt: str, content: str) -> Dict:
+        return {
+            "input_tokens": len(prompt) // 4,
+            "output_tokens": len(content) // 4,
+            "total_tokens": len(prompt) // 4 + len(content) // 4,
+        }
@@ -0,0 +1,339 @@
+"""Client-side rate limiting and adaptive concurrency for LLM providers."""
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+import threading
+import time
+import logging
+
+from src.config import Config
+from src.monitoring import metrics
+
+logger = logging.getLogger(__name__)
+
+# Markers used to recognise provider overload errors across SDKs
+_OVERLOAD_MARKERS = (
+    "429",
+    "rate limit",
+    "rate_limit",
+    "ratelimit",
+    "resource_exhausted",
+    "resource exhausted",
+    "overloaded",
+    "too many requests",
+    "timed out",
+    "timeout",
+)
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """
+    Check whether an exception signals provider overload (429 or timeout).
+
+    Args:
+        error: Exception raised by the provider call
+
+    Returns:
+        True if the caller should back off
+    """
+    if isinstance(error, TimeoutError):
+        return True
+
+    status_code = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if status_code in (429, 503, 529):
+        return True
+
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in _OVERLOAD_MARKERS)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate_per_minute: Tokens added per minute (0 disables the bucket)
+            capacity: Maximum burst size (defaults to one minute of tokens)
+        """
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self.enabled = rate_per_minute > 0
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        """Add tokens accumulated since the last update."""
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+            self._updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (not thread-safe)."""
+        if not self.enabled:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self.rate_per_second
+
+    def consume(self, amount: float):
+        """Remove tokens from the bucket (not thread-safe)."""
+        if self.enabled:
+            self._tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        """Return unused tokens, or charge extra when `amount` is negative."""
+        if self.enabled:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def drain(self):
+        """Empty the bucket so callers pause until it refills."""
+        if self.enabled:
+            self._tokens = min(self._tokens, 0.0)
+
+    @property
+    def available(self) -> Optional[float]:
+        """Tokens currently available (None when the bucket is disabled)."""
+        return round(self._tokens, 2) if self.enabled else None
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit: additive increase on success, multiplicative decrease on overload."""
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        backoff_ratio: float = 0.5,
+        cooldown_seconds: float = 1.0,
+    ):
+        """
+        Initialize concurrency limiter.
+
+        Args:
+            initial_limit: Starting number of concurrent calls
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            backoff_ratio: Multiplier applied to the limit on overload
+            cooldown_seconds: Minimum time between two decreases
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.backoff_ratio = backoff_ratio
+        self.cooldown_seconds = cooldown_seconds
+        self.in_flight = 0
+        self.waiting = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Block until a concurrency slot is free."""
+        with self._condition:
+            self.waiting += 1
+            try:
+                while self.in_flight >= int(self.limit):
+                    self._condition.wait()
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+
+    def release(self, outcome: str = "success"):
+        """
+        Release a slot and adapt the limit.
+
+        Args:
+            outcome: "success", "overload" or "error" (error leaves the limit unchanged)
+        """
+        with self._condition:
+            self.in_flight = max(0, self.in_flight - 1)
+
+            if outcome == "success":
+                # Roughly +1 per full window of successful calls
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            elif outcome == "overload":
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown_seconds:
+                    self.limit = max(float(self.min_limit), self.limit * self.backoff_ratio)
+                    self._last_decrease = now
+                    logger.warning(f"LLM overload detected, concurrency limit reduced to {int(self.limit)}")
+
+            self._condition.notify_all()
+
+
+class _Slot:
+    """Handle for one in-flight call, used to report actual token usage."""
+
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.actual_tokens: Optional[int] = None
+
+    def record_tokens(self, tokens: Optional[int]):
+        """Record the real token usage reported by the provider."""
+        if tokens:
+            self.actual_tokens = int(tokens)
+
+
+class ProviderRateLimiter:
+    """Per-provider limiter combining RPM/TPM token buckets with AIMD concurrency."""
+
+    def __init__(
+        self,
+        provider: str,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+    ):
+        """
+        Initialize provider rate limiter.
+
+        Args:
+            provider: Provider name (for logging and metrics)
+            requests_per_minute: Request budget per minute (0 = unlimited)
+            tokens_per_minute: Token budget per minute (0 = unlimited)
+            initial_concurrency: Starting concurrency limit
+            min_concurrency: Minimum concurrency limit
+            max_concurrency: Maximum concurrency limit
+        """
+        self.provider = provider
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            initial_limit=initial_concurrency,
+            min_limit=min_concurrency,
+            max_limit=max_concurrency,
+        )
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "successes": 0,
+            "overloads": 0,
+            "errors": 0,
+            "throttled_seconds": 0.0,
+            "tokens": 0,
+        }
+
+    @classmethod
+    def from_config(cls, provider: str, config: Config) -> "ProviderRateLimiter":
+        """Create a limiter using the rate limit settings from config."""
+        return cls(
+            provider=provider,
+            requests_per_minute=config.llm_requests_per_minute,
+            tokens_per_minute=config.llm_tokens_per_minute,
+            initial_concurrency=config.llm_initial_concurrency,
+            min_concurrency=config.llm_min_concurrency,
+            max_concurrency=config.llm_max_concurrency,
+        )
+
+    def _wait_for_budget(self, estimated_tokens: int):
+        """Block until both the request and token buckets allow the call."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = max(
+                    self.request_bucket.wait_time(1, now),
+                    self.token_bucket.wait_time(estimated_tokens, now),
+                )
+                if wait <= 0:
+                    self.request_bucket.consume(1)
+                    self.token_bucket.consume(estimated_tokens)
+                    return
+                self._stats["throttled_seconds"] += wait
+            time.sleep(wait)
+
+    @contextmanager
+    def slot(self, estimated_tokens: int) -> Iterator[_Slot]:
+        """
+        Reserve capacity for one LLM call.
+
+        Args:
+            estimated_tokens: Expected prompt + completion tokens
+
+        Yields:
+            Slot used to report the actual token usage
+        """
+        self.concurrency.acquire()
+        try:
+            self._wait_for_budget(estimated_tokens)
+        except BaseException:
+            self.concurrency.release("error")
+            raise
+
+        slot = _Slot(estimated_tokens)
+        try:
+            yield slot
+        except Exception as e:
+            overload = is_overload_error(e)
+            with self._lock:
+                self._stats["requests"] += 1
+                self._stats["overloads" if overload else "errors"] += 1
+                if overload:
+                    # Pause every caller sharing this provider until the buckets refill
+                    self.request_bucket.drain()
+            self.concurrency.release("overload" if overload else "error")
+            raise
+
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["successes"] += 1
+            if slot.actual_tokens is not None:
+                self.token_bucket.refund(estimated_tokens - slot.actual_tokens)
+                self._stats["tokens"] += slot.actual_tokens
+            else:
+                self._stats["tokens"] += estimated_tokens
+        self.concurrency.release("success")
+
+    def metrics(self) -> Dict:
+        """Current limiter state for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            "provider": self.provider,
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "queue_depth": self.concurrency.waiting,
+            "requests_available": self.request_bucket.available,
+            "tokens_available": self.token_bucket.available,
+            **stats,
+        }
+
+
+# Limiters are shared by every client talking to the same provider
+_limiters: Dict[str, ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, config: Config) -> ProviderRateLimiter:
+    """Get (or create) the shared rate limiter for a provider."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = ProviderRateLimiter.from_config(provider, config)
+        return _limiters[provider]
+
+
+def get_all_rate_limiter_metrics() -> Dict[str, Dict]:
+    """Metrics for every provider limiter created so far."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.provider: limiter.metrics() for limiter in limiters}
+
+
+def _collect_limiter_gauges():
+    """Expose limiter state as gauges on the metrics endpoint."""
+    gauges = []
+    for limiter_metrics in get_all_rate_limiter_metrics().values():
+        labels = {"provider": limiter_metrics["provider"]}
+        gauges.append(("talent_llm_concurrency_limit", labels, limiter_metrics["concurrency_limit"]))
+        gauges.append(("talent_llm_in_flight", labels, limiter_metrics["in_flight"]))
+        gauges.append(("talent_llm_queue_depth", labels, limiter_metrics["queue_depth"]))
+    return gauges
+
+
+metrics.register_collector(_collect_limiter_gauges)
@@ -1,10 +1,38 @@
 """Parse LLM structured responses."""
 from typing import Dict, List
-import json
 import logging
 
+from .json_repair import repair_json
+
 logger = logging.getLogger(__name__)
 
+# JSON schema of a scoring response, for providers with native structured output
+ANALYSIS_SCHEMA = {
+    "title": "candidate_analysis",
+    "description": "Match analysis of a candidate resume against a job description.",
+    "type": "object",
+    "properties": {
+        "overall_score": {"type": "number", "description": "Overall match score (0-100)"},
+        "similarity_score": {"type": "number", "description": "Similarity score (0-100)"},
+        "must_have_matches": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Must-have requirements the candidate meets",
+        },
+        "reason_codes": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Reason codes explaining the match",
+        },
+        "matched_sections": {
+            "type": "object",
+            "additionalProperties": {"type": "string"},
+            "description": "Requirement -> resume section reference",
+        },
+    },
+    "required": ["overall_score", "similarity_score", "must_have_matches", "reason_codes", "matched_sections"],
+}
+
 
 class ResponseParser:
     """Parse and validate LLM responses."""
@@ -14,53 +42,69 @@ class ResponseParser:
         """
         Parse LLM analysis response.
         
+        Malformed JSON (prose around it, trailing commas, truncation, ...) is
+        repaired; see IncrementalJSONParser.
+        
         Args:
             response: Raw response string or dict
-            
+        
         Returns:
             Parsed analysis dictionary
+        
+        Raises:
+            JSONRepairError: If no JSON object can be recovered
         """
         if isinstance(response, dict):
             return response
         
-        try:
-            # Try to parse as JSON
-            parsed = json.loads(response)
-            return parsed
-        except json.JSONDecodeError:
-            logger.warning("Failed to parse JSON response, attempting extraction")
-            # Try to extract JSON from text
-            return ResponseParser._extract_json_from_text(response)
+        return repair_json(response, roots="{")
     
     @staticmethod
-    def _extract_json_from_text(text: str) -> Dict:
+    def normalize_analysis(response: Dict) -> Dict:
         """
-        Extract JSON from text response.
+        Coerce a parsed analysis to the expected types and check it.
         
         Args:
-            text: Text that may contain JSON
-            
+            response: Parsed analysis dictionary
+        
         Returns:
-            Extracted dictionary
+            Analysis with float scores, list/dict fields and only known keys
+        
+        Raises:
+            ValueError: If the scores are missing, not numeric or out of range
         """
-        import re
+        if not isinstance(response, dict):
+            raise ValueError("response is not a JSON object")
         
-        # Try to find JSON object in text
-        json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', text, re.DOTALL)
-        if json_match:
+        problems: List[str] = []
+        scores = {}
+        for field in ("overall_score", "similarity_score"):
+            value = response.get(field)
+            if isinstance(value, str):
+                value = value.strip().rstrip("%")
             try:
-                return json.loads(json_match.group())
-            except json.JSONDecodeError:
-                pass
+                scores[field] = float(value)
+            except (TypeError, ValueError):
+                problems.append(f"{field} must be a number (got {response.get(field)!r})")
+                continue
+            if not 0.0 <= scores[field] <= 100.0:
+                problems.append(f"{field} must be between 0 and 100 (got {scores[field]})")
+        if problems:
+            raise ValueError("; ".join(problems))
+        
+        def as_list(value) -> List[str]:
+            if value is None:
+                return []
+            if isinstance(value, list):
+                return [str(item) for item in value if item is not None]
+            return [str(value)]
         
-        # Return default structure if extraction fails
-        logger.warning("Could not extract JSON from response")
+        matched_sections = response.get("matched_sections")
         return {
-            "overall_score": 0.0,
-            "similarity_score": 0.0,
-            "must_have_matches": [],
-            "reason_codes": [],
-            "matched_sections": {},
+            **scores,
+            "must_have_matches": as_list(response.get("must_have_matches")),
+            "reason_codes": as_list(response.get("reason_codes")),
+            "matched_sections": matched_sections if isinstance(matched_sections, dict) else {},
         }
     
     @staticmethod
@@ -70,21 +114,12 @@ class ResponseParser:
         
         Args:
             response: Analysis response dictionary
-            
+        
         Returns:
             True if valid, False otherwise
         """
-        required_fields = ["overall_score", "similarity_score"]
-        
-        if not all(field in response for field in required_fields):
-            return False
-        
-        # Validate score ranges
-        if not (0.0 <= response.get("overall_score", -1) <= 100.0):
-            return False
-        
-        if not (0.0 <= response.get("similarity_score", -1) <= 100.0):
+        try:
+            ResponseParser.normalize_analysis(response)
+        except ValueError:
             return False
-        
         return True
-
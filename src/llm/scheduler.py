@@ -0,0 +1,272 @@
+"""Priority scheduling of LLM calls across jobs."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+import itertools
+import logging
+import math
+import threading
+import time
+
+from src.config import Config
+from src.monitoring import metrics
+from .rate_limiter import ProviderRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, most urgent first
+PRIORITIES = ("interactive", "standard", "bulk")
+
+
+@dataclass
+class WorkTicket:
+    """Identifies the job an LLM call belongs to, for scheduling."""
+
+    job_id: str
+    priority: str = "standard"
+    # Share of capacity relative to other jobs of the same priority
+    weight: float = 1.0
+
+    def __post_init__(self):
+        if self.priority not in PRIORITIES:
+            raise ValueError(f"Invalid priority: {self.priority} (use {', '.join(PRIORITIES)})")
+        if self.weight <= 0:
+            raise ValueError("weight must be positive")
+
+
+# Job the current code runs for (set by the pipeline workers); calls without one are "standard"
+current_work: ContextVar[Optional[WorkTicket]] = ContextVar("current_work", default=None)
+
+
+class WorkCancelled(RuntimeError):
+    """Raised to a queued call whose job was cancelled before it was dispatched."""
+
+
+class _Waiter:
+    __slots__ = ("ticket", "enqueued_at", "granted", "cancelled")
+
+    def __init__(self, ticket: WorkTicket):
+        self.ticket = ticket
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self.cancelled = False
+
+
+class _JobQueue:
+    """Queued calls of one job, with its weighted-fair-queuing virtual time."""
+
+    __slots__ = ("waiters", "virtual_time", "weight")
+
+    def __init__(self, weight: float):
+        self.waiters: List[_Waiter] = []
+        self.virtual_time = 0.0
+        self.weight = weight
+
+
+class LLMScheduler:
+    """
+    Admission control in front of the LLM client.
+
+    At most `capacity()` calls run at once (the primary provider's current
+    concurrency limit). Queued calls are dispatched by strict priority
+    (interactive, then standard, then bulk), and by weighted fair queuing
+    between the jobs of one priority, so one large job cannot starve the
+    others. Bulk work never takes more than `bulk_max_share` of capacity,
+    which keeps slots free for interactive calls; queued bulk calls are
+    overtaken by anything more urgent and can be cancelled per job.
+    """
+
+    def __init__(self, capacity: Callable[[], int], bulk_max_share: float = 0.75):
+        """
+        Initialize scheduler.
+
+        Args:
+            capacity: Returns how many calls may currently run at once
+            bulk_max_share: Fraction of capacity bulk calls may occupy
+        """
+        self.capacity = capacity
+        self.bulk_max_share = bulk_max_share
+        self._queues: Dict[str, Dict[str, _JobQueue]] = {priority: {} for priority in PRIORITIES}
+        # Virtual clock per priority: virtual time of the last dispatched call
+        self._clock = {priority: 0.0 for priority in PRIORITIES}
+        self._running = {priority: 0 for priority in PRIORITIES}
+        self._cancelled: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        self._dispatched = {priority: 0 for priority in PRIORITIES}
+
+    def _bulk_limit(self, capacity: int) -> int:
+        return max(1, math.floor(capacity * self.bulk_max_share))
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """Pick the next call to dispatch, or None if nothing may start now."""
+        capacity = max(1, self.capacity())
+        if sum(self._running.values()) >= capacity:
+            return None
+        for priority in PRIORITIES:
+            queues = self._queues[priority]
+            if not queues:
+                continue
+            if priority == "bulk" and self._running["bulk"] >= self._bulk_limit(capacity):
+                return None
+            job_id, queue = min(queues.items(), key=lambda item: item[1].virtual_time)
+            waiter = queue.waiters.pop(0)
+            self._clock[priority] = queue.virtual_time
+            queue.virtual_time += 1.0 / queue.weight
+            if not queue.waiters:
+                del queues[job_id]
+            return waiter
+        return None
+
+    def _dispatch(self):
+        """Grant permits while capacity allows (caller holds the condition)."""
+        granted = False
+        while True:
+            waiter = self._next_waiter()
+            if waiter is None:
+                break
+            waiter.granted = True
+            self._running[waiter.ticket.priority] += 1
+            self._dispatched[waiter.ticket.priority] += 1
+            granted = True
+        if granted:
+            self._condition.notify_all()
+
+    def _enqueue(self, waiter: _Waiter):
+        ticket = waiter.ticket
+        queues = self._queues[ticket.priority]
+        queue = queues.get(ticket.job_id)
+        if queue is None:
+            queue = queues[ticket.job_id] = _JobQueue(ticket.weight)
+            # A job (re)joining starts at the current virtual clock, not behind it
+            queue.virtual_time = self._clock[ticket.priority]
+        queue.waiters.append(waiter)
+
+    @contextmanager
+    def permit(self, ticket: Optional[WorkTicket] = None) -> Iterator[None]:
+        """
+        Hold one LLM call slot.
+
+        Args:
+            ticket: Job of the call (defaults to current_work, else an anonymous standard job)
+
+        Raises:
+            WorkCancelled: If the job is cancelled while the call is queued
+        """
+        ticket = ticket or current_work.get() or WorkTicket(f"anonymous-{threading.get_ident()}")
+        waiter = _Waiter(ticket)
+        with self._condition:
+            if ticket.job_id in self._cancelled:
+                raise WorkCancelled(f"Job {ticket.job_id} was cancelled")
+            self._enqueue(waiter)
+            self._dispatch()
+            while not waiter.granted and not waiter.cancelled:
+                self._condition.wait()
+        if waiter.cancelled:
+            raise WorkCancelled(f"Job {ticket.job_id} was cancelled")
+
+        metrics.observe(
+            "talent_llm_scheduler_wait_seconds", time.monotonic() - waiter.enqueued_at, {"priority": ticket.priority}
+        )
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._running[ticket.priority] -= 1
+                self._dispatch()
+
+    def cancel(self, job_id: str) -> int:
+        """
+        Drop a job's queued calls (they raise WorkCancelled); running calls finish.
+
+        Args:
+            job_id: Job to cancel
+
+        Returns:
+            Number of queued calls removed
+        """
+        removed = 0
+        with self._condition:
+            self._cancelled[job_id] = time.monotonic()
+            for queues in self._queues.values():
+                queue = queues.pop(job_id, None)
+                if queue is None:
+                    continue
+                for waiter in queue.waiters:
+                    waiter.cancelled = True
+                removed += len(queue.waiters)
+            # Forget cancellations after an hour
+            cutoff = time.monotonic() - 3600
+            self._cancelled = {key: at for key, at in self._cancelled.items() if at >= cutoff}
+            self._dispatch()
+            self._condition.notify_all()
+        if removed:
+            logger.info(f"Cancelled {removed} queued LLM calls of job {job_id}")
+        return removed
+
+    def is_cancelled(self, job_id: str) -> bool:
+        """Whether a job was cancelled (cancellations are forgotten after an hour)."""
+        with self._condition:
+            return job_id in self._cancelled
+
+    def uncancel(self, job_id: str):
+        """Admit a cancelled job's calls again (e.g. when the job is resumed)."""
+        with self._condition:
+            self._cancelled.pop(job_id, None)
+
+    def metrics(self) -> Dict:
+        """Queue state for monitoring."""
+        with self._condition:
+            return {
+                "capacity": max(1, self.capacity()),
+                "bulk_max_share": self.bulk_max_share,
+                "running": dict(self._running),
+                "dispatched": dict(self._dispatched),
+                "queued": {
+                    priority: sum(len(queue.waiters) for queue in queues.values())
+                    for priority, queues in self._queues.items()
+                },
+                "queued_jobs": {
+                    priority: {job_id: len(queue.waiters) for job_id, queue in queues.items()}
+                    for priority, queues in self._queues.items()
+                },
+            }
+
+
+# One scheduler per provider limiter, shared by every client using it
+_schedulers: Dict[str, LLMScheduler] = {}
+_schedulers_lock = threading.Lock()
+_job_ids = itertools.count(1)
+
+
+def get_scheduler(limiter: ProviderRateLimiter, config: Config) -> LLMScheduler:
+    """Get (or create) the scheduler admitting calls to a provider."""
+    with _schedulers_lock:
+        if limiter.provider not in _schedulers:
+            _schedulers[limiter.provider] = LLMScheduler(
+                lambda: int(limiter.concurrency.limit),
+                bulk_max_share=config.llm_bulk_max_share,
+            )
+        return _schedulers[limiter.provider]
+
+
+def new_job_id(prefix: str) -> str:
+    """Process-unique job id for work without an id of its own."""
+    return f"{prefix}-{next(_job_ids)}"
+
+
+def _collect_scheduler_gauges():
+    """Expose queue depths as gauges on the metrics endpoint."""
+    with _schedulers_lock:
+        schedulers = dict(_schedulers)
+    gauges = []
+    for provider, scheduler in schedulers.items():
+        state = scheduler.metrics()
+        for priority in PRIORITIES:
+            labels = {"provider": provider, "priority": priority}
+            gauges.append(("talent_llm_scheduler_queued", labels, state["queued"][priority]))
+            gauges.append(("talent_llm_scheduler_running", labels, state["running"][priority]))
+    return gauges
+
+
+metrics.register_collector(_collect_scheduler_gauges)
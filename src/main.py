@@ -1,32 +1,72 @@
 """FastAPI REST API for AI Talent Matcher."""
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, PlainTextResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict
-import json
+from typing import Callable, List, Optional, Dict
+import itertools
 import logging
+import threading
+import uuid
 from pathlib import Path
-import tempfile
-import shutil
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
 
+import numpy as np
+
 from src.config import config
+from src.serialization import read_json, write_json
+from src.api import CompressionMiddleware, FastJSONResponse, conditional_get, json_response
 from src.pdf_processing import PDFExtractor, PDFValidator
 from src.preprocessing import ResumeParser, JDParser
-from src.llm import LLMClient, LLMAnalyzer
+from src.llm import (
+    Budget,
+    BudgetExceeded,
+    LLMClient,
+    LLMAnalyzer,
+    WorkTicket,
+    current_budget,
+    current_work,
+    get_all_rate_limiter_metrics,
+    new_job_id,
+)
 from src.prompts import PromptLoader
-from src.scoring import HybridScorer
-from src.storage import LocalStorage
+from src.scoring import HybridScorer, ScoreCache, jd_content_hash
+from src.embeddings import CandidateRetriever, JobMatcher, SemanticScorer, document_text, tokenize
+from src.storage import (
+    JD_SUMMARY_FIELDS,
+    RESUME_SUMMARY_FIELDS,
+    JobCheckpoint,
+    LocalStorage,
+    ResultLogWriter,
+    ResultStore,
+    resume_content_hash,
+)
 from src.export import CSVExporter
 from src.explainability import ReasonCodes, HitMapper
 from src.startup import AutoProcessor
+from src.monitoring import metrics, RunStageTimings, current_run_timings
+from src.ingestion import ArchiveError, ArchiveIngestor, UploadProcessor, UploadRejected, read_upload
 
 # Pydantic models for request bodies
 class ProcessRequest(BaseModel):
     """Request model for processing endpoint."""
     resume_files: List[str]
     jd_file: str
+    scoring_mode: Optional[str] = None
+    priority: Optional[str] = None
+    weight: float = 1.0
+
+class MatrixRequest(BaseModel):
+    """Request model for the many-JD x many-resume matrix endpoint."""
+    jd_ids: List[str]
+    resume_files: Optional[List[str]] = None
+    scoring_mode: Optional[str] = None
+    shortlist: Optional[int] = None
+    latest_per_cluster: bool = False
+    priority: Optional[str] = None
+    weight: float = 1.0
 
 # Configure logging
 logging.basicConfig(
@@ -36,7 +76,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
-app = FastAPI(title="AI Talent Matcher API", version="1.0.0")
+app = FastAPI(title="AI Talent Matcher API", version="1.0.0", default_response_class=FastJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -45,7 +85,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "ETag"],
 )
+if config.response_compression_min_bytes > 0:
+    app.add_middleware(CompressionMiddleware, minimum_size=config.response_compression_min_bytes)
 
 # Initialize components
 # Validate configuration (warning only, will fail when LLM is actually used)
@@ -65,36 +108,71 @@ except Exception as e:
 prompt_loader = PromptLoader()
 llm_analyzer = LLMAnalyzer(llm_client, prompt_loader) if llm_client else None
 hybrid_scorer = HybridScorer()
+score_cache = ScoreCache()
+# Checkpoints of processing runs (see JobCheckpoint)
+jobs_dir = config.output_path / "jobs"
+# Ranked results of finished runs (NDJSON log + index per run)
+result_store = ResultStore(config.output_path / "results")
+semantic_scorer = SemanticScorer()
 storage = LocalStorage()
 csv_exporter = CSVExporter()
 pdf_extractor = PDFExtractor(require_pdfplumber=False)  # Allow TXT extraction without pdfplumber
 pdf_validator = PDFValidator()
 resume_parser = ResumeParser()
 jd_parser = JDParser()
+candidate_retriever = CandidateRetriever(storage, semantic_scorer)
+job_matcher = JobMatcher(storage, semantic_scorer)
+upload_processor = UploadProcessor(storage)
+archive_ingestor = ArchiveIngestor(upload_processor)
 
 # Processing state
 processing_state = {
     "status": "idle",
     "progress": 0,
     "total": 0,
-    "results": [],
     "errors": [],
 }
 
+# Matrix scoring jobs by job id
+matrix_jobs: Dict[str, Dict] = {}
+
 
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup."""
     logger.info("Starting AI Talent Matcher API...")
     
+    # Fail fast on a broken prompt instead of sending it to the LLM for every candidate
+    for name, template in prompt_loader.validate().items():
+        logger.info(f"Prompt {name}: {template['source']} ({template['content_hash']})")
+    
     # Auto-process raw files
     try:
-        auto_processor = AutoProcessor()
+        auto_processor = AutoProcessor(storage)
         auto_processor.process_all()
     except Exception as e:
         logger.error(f"Error during auto-processing: {e}")
         # Don't fail startup if auto-processing fails
         logger.warning("Continuing startup despite auto-processing error...")
+    
+    # Pick up a processing run the last shutdown or crash interrupted
+    if config.resume_interrupted_jobs:
+        interrupted = [job for job in JobCheckpoint.list_jobs(jobs_dir) if job["status"] == "running"]
+        if interrupted:
+            checkpoint = JobCheckpoint.load(jobs_dir, interrupted[0]["job_id"])
+            logger.info(f"Resuming interrupted job {checkpoint.job_id} ({len(checkpoint.pending())} resumes left)")
+            begin_processing(checkpoint)
+            threading.Thread(target=run_checkpointed_pipeline, args=(checkpoint,), name="job-resume", daemon=True).start()
+    
+    # Index resumes stored before the candidate index existed (can take a while for large pools)
+    threading.Thread(target=candidate_retriever.sync, name="candidate-index-sync", daemon=True).start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Run on application shutdown."""
+    # Write candidate index updates made since its last flush to disk
+    candidate_retriever.index.close()
 
 
 @app.get("/")
@@ -105,45 +183,28 @@ async def root():
 
 @app.post("/api/upload/resumes")
 async def upload_resumes(files: List[UploadFile] = File(...)):
-    """Upload resume files (PDF, JSON, or TXT)."""
+    """Upload resume files (PDF, JSON, or TXT).
+    
+    Each upload is read once: its type is sniffed from the first bytes, size
+    limits are enforced and a content hash is computed while receiving, and
+    the bytes are parsed straight into storage. Byte-identical re-uploads are
+    detected by hash and reuse the stored resume.
+    """
     uploaded_files = []
     errors = []
     
     for file in files:
         try:
-            # Save uploaded file temporarily
-            suffix = Path(file.filename).suffix
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-                shutil.copyfileobj(file.file, tmp_file)
-                tmp_path = tmp_file.name
-            
-            # Validate file
-            if pdf_validator.is_pdf(tmp_path):
-                is_valid, error = pdf_validator.validate_pdf(tmp_path)
-                if not is_valid:
-                    errors.append(f"{file.filename}: {error}")
-                    continue
-                file_type = "pdf"
-            elif pdf_validator.is_json(tmp_path):
-                is_valid, error = pdf_validator.validate_json(tmp_path)
-                if not is_valid:
-                    errors.append(f"{file.filename}: {error}")
-                    continue
-                file_type = "json"
-            elif pdf_validator.is_txt(tmp_path):
-                is_valid, error = pdf_validator.validate_txt(tmp_path)
-                if not is_valid:
-                    errors.append(f"{file.filename}: {error}")
-                    continue
-                file_type = "txt"
-            else:
-                errors.append(f"{file.filename}: Unsupported file type")
-                continue
+            upload = await read_upload(file)
+            record = await run_in_threadpool(upload_processor.ingest_resume, upload)
             
             uploaded_files.append({
                 "filename": file.filename,
-                "path": tmp_path,
-                "type": file_type,
+                "path": record["path"],
+                "type": upload.file_type,
+                "candidate_id": record["id"],
+                "content_hash": upload.sha256,
+                "duplicate": record["duplicate"],
             })
             
         except Exception as e:
@@ -160,40 +221,54 @@ async def upload_resumes(files: List[UploadFile] = File(...)):
 async def upload_job_description(file: UploadFile = File(...)):
     """Upload job description file (PDF, JSON, or TXT)."""
     try:
-        # Save uploaded file temporarily
-        suffix = Path(file.filename).suffix
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-            shutil.copyfileobj(file.file, tmp_file)
-            tmp_path = tmp_file.name
-        
-        # Validate file
-        file_type = None
-        if pdf_validator.is_pdf(tmp_path):
-            is_valid, error = pdf_validator.validate_pdf(tmp_path)
-            if not is_valid:
-                raise HTTPException(status_code=400, detail=error)
-            file_type = "pdf"
-        elif pdf_validator.is_json(tmp_path):
-            is_valid, error = pdf_validator.validate_json(tmp_path)
-            if not is_valid:
-                raise HTTPException(status_code=400, detail=error)
-            file_type = "json"
-        elif pdf_validator.is_txt(tmp_path):
-            is_valid, error = pdf_validator.validate_txt(tmp_path)
-            if not is_valid:
-                raise HTTPException(status_code=400, detail=error)
-            file_type = "txt"
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file type")
-        
-        return {
-            "filename": file.filename,
-            "path": tmp_path,
-            "type": file_type,
-        }
-        
+        upload = await read_upload(file)
+        record = await run_in_threadpool(upload_processor.ingest_jd, upload)
+    except UploadRejected as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "filename": file.filename,
+        "path": record["path"],
+        "type": upload.file_type,
+        "jd_id": record["id"],
+        "content_hash": upload.sha256,
+        "duplicate": record["duplicate"],
+    }
+
+
+@app.post("/api/upload/resumes/archive")
+async def upload_resume_archive(request: Request, filename: str = "archive.zip"):
+    """Upload a ZIP or tar(.gz/.bz2/.xz) archive of resumes as the raw request body.
+    
+    The archive is extracted while it streams in (it is never written to disk
+    as a whole) and members are parsed by parallel workers. Returns a job id;
+    poll /api/upload/jobs/{job_id} for per-member status.
+    """
+    job = archive_ingestor.start(filename)
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                await run_in_threadpool(job.stream.put, chunk)
+    except ArchiveError as e:
+        job.stream.abort()
+        raise HTTPException(status_code=413, detail=str(e))
+    finally:
+        job.stream.close()
+    
+    return job.to_dict()
+
+
+@app.get("/api/upload/jobs/{job_id}")
+async def get_upload_job(job_id: str):
+    """Get the status of an archive ingestion job."""
+    job = archive_ingestor.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+    return job.to_dict()
 
 
 @app.post("/api/process")
@@ -202,36 +277,55 @@ async def start_processing(
     background_tasks: BackgroundTasks,
 ):
     """Start processing pipeline."""
-    global processing_state
-    
     if processing_state["status"] == "processing":
         raise HTTPException(status_code=400, detail="Processing already in progress")
     
-    processing_state = {
-        "status": "processing",
-        "progress": 0,
-        "total": len(request.resume_files),
-        "results": [],
-        "errors": [],
-    }
+    scoring_mode = resolve_scoring_mode(request.scoring_mode)
+    ticket = make_work_ticket(str(uuid.uuid4()), request.priority, request.weight)
+    checkpoint = JobCheckpoint.create(jobs_dir, ticket.job_id, {
+        "resume_files": request.resume_files,
+        "jd_file": request.jd_file,
+        "jd_id": None,
+        "skip_processing": False,
+        "scoring_mode": scoring_mode,
+        "priority": ticket.priority,
+        "weight": ticket.weight,
+    })
     
     # Start background processing
-    background_tasks.add_task(process_pipeline, request.resume_files, request.jd_file)
+    begin_processing(checkpoint)
+    background_tasks.add_task(run_checkpointed_pipeline, checkpoint)
     
-    return {"status": "started", "message": "Processing started"}
+    return {
+        "status": "started",
+        "message": "Processing started",
+        "job_id": ticket.job_id,
+        "scoring_mode": scoring_mode,
+    }
 
 
 @app.post("/api/process/stored")
 async def start_processing_stored(
     jd_id: str,
     background_tasks: BackgroundTasks,
+    latest_per_cluster: bool = False,
+    scoring_mode: Optional[str] = None,
+    priority: Optional[str] = None,
+    weight: float = 1.0,
 ):
-    """Start processing pipeline using stored files."""
-    global processing_state
+    """Start processing pipeline using stored files.
     
+    With `latest_per_cluster`, only the most recent version of each group of
+    near-duplicate resumes is scored. `scoring_mode` overrides SCORING_MODE;
+    `priority` (interactive, standard or bulk) and `weight` set how the
+    run's LLM calls are scheduled against other jobs.
+    """
     if processing_state["status"] == "processing":
         raise HTTPException(status_code=400, detail="Processing already in progress")
     
+    scoring_mode = resolve_scoring_mode(scoring_mode)
+    ticket = make_work_ticket(str(uuid.uuid4()), priority, weight)
+    
     # Load JD file
     jd_file_path = config.storage_jd_path / f"jd_{jd_id}.json"
     if not jd_file_path.exists():
@@ -245,26 +339,231 @@ async def start_processing_stored(
     if not resume_files:
         raise HTTPException(status_code=400, detail="No resumes found in storage")
     
-    processing_state = {
-        "status": "processing",
-        "progress": 0,
-        "total": len(resume_files),
-        "results": [],
-        "errors": [],
-    }
+    skipped_versions = 0
+    if latest_per_cluster:
+        latest_files = storage.latest_resume_files(resume_files)
+        skipped_versions = len(resume_files) - len(latest_files)
+        resume_files = latest_files
+        logger.info(f"Scoring latest CV versions only: skipped {skipped_versions} older versions")
+    
+    checkpoint = JobCheckpoint.create(jobs_dir, ticket.job_id, {
+        "resume_files": resume_files,
+        "jd_file": str(jd_file_path),
+        "jd_id": jd_id,
+        "skip_processing": True,
+        "scoring_mode": scoring_mode,
+        "priority": ticket.priority,
+        "weight": ticket.weight,
+    })
     
     # Start background processing
-    background_tasks.add_task(process_pipeline, resume_files, str(jd_file_path), jd_id, True)
+    begin_processing(checkpoint)
+    background_tasks.add_task(run_checkpointed_pipeline, checkpoint)
     
     return {
         "status": "started",
         "message": "Processing started",
+        "job_id": ticket.job_id,
         "jd_id": jd_id,
-        "total_resumes": len(resume_files)
+        "scoring_mode": scoring_mode,
+        "total_resumes": len(resume_files),
+        "skipped_versions": skipped_versions,
+    }
+
+
+@app.get("/api/process/jobs")
+async def list_processing_jobs():
+    """List checkpointed processing runs (newest first) with their progress."""
+    return {"jobs": JobCheckpoint.list_jobs(jobs_dir)}
+
+
+@app.post("/api/process/jobs/{job_id}/resume")
+async def resume_processing_job(job_id: str, background_tasks: BackgroundTasks):
+    """Resume an interrupted processing run.
+    
+    Candidates whose results were checkpointed are not scored again; only
+    the ones that were still pending (or in flight) when the run stopped
+    are.
+    """
+    if processing_state["status"] == "processing":
+        raise HTTPException(status_code=400, detail="Processing already in progress")
+    
+    try:
+        checkpoint = JobCheckpoint.load(jobs_dir, job_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Processing job not found: {job_id}")
+    if checkpoint.status == "completed":
+        raise HTTPException(status_code=400, detail="Job already completed")
+    if llm_client is not None:
+        llm_client.scheduler.uncancel(job_id)
+    
+    begin_processing(checkpoint)
+    background_tasks.add_task(run_checkpointed_pipeline, checkpoint)
+    return {"status": "resumed", **checkpoint.summary(), "remaining": len(checkpoint.pending())}
+
+
+def begin_processing(checkpoint: JobCheckpoint):
+    """Make the run described by a checkpoint the current run (before it starts in the background)."""
+    global processing_state
+    
+    params = checkpoint.params
+    processing_state = {
+        "status": "processing",
+        "job_id": checkpoint.job_id,
+        "priority": params.get("priority", "standard"),
+        "progress": len(checkpoint.completed),
+        "total": len(params["resume_files"]),
+        "resumed": len(checkpoint.completed),
+        "scoring_mode": params["scoring_mode"],
+        "errors": [],
     }
 
 
-def process_pipeline(resume_files: List[str], jd_file: str, jd_id: str = None, skip_processing: bool = False):
+def run_checkpointed_pipeline(checkpoint: JobCheckpoint):
+    """Run (or resume) the processing run described by a checkpoint."""
+    params = checkpoint.params
+    process_pipeline(
+        params["resume_files"],
+        params["jd_file"],
+        params.get("jd_id"),
+        params.get("skip_processing", False),
+        scoring_mode=params["scoring_mode"],
+        ticket=WorkTicket(checkpoint.job_id, params.get("priority", "standard"), params.get("weight", 1.0)),
+        checkpoint=checkpoint,
+    )
+
+
+@app.post("/api/process/matrix")
+async def start_matrix_processing(request: MatrixRequest, background_tasks: BackgroundTasks):
+    """Rank one resume pool against several stored JDs in a single job.
+    
+    Each resume and each JD is loaded and embedded once; pre-scores are
+    computed as one JD x resume matrix and the LLM calls for all pairs share
+    one worker pool and rate limiter. With `shortlist`, only the best
+    pre-scored resumes of each JD are analyzed. Poll
+    /api/process/matrix/{job_id} for progress. Matrix jobs run at bulk
+    priority unless `priority` says otherwise.
+    """
+    scoring_mode = resolve_scoring_mode(request.scoring_mode)
+    job_id = str(uuid.uuid4())
+    ticket = make_work_ticket(job_id, request.priority or "bulk", request.weight)
+    if not request.jd_ids:
+        raise HTTPException(status_code=400, detail="jd_ids must not be empty")
+    
+    jd_files = []
+    for jd_id in dict.fromkeys(request.jd_ids):
+        jd_file_path = config.storage_jd_path / f"jd_{jd_id}.json"
+        if not jd_file_path.exists():
+            raise HTTPException(status_code=404, detail=f"Job description not found: {jd_id}")
+        jd_files.append((jd_id, str(jd_file_path)))
+    
+    resume_files = request.resume_files or [str(path) for path in config.storage_resume_path.glob("*.json")]
+    if not resume_files:
+        raise HTTPException(status_code=400, detail="No resumes found in storage")
+    if request.latest_per_cluster:
+        resume_files = storage.latest_resume_files(resume_files)
+    
+    matrix_jobs[job_id] = {
+        "job_id": job_id,
+        "status": "queued",
+        "priority": ticket.priority,
+        "scoring_mode": scoring_mode,
+        "total_jds": len(jd_files),
+        "total_resumes": len(resume_files),
+        "total_pairs": 0,
+        "completed_pairs": 0,
+        "rankings": {},
+        "errors": [],
+        "created_at": datetime.now().isoformat(),
+    }
+    
+    background_tasks.add_task(
+        process_matrix, job_id, resume_files, jd_files, scoring_mode, request.shortlist, ticket
+    )
+    
+    return matrix_jobs[job_id]
+
+
+@app.get("/api/process/matrix/{job_id}")
+async def get_matrix_job(job_id: str):
+    """Get the status of a matrix job and where each JD's ranking was written."""
+    job = matrix_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Matrix job not found")
+    return job
+
+
+@app.get("/api/process/matrix/{job_id}/rankings/{jd_id}")
+async def get_matrix_ranking(job_id: str, jd_id: str):
+    """Get the ranking a matrix job produced for one JD."""
+    ranking = matrix_jobs.get(job_id, {}).get("rankings", {}).get(jd_id)
+    if ranking is None:
+        raise HTTPException(status_code=404, detail=f"No ranking for JD {jd_id} in job {job_id}")
+    return read_json(ranking["results_file"])
+
+
+@app.post("/api/process/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancel the queued LLM calls of a processing or matrix job.
+    
+    Calls already sent to the provider finish; queued and future calls of
+    the job fail, so the job ends early with the candidates scored so far.
+    A cancelled processing run ends as "cancelled" and does not replace the
+    latest results; it can be resumed like an interrupted one.
+    """
+    if llm_client is None:
+        raise HTTPException(status_code=400, detail="LLM client is not configured")
+    return {"job_id": job_id, "cancelled_calls": llm_client.scheduler.cancel(job_id)}
+
+
+def job_cancelled(job_id: str) -> bool:
+    """Whether a job's LLM calls were cancelled (see cancel_job)."""
+    return llm_client is not None and llm_client.scheduler.is_cancelled(job_id)
+
+
+def resolve_scoring_mode(requested: Optional[str] = None) -> str:
+    """Resolve the scoring mode ("llm" or "embedding") for a run.
+    
+    Args:
+        requested: Mode requested for this run (defaults to SCORING_MODE)
+        
+    Returns:
+        "llm" or "embedding"
+    """
+    mode = (requested or config.scoring_mode).lower()
+    if mode not in ("llm", "embedding", "auto"):
+        raise HTTPException(status_code=400, detail=f"Invalid scoring_mode: {mode} (use llm, embedding or auto)")
+    if mode == "auto":
+        return "llm" if llm_analyzer is not None else "embedding"
+    return mode
+
+
+def make_work_ticket(job_id: str, priority: Optional[str] = None, weight: float = 1.0) -> WorkTicket:
+    """Scheduling ticket for a job's LLM calls.
+    
+    Args:
+        job_id: Job id
+        priority: "interactive", "standard" (default) or "bulk"
+        weight: Share of capacity relative to other jobs of the same priority
+        
+    Returns:
+        Work ticket
+    """
+    try:
+        return WorkTicket(job_id, (priority or "standard").lower(), weight)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def process_pipeline(
+    resume_files: List[str],
+    jd_file: str,
+    jd_id: str = None,
+    skip_processing: bool = False,
+    scoring_mode: str = "llm",
+    ticket: Optional[WorkTicket] = None,
+    checkpoint: Optional[JobCheckpoint] = None,
+):
     """Process resumes against job description.
     
     Args:
@@ -272,115 +571,577 @@ def process_pipeline(resume_files: List[str], jd_file: str, jd_id: str = None, s
         jd_file: Path to job description file
         jd_id: Optional JD ID to use
         skip_processing: If True, load files directly instead of processing them
+        scoring_mode: "llm" (LLM analysis per resume) or "embedding" (local similarity, no LLM calls)
+        ticket: Scheduling ticket of the run's LLM calls
+        checkpoint: Checkpoint of the run; LLM results are appended to it as
+            they finish, and resumes it already holds results for are skipped
     """
     global processing_state
     
+    run_timings = RunStageTimings()
+    processing_state["stage_timings"] = {}
+    budget = Budget.for_job(config)
+    ticket = ticket or WorkTicket(new_job_id("pipeline"))
+    result_log = None
+    
     try:
         # Process or load job description
         logger.info("Processing job description...")
-        if skip_processing:
-            # Load JD directly from storage (already processed)
-            with open(jd_file, 'r', encoding='utf-8') as f:
-                jd_data = json.load(f)
-        else:
-            jd_data = process_jd_file(jd_file)
+        with metrics.time_stage("load", run_timings):
+            if skip_processing:
+                # Load JD directly from storage (already processed)
+                jd_data = read_json(jd_file)
+            else:
+                jd_data = process_jd_file(jd_file)
         
         # Use provided jd_id if given, otherwise use from jd_data
         if jd_id:
             jd_data["jd_id"] = jd_id
+        jd_hash = jd_content_hash(jd_data)
         
-        # Process resumes
-        results = []
-        for i, resume_file in enumerate(resume_files):
-            try:
-                logger.info(f"Processing resume {i+1}/{len(resume_files)}: {resume_file}")
-                
-                # Process or load resume
-                if skip_processing:
-                    # Load resume directly from storage (already processed)
-                    with open(resume_file, 'r', encoding='utf-8') as f:
-                        resume_data = json.load(f)
-                else:
-                    resume_data = process_resume_file(resume_file)
-                
-                # Analyze with LLM
-                if llm_analyzer is None:
-                    raise ValueError("LLM analyzer is not available. Please configure API keys in .env file.")
-                llm_analysis = llm_analyzer.analyze_candidate(resume_data, jd_data)
-                
-                # Calculate hybrid score
-                score_result = hybrid_scorer.calculate_final_score(
-                    llm_analysis.get("similarity_score", 0.0),
-                    resume_data,
-                    jd_data,
-                    llm_analysis,
-                )
-                
-                # Generate reason codes
-                reason_codes = ReasonCodes.generate_reason_codes_from_analysis(
-                    llm_analysis, resume_data, jd_data
-                )
-                
-                # Map hits to sections
-                hit_mappings = HitMapper.map_hits_to_sections(
-                    llm_analysis, resume_data, jd_data
-                )
-                
-                # Combine results
-                result = {
-                    "candidate_id": resume_data.get("candidate_id"),
-                    "name": resume_data.get("name", "Unknown"),
-                    "final_score": score_result["final_score"],
-                    "similarity_score": score_result["similarity_score"],
-                    "must_have_matches": llm_analysis.get("must_have_matches", []),
-                    "recency_boost": score_result["recency_boost"],
-                    "reason_codes": reason_codes,
-                    "hit_mappings": hit_mappings,
-                }
-                
-                results.append(result)
-                
-                # Update progress
-                processing_state["progress"] = i + 1
-                
-            except Exception as e:
-                logger.error(f"Error processing resume {resume_file}: {str(e)}")
-                processing_state["errors"].append(f"{resume_file}: {str(e)}")
-        
-        # Rank results
-        results.sort(key=lambda x: x["final_score"], reverse=True)
-        for i, result in enumerate(results, 1):
-            result["rank"] = i
+        # Results go to the run's append-only log as they finish; only the index stays in memory
+        result_log = result_store.writer(checkpoint.job_id if checkpoint is not None else ticket.job_id)
+        if scoring_mode == "embedding":
+            for result in score_resumes_semantic(resume_files, jd_data, skip_processing, run_timings):
+                result_log.append(result)
+        else:
+            # A resumed run only scores what the checkpoint does not hold yet
+            pending_files = checkpoint.pending() if checkpoint is not None else resume_files
+            if checkpoint is not None and checkpoint.completed:
+                logger.info(f"Resuming job {checkpoint.job_id}: {len(checkpoint.completed)} done, {len(pending_files)} left")
+                for result in checkpoint.iter_results():
+                    result_log.append(result)
+            score_resumes_llm(
+                pending_files, jd_data, skip_processing, run_timings, jd_hash, budget, ticket, checkpoint, result_log
+            )
         
-        processing_state["results"] = results
-        processing_state["status"] = "completed"
+        if job_cancelled(ticket.job_id):
+            # A partial ranking does not replace the published results; resuming the job scores the rest
+            logger.info(f"Job {ticket.job_id} cancelled after {result_log.appended} results; results not published")
+            processing_state["stage_timings"] = run_timings.as_dict()
+            processing_state["status"] = "cancelled"
+            if checkpoint is not None:
+                checkpoint.finish("cancelled")
+            return
         
-        # Save results to file for persistence
+        # Rank (the same resume listed twice is ranked once) and publish as the latest results
         try:
-            results_file = config.output_path / "latest_results.json"
-            with open(results_file, "w", encoding="utf-8") as f:
-                json.dump({
+            with metrics.time_stage("persistence", run_timings):
+                latest = result_store.publish(result_log, {
                     "jd_file": jd_file,
                     "jd_id": jd_data.get("jd_id"),
+                    "scoring_mode": scoring_mode,
                     "timestamp": datetime.now().isoformat(),
-                    "results": results,
-                    "total_processed": len(results),
-                    "total_failed": len(processing_state["errors"])
-                }, f, indent=2, ensure_ascii=False)
-            logger.info(f"Results saved to {results_file}")
+                    "total_failed": len(processing_state["errors"]),
+                    "budget": budget.to_dict(),
+                    "job_id": ticket.job_id,
+                })
+            logger.info(f"Results saved to {latest.path}")
         except Exception as e:
             logger.error(f"Error saving results to file: {e}")
         
+        processing_state["stage_timings"] = run_timings.as_dict()
+        processing_state["status"] = "completed"
+        if checkpoint is not None:
+            checkpoint.finish("completed")
+        
     except Exception as e:
         logger.error(f"Error in processing pipeline: {str(e)}")
+        metrics.record_error("pipeline", e)
+        processing_state["stage_timings"] = run_timings.as_dict()
         processing_state["status"] = "error"
         processing_state["errors"].append(str(e))
+        if checkpoint is not None:
+            checkpoint.finish("error")
+    finally:
+        if result_log is not None:
+            result_log.close()
+        # The final ranking is in the result log; drop the per-resume live entries
+        processing_state.pop("live", None)
+
+
+def process_matrix(
+    job_id: str,
+    resume_files: List[str],
+    jd_files: List[tuple],
+    scoring_mode: str = "llm",
+    shortlist: Optional[int] = None,
+    ticket: Optional[WorkTicket] = None,
+):
+    """Score a resume pool against several JDs and write one ranking per JD.
+    
+    Args:
+        job_id: Matrix job id (key of matrix_jobs)
+        resume_files: Resume file paths (stored or raw)
+        jd_files: (jd_id, path) pairs of stored JDs
+        scoring_mode: "llm" or "embedding"
+        shortlist: Resumes analyzed per JD, best pre-scored first (all when None)
+        ticket: Scheduling ticket of the job's LLM calls (bulk by default)
+    """
+    job = matrix_jobs[job_id]
+    job["status"] = "processing"
+    run_timings = RunStageTimings()
+    current_run_timings.set(run_timings)
+    budget = Budget.for_job(config, f"matrix job {job_id}")
+    ticket = ticket or WorkTicket(job_id, "bulk")
+    
+    try:
+        # Load and normalize every JD and every resume exactly once
+        with metrics.time_stage("load", run_timings):
+            jds = []
+            for jd_id, jd_file in jd_files:
+                jd_data = process_jd_file(jd_file)
+                jd_data["jd_id"] = jd_id
+                jds.append(jd_data)
+            
+            resumes = []
+            seen_hashes = set()
+            for resume_file in resume_files:
+                try:
+                    resume_data = load_resume(resume_file)
+                except Exception as e:
+                    logger.error(f"Error loading resume {resume_file}: {str(e)}")
+                    job["errors"].append(f"{resume_file}: {str(e)}")
+                    continue
+                content_hash = resume_data.get("_metadata", {}).get("content_hash") or resume_content_hash(resume_data)
+                # Copies of the same resume are scored once
+                if content_hash in seen_hashes:
+                    continue
+                seen_hashes.add(content_hash)
+                resume_data.setdefault("_metadata", {})["content_hash"] = content_hash
+                resumes.append(resume_data)
+        
+        jd_hashes = [jd_content_hash(jd_data) for jd_data in jds]
+        requirements = [SemanticScorer.requirement_terms(jd_data) for jd_data in jds]
+        resume_terms = [set(tokenize(document_text(resume_data))) for resume_data in resumes]
+        prescores = semantic_scorer.similarity_matrix(jds, resumes)
+        
+        # Interleave JDs so every ranking gets its best pre-scored pairs analyzed first
+        per_jd = shortlist if shortlist else len(resumes)
+        orders = np.argsort(-prescores, axis=1, kind="stable")[:, :per_jd]
+        pairs = [(j, int(orders[j, k])) for k in range(orders.shape[1]) for j in range(len(jds))]
+        job["total_resumes"] = len(resumes)
+        job["total_pairs"] = len(pairs)
+        
+        def score_pair(pair: tuple) -> Dict:
+            current_run_timings.set(run_timings)
+            current_budget.set(budget)
+            current_work.set(ticket)
+            j, r = pair
+            jd_data, resume_data = jds[j], resumes[r]
+            if scoring_mode == "embedding":
+                analysis = SemanticScorer.similarity_analysis(
+                    float(prescores[j, r]), SemanticScorer.covered_requirements(requirements[j], resume_terms[r])
+                )
+                result = _build_result(resume_data, jd_data, analysis)
+                result["content_hash"] = resume_data["_metadata"]["content_hash"]
+            else:
+                result = score_resume_cached(resume_data, jd_data, jd_hashes[j])
+            result["prescore"] = round(float(prescores[j, r]) * 100.0, 2)
+            return result
+        
+        results: List[List[Dict]] = [[] for _ in jds]
+        with ThreadPoolExecutor(max_workers=config.llm_max_concurrency if scoring_mode == "llm" else 1) as executor:
+            futures = {executor.submit(score_pair, pair): pair for pair in pairs}
+            for future in as_completed(futures):
+                j, r = futures[future]
+                try:
+                    results[j].append(future.result())
+                except Exception as e:
+                    logger.error(f"Error scoring resume {resumes[r].get('candidate_id')} for JD {jds[j]['jd_id']}: {str(e)}")
+                    metrics.record_error("pipeline", e)
+                    job["errors"].append(f"{jds[j]['jd_id']}/{resumes[r].get('candidate_id')}: {str(e)}")
+                job["completed_pairs"] += 1
+        
+        # Write one ranking per JD
+        with metrics.time_stage("persistence", run_timings):
+            output_dir = config.output_path / "matrix" / job_id
+            output_dir.mkdir(parents=True, exist_ok=True)
+            for (jd_id, jd_file), jd_results in zip(jd_files, results):
+                jd_results.sort(key=lambda x: x["final_score"], reverse=True)
+                for i, result in enumerate(jd_results, 1):
+                    result["rank"] = i
+                results_file = output_dir / f"jd_{jd_id}.json"
+                write_json(results_file, {
+                    "jd_file": jd_file,
+                    "jd_id": jd_id,
+                    "scoring_mode": scoring_mode,
+                    "timestamp": datetime.now().isoformat(),
+                    "results": jd_results,
+                    "total_processed": len(jd_results),
+                })
+                job["rankings"][jd_id] = {
+                    "results_file": str(results_file),
+                    "total_ranked": len(jd_results),
+                    "top_candidate": jd_results[0]["candidate_id"] if jd_results else None,
+                }
+        
+        job["status"] = "cancelled" if job_cancelled(job_id) else "completed"
+        logger.info(f"Matrix job {job_id}: {len(pairs)} pairs over {len(jds)} JDs and {len(resumes)} resumes")
+        
+    except Exception as e:
+        logger.error(f"Error in matrix job {job_id}: {str(e)}")
+        metrics.record_error("pipeline", e)
+        job["status"] = "error"
+        job["errors"].append(str(e))
+    finally:
+        job["stage_timings"] = run_timings.as_dict()
+        job["budget"] = budget.to_dict()
+        job["finished_at"] = datetime.now().isoformat()
+
+
+def _record_progress(resume_file: str, run_timings: RunStageTimings, error: Optional[Exception] = None):
+    """Count a finished resume (and its error, if any) in the processing state."""
+    if error is not None:
+        logger.error(f"Error processing resume {resume_file}: {str(error)}")
+        metrics.record_error("pipeline", error)
+        processing_state["errors"].append(f"{resume_file}: {str(error)}")
+    processing_state["progress"] += 1
+    processing_state["stage_timings"] = run_timings.as_dict()
+
+
+def score_resumes_llm(
+    resume_files: List[str],
+    jd_data: Dict,
+    skip_processing: bool,
+    run_timings: RunStageTimings,
+    jd_hash: str,
+    budget: Optional[Budget] = None,
+    ticket: Optional[WorkTicket] = None,
+    checkpoint: Optional[JobCheckpoint] = None,
+    result_log: Optional[ResultLogWriter] = None,
+) -> List[Dict]:
+    """Score resumes with the LLM, concurrently; the rate limiter decides how many calls run at once.
+    
+    Once the job's (or the day's) LLM budget is used up, the remaining
+    resumes get lexical scores instead (see score_resume_cached). LLM
+    results are appended to the checkpoint as they finish; lexical ones are
+    not, so a resumed run scores them with the LLM.
+    
+    With a result log, results are appended to it as they finish and not
+    collected (the returned list is empty). Only a window of resumes is
+    submitted at a time and finished futures are dropped once consumed, so
+    memory does not grow with the size of the run.
+    """
+    results = []
+    window = max(1, config.llm_max_concurrency * 2)
+    remaining = iter(resume_files)
+    futures = {}
+    with ThreadPoolExecutor(max_workers=config.llm_max_concurrency) as executor:
+        while True:
+            for resume_file in itertools.islice(remaining, window - len(futures)):
+                future = executor.submit(
+                    score_resume, resume_file, jd_data, skip_processing, run_timings, jd_hash, budget, ticket
+                )
+                futures[future] = resume_file
+            if not futures:
+                break
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                resume_file = futures.pop(future)
+                try:
+                    result = future.result()
+                    if result_log is not None:
+                        result_log.append(result)
+                    else:
+                        results.append(result)
+                    if checkpoint is not None and result.get("scoring_mode") != "lexical":
+                        checkpoint.record(resume_file, result)
+                    _publish_live(resume_file, result, result["final_score"], result["similarity_score"], "final")
+                    _record_progress(resume_file, run_timings)
+                except Exception as e:
+                    processing_state.get("live", {}).pop(resume_file, None)
+                    _record_progress(resume_file, run_timings, e)
+                if budget is not None:
+                    processing_state["budget"] = budget.to_dict()
+    return results
+
+
+def score_resumes_semantic(
+    resume_files: List[str],
+    jd_data: Dict,
+    skip_processing: bool,
+    run_timings: RunStageTimings,
+) -> List[Dict]:
+    """Score resumes by embedding similarity: one matrix product for the whole pool, no LLM calls."""
+    current_run_timings.set(run_timings)
+    resumes = []
+    for resume_file in resume_files:
+        try:
+            with metrics.time_stage("load"):
+                resumes.append(load_resume(resume_file, skip_processing))
+        except Exception as e:
+            _record_progress(resume_file, run_timings, e)
+    
+    analyses = semantic_scorer.analyze_pool(jd_data, resumes)
+    
+    results = []
+    for resume_data, analysis in zip(resumes, analyses):
+        result = _build_result(resume_data, jd_data, analysis)
+        result["content_hash"] = resume_data.get("_metadata", {}).get("content_hash") or resume_content_hash(resume_data)
+        results.append(result)
+        _record_progress(resume_data.get("candidate_id"), run_timings)
+    return results
+
+
+def load_resume(resume_file: str, skip_processing: bool = False) -> Dict:
+    """Load a stored resume, or process a raw resume file into storage."""
+    if skip_processing:
+        # Load resume directly from storage (already processed)
+        return read_json(resume_file)
+    return process_resume_file(resume_file)
+
+
+def score_resume(
+    resume_file: str,
+    jd_data: Dict,
+    skip_processing: bool = False,
+    run_timings: Optional[RunStageTimings] = None,
+    jd_hash: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    ticket: Optional[WorkTicket] = None,
+) -> Dict:
+    """Load or process a single resume and score it against the job description.
+    
+    Scores are cached by resume content hash and JD content hash, so duplicate
+    resumes (and re-runs) reuse an existing score instead of calling the LLM.
+    
+    Args:
+        resume_file: Path to resume file
+        jd_data: Structured JD JSON
+        skip_processing: If True, load the file directly instead of processing it
+        run_timings: Stage timings of the current run
+        jd_hash: Content hash of the JD (computed when omitted)
+        budget: LLM budget of the current run
+        ticket: Scheduling ticket of the current run
+        
+    Returns:
+        Result entry for the ranking
+    """
+    # Worker threads do not inherit context, so attach this run's timings, budget and ticket explicitly
+    current_run_timings.set(run_timings)
+    current_budget.set(budget)
+    current_work.set(ticket)
+    logger.info(f"Processing resume: {resume_file}")
+    
+    # Process or load resume
+    with metrics.time_stage("load"):
+        resume_data = load_resume(resume_file, skip_processing)
+    
+    def on_provisional(analysis: Dict):
+        score = hybrid_scorer.calculate_final_score(analysis["similarity_score"], resume_data, jd_data, analysis)
+        _publish_live(resume_file, resume_data, score["final_score"], score["similarity_score"], "provisional")
+    
+    return score_resume_cached(resume_data, jd_data, jd_hash, on_provisional)
+
+
+def _publish_live(resume_file: str, resume_data: Dict, score: float, similarity_score: float, status: str):
+    """Show a candidate's provisional or final score in the live ranking of the current run."""
+    processing_state.setdefault("live", {})[resume_file] = {
+        "candidate_id": resume_data.get("candidate_id"),
+        "name": resume_data.get("name", "Unknown"),
+        "score": score,
+        "similarity_score": similarity_score,
+        "status": status,
+    }
+
+
+def score_resume_cached(
+    resume_data: Dict,
+    jd_data: Dict,
+    jd_hash: Optional[str] = None,
+    on_provisional: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """Score a loaded resume with the LLM, reusing the cached score for the same resume/JD content.
+    
+    When an LLM budget cap is reached the resume gets a lexical score
+    instead, marked with `scoring_mode: "lexical"`.
+    
+    Args:
+        resume_data: Structured resume JSON
+        jd_data: Structured JD JSON
+        jd_hash: Content hash of the JD (computed when omitted)
+        on_provisional: Called with the analysis as soon as its scores have
+            streamed in (LLM_STREAMING only; not called on cache hits)
+        
+    Returns:
+        Result entry for the ranking
+    """
+    content_hash = resume_data.get("_metadata", {}).get("content_hash") or resume_content_hash(resume_data)
+    # Edited scoring prompts invalidate cached scores
+    cache_key = score_cache.key(content_hash, jd_hash or jd_content_hash(jd_data), prompt_loader.content_hash())
+    try:
+        # Failed analyses raise, so they are neither cached nor ranked
+        result = score_cache.get_or_compute(cache_key, lambda: _score_resume_data(resume_data, jd_data, on_provisional))
+    except BudgetExceeded as e:
+        # Not cached either: the resume gets an LLM score once budget is available again
+        result = _score_resume_lexical(resume_data, jd_data, str(e))
+    
+    # A cached score may come from another stored copy of the same resume
+    return {
+        **result,
+        "candidate_id": resume_data.get("candidate_id"),
+        "name": resume_data.get("name", "Unknown"),
+        "content_hash": content_hash,
+    }
+
+
+def _score_resume_data(
+    resume_data: Dict,
+    jd_data: Dict,
+    on_provisional: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """Analyze a resume with the LLM and build its result entry."""
+    # Analyze with LLM
+    if llm_analyzer is None:
+        raise ValueError("LLM analyzer is not available. Please configure API keys in .env file.")
+    llm_analysis = llm_analyzer.analyze_candidate(resume_data, jd_data, on_provisional)
+    return _build_result(resume_data, jd_data, llm_analysis)
+
+
+def _score_resume_lexical(resume_data: Dict, jd_data: Dict, reason: str) -> Dict:
+    """Score a resume without the LLM (term-embedding similarity and must-have coverage)."""
+    analysis = semantic_scorer.analyze_pool(jd_data, [resume_data])[0]
+    analysis["reason_codes"].append("BUDGET_LIMIT: Puntaje léxico, se alcanzó el presupuesto de LLM")
+    result = _build_result(resume_data, jd_data, analysis)
+    result["scoring_mode"] = "lexical"
+    result["budget_limited"] = reason
+    return result
+
+
+def _build_result(resume_data: Dict, jd_data: Dict, llm_analysis: Dict) -> Dict:
+    """Combine an analysis (LLM or embedding) with rule boosts and explanations."""
+    # Calculate hybrid score
+    with metrics.time_stage("scoring"):
+        score_result = hybrid_scorer.calculate_final_score(
+            llm_analysis.get("similarity_score", 0.0),
+            resume_data,
+            jd_data,
+            llm_analysis,
+        )
+    
+    # Generate reason codes
+    with metrics.time_stage("reason_codes"):
+        reason_codes = ReasonCodes.generate_reason_codes_from_analysis(
+            llm_analysis, resume_data, jd_data
+        )
+    
+    # Map hits to sections
+    with metrics.time_stage("hit_mapping"):
+        hit_mappings = HitMapper.map_hits_to_sections(
+            llm_analysis, resume_data, jd_data
+        )
+    
+    # Combine results
+    return {
+        "candidate_id": resume_data.get("candidate_id"),
+        "name": resume_data.get("name", "Unknown"),
+        "final_score": score_result["final_score"],
+        "similarity_score": score_result["similarity_score"],
+        "must_have_matches": llm_analysis.get("must_have_matches", []),
+        "recency_boost": score_result["recency_boost"],
+        "reason_codes": reason_codes,
+        "hit_mappings": hit_mappings,
+    }
+
+
+def rank_jobs_for_resume(
+    resume_data: Dict,
+    top_n: int = 10,
+    shortlist_size: int = 20,
+    scoring_mode: str = "llm",
+) -> Dict:
+    """Rank stored job descriptions for one candidate.
+    
+    All JDs are pre-scored at once from their cached profiles (vector
+    similarity and must-have coverage); only the shortlist is analyzed, with
+    the LLM calls for the different JDs running concurrently under the
+    shared rate limiter, at interactive priority.
+    
+    Args:
+        resume_data: Structured resume JSON
+        top_n: Number of JDs to return
+        shortlist_size: Number of pre-scored JDs to analyze
+        scoring_mode: "llm" or "embedding" (pre-score signals only, no LLM calls)
+        
+    Returns:
+        Dict with the ranked jobs, errors and stage timings
+    """
+    run_timings = RunStageTimings()
+    current_run_timings.set(run_timings)
+    budget = Budget.for_job(config, "candidate match")
+    # A user is waiting for this answer
+    ticket = WorkTicket(new_job_id("match"), "interactive")
+    
+    with metrics.time_stage("shortlist", run_timings):
+        shortlist = job_matcher.shortlist(resume_data, max(top_n, shortlist_size))
+    
+    def score_entry(entry: Dict) -> Dict:
+        current_run_timings.set(run_timings)
+        current_budget.set(budget)
+        current_work.set(ticket)
+        profile = entry["profile"]
+        if scoring_mode == "embedding":
+            analysis = SemanticScorer.similarity_analysis(entry["similarity"], entry["must_have_matches"])
+            result = _build_result(resume_data, profile["jd_data"], analysis)
+        else:
+            result = score_resume_cached(resume_data, profile["jd_data"], profile["jd_hash"])
+        return {
+            "jd_id": profile["jd_id"],
+            "file_id": profile["file_id"],
+            "title": profile["title"],
+            "prescore": entry["prescore"],
+            **{key: result[key] for key in (
+                "final_score", "similarity_score", "must_have_matches", "recency_boost", "reason_codes", "hit_mappings"
+            )},
+        }
+    
+    jobs = []
+    errors = []
+    with ThreadPoolExecutor(max_workers=config.llm_max_concurrency) as executor:
+        futures = {executor.submit(score_entry, entry): entry["profile"]["file_id"] for entry in shortlist}
+        for future in as_completed(futures):
+            try:
+                jobs.append(future.result())
+            except Exception as e:
+                logger.error(f"Error matching job {futures[future]}: {str(e)}")
+                metrics.record_error("pipeline", e)
+                errors.append(f"{futures[future]}: {str(e)}")
+    
+    jobs.sort(key=lambda x: x["final_score"], reverse=True)
+    jobs = jobs[:top_n]
+    for i, job in enumerate(jobs, 1):
+        job["rank"] = i
+    
+    return {
+        "candidate_id": resume_data.get("candidate_id"),
+        "name": resume_data.get("name", "Unknown"),
+        "scoring_mode": scoring_mode,
+        "total_jds": len(job_matcher),
+        "shortlisted": len(shortlist),
+        "jobs": jobs,
+        "errors": errors,
+        "budget": budget.to_dict(),
+        "stage_timings": run_timings.as_dict(),
+    }
+
+
+def _is_stored_file(path: Path, directory: Path) -> bool:
+    """Check whether a path points at an already-processed file in storage."""
+    try:
+        return path.resolve().parent == directory.resolve() and path.exists()
+    except OSError:
+        return False
 
 
 def process_resume_file(file_path: str) -> Dict:
     """Process a resume file (PDF, JSON, or TXT)."""
     path = Path(file_path)
     
+    if _is_stored_file(path, storage.resumes_dir):
+        # Uploaded resumes are already parsed and stored
+        return read_json(path)
+    
     if pdf_validator.is_pdf(path):
         # Extract text from PDF
         text_data = pdf_extractor.extract_text_with_metadata(path)
@@ -424,6 +1185,10 @@ def process_jd_file(file_path: str) -> Dict:
     """Process a job description file (PDF, JSON, or TXT)."""
     path = Path(file_path)
     
+    if _is_stored_file(path, storage.jds_dir):
+        # Uploaded job descriptions are already parsed and stored
+        return read_json(path)
+    
     if pdf_validator.is_pdf(path):
         # Extract text from PDF
         text_data = pdf_extractor.extract_text_with_metadata(path)
@@ -465,88 +1230,212 @@ def process_jd_file(file_path: str) -> Dict:
 
 @app.get("/api/process/status")
 async def get_processing_status():
-    """Get processing status."""
-    return processing_state
+    """Get processing status (the live ranking is served by /api/results/live)."""
+    return {
+        **{key: value for key, value in processing_state.items() if key != "live"},
+        "rate_limits": get_all_rate_limiter_metrics(),
+        "llm_providers": llm_client.get_provider_metrics() if llm_client else None,
+        "llm_daily_budget": llm_client.budget.daily.to_dict() if llm_client else None,
+    }
+
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus metrics (stage latency histograms, LLM tokens, cache hits, errors)."""
+    return PlainTextResponse(
+        metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@app.get("/api/results/live")
+async def get_live_results():
+    """Ranking of the current run as it fills in.
+    
+    Finished candidates have status "final"; with LLM_STREAMING, candidates
+    whose analysis is still streaming appear with a "provisional" score as
+    soon as their score fields arrive. The live ranking is cleared when the
+    run ends; the final one is served by /api/results.
+    """
+    ranking = sorted(
+        (dict(entry) for entry in list(processing_state.get("live", {}).values())),
+        key=lambda x: x["score"],
+        reverse=True,
+    )
+    for i, entry in enumerate(ranking, 1):
+        entry["rank"] = i
+    return {
+        "status": processing_state["status"],
+        "progress": processing_state["progress"],
+        "total": processing_state["total"],
+        "ranking": ranking,
+    }
 
 
 @app.get("/api/results")
-async def get_results():
-    """Get ranked results."""
-    # First check if there's an active processing with results
-    if processing_state["status"] == "completed" and processing_state["results"]:
-        return {
-            "results": processing_state["results"],
-            "total": len(processing_state["results"]),
-        }
+async def get_results(request: Request, response: Response, offset: int = 0, limit: Optional[int] = None):
+    """Get ranked results of the latest finished run.
     
-    # Otherwise, try to load from file
-    try:
-        results_file = config.output_path / "latest_results.json"
-        if results_file.exists():
-            with open(results_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return {
-                    "results": data.get("results", []),
-                    "total": len(data.get("results", [])),
-                    "timestamp": data.get("timestamp"),
-                    "jd_id": data.get("jd_id")
-                }
-    except Exception as e:
-        logger.error(f"Error loading results from file: {e}")
+    Results are read from the run's result log by offset, so a page of
+    the ranking costs the same however large the run was. The ETag
+    changes with each finished run; polling with If-None-Match gets a 304
+    until then.
+    """
+    if offset < 0 or (limit is not None and limit < 1):
+        raise HTTPException(status_code=400, detail="offset must be >= 0 and limit >= 1")
     
-    # If no results found anywhere
-    raise HTTPException(status_code=400, detail="Processing not completed")
+    latest = result_store.latest()
+    if latest is None:
+        raise HTTPException(status_code=400, detail="Processing not completed")
+    not_modified = conditional_get(request, response, "results", latest.version, offset, limit)
+    if not_modified is not None:
+        return not_modified
+    return json_response({
+        "results": latest.page(offset, limit),
+        "total": len(latest),
+        "timestamp": latest.meta.get("timestamp"),
+        "jd_id": latest.meta.get("jd_id"),
+    }, response)
 
 
 @app.get("/api/results/{candidate_id}")
-async def get_candidate_details(candidate_id: str):
-    """Get detailed candidate information."""
-    if processing_state["status"] != "completed":
+async def get_candidate_details(candidate_id: str, job_id: Optional[str] = None):
+    """Get detailed candidate information.
+    
+    Reads the candidate's result from the latest run (or the run `job_id`)
+    by its offset in the result log, and the stored resume by the resume
+    index; the response is a new dict, so stored results stay as they are.
+    """
+    results = result_store.open(job_id) if job_id else result_store.latest()
+    if results is None:
+        if job_id:
+            raise HTTPException(status_code=404, detail=f"No results for job: {job_id}")
         raise HTTPException(status_code=400, detail="Processing not completed")
     
-    # Find candidate in results
-    for result in processing_state["results"]:
-        if result.get("candidate_id") == candidate_id:
-            # Get full resume from storage
-            try:
-                resume = storage.get_resume(candidate_id)
-                result["full_resume"] = resume
-            except FileNotFoundError:
-                pass
-            
-            return result
+    result = results.get(candidate_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
     
-    raise HTTPException(status_code=404, detail="Candidate not found")
+    # Get full resume from storage
+    try:
+        full_resume = storage.get_resume(candidate_id)
+    except FileNotFoundError:
+        return result
+    return {**result, "full_resume": full_resume}
+
+
+def parse_list_params(fields: Optional[str], offset: int, limit: Optional[int], summary_fields) -> Optional[List[str]]:
+    """Validate list paging parameters and parse `fields` ("summary" selects all summary fields)."""
+    if offset < 0 or (limit is not None and limit < 1):
+        raise HTTPException(status_code=400, detail="offset must be >= 0 and limit >= 1")
+    if not fields:
+        return None
+    if fields == "summary":
+        return list(summary_fields)
+    return [field.strip() for field in fields.split(",") if field.strip()]
 
 
 @app.get("/api/storage/resumes")
-async def list_resumes():
-    """List all stored resumes."""
-    resumes_summary = storage.list_resumes()
-    # Get full resume data for each
-    full_resumes = []
-    for resume_info in resumes_summary:
-        try:
-            full_resume = storage.get_resume(resume_info['candidate_id'])
-            full_resumes.append(full_resume)
-        except Exception as e:
-            logger.warning(f"Error loading resume {resume_info['candidate_id']}: {e}")
-    return full_resumes
+async def list_resumes(
+    request: Request, response: Response, fields: Optional[str] = None, offset: int = 0, limit: Optional[int] = None
+):
+    """List stored resumes, newest first.
+    
+    Without parameters every full resume is returned. `fields` selects the
+    fields to return (comma-separated, or "summary" for file_id,
+    candidate_id, name, email, skills and saved_at, which come from the
+    resume index without reading any file); `offset`/`limit` select a
+    page. The total count is in the X-Total-Count header.
+    
+    The ETag changes whenever a resume is stored or deleted; a matching
+    If-None-Match gets a 304 without reading anything.
+    """
+    selected = parse_list_params(fields, offset, limit, RESUME_SUMMARY_FIELDS)
+    not_modified = conditional_get(request, response, "resumes", storage.revision("resume"), selected, offset, limit)
+    if not_modified is not None:
+        return not_modified
+    resumes, total = storage.page_resumes(selected, offset, limit)
+    response.headers["X-Total-Count"] = str(total)
+    return json_response(resumes, response)
 
 
 @app.get("/api/storage/job-descriptions")
-async def list_job_descriptions():
-    """List all stored job descriptions."""
-    jds_summary = storage.list_jds()
-    # Get full JD data for each
-    full_jds = []
-    for jd_info in jds_summary:
-        try:
-            full_jd = storage.get_jd(jd_info['jd_id'])
-            full_jds.append(full_jd)
-        except Exception as e:
-            logger.warning(f"Error loading JD {jd_info['jd_id']}: {e}")
-    return full_jds
+async def list_job_descriptions(
+    request: Request, response: Response, fields: Optional[str] = None, offset: int = 0, limit: Optional[int] = None
+):
+    """List stored job descriptions, newest first.
+    
+    Takes the same `fields`/`offset`/`limit` parameters as
+    /api/storage/resumes; the "summary" fields are file_id, jd_id, title,
+    experience_years_required and saved_at. ETags work the same way.
+    """
+    selected = parse_list_params(fields, offset, limit, JD_SUMMARY_FIELDS)
+    not_modified = conditional_get(request, response, "job_descriptions", storage.revision("jd"), selected, offset, limit)
+    if not_modified is not None:
+        return not_modified
+    jds, total = storage.page_jds(selected, offset, limit)
+    response.headers["X-Total-Count"] = str(total)
+    return json_response(jds, response)
+
+
+@app.get("/api/match/jd/{jd_id}/candidates")
+async def match_candidates_for_jd(jd_id: str, top_n: int = 20, nprobe: int = 16, exact: bool = False):
+    """Find the stored resumes most similar to a job description (embedding ANN search, no LLM)."""
+    # Stored JDs are named after their id: read the file directly instead of scanning every JD
+    jd_file_path = config.storage_jd_path / f"jd_{jd_id}.json"
+    if not jd_file_path.exists():
+        raise HTTPException(status_code=404, detail=f"Job description not found: {jd_id}")
+    jd_data = read_json(jd_file_path)
+    
+    top_n = max(1, min(top_n, 1000))
+    result = await run_in_threadpool(
+        candidate_retriever.top_candidates, jd_data, top_n, max(1, nprobe), exact
+    )
+    return {"jd_id": jd_id, "top_n": top_n, **result}
+
+
+@app.get("/api/match/candidate/{candidate_id}/jobs")
+async def match_jobs_for_candidate(
+    candidate_id: str,
+    top_n: int = 10,
+    shortlist: int = 20,
+    scoring_mode: Optional[str] = None,
+):
+    """Rank stored job descriptions for a candidate (reverse matching).
+    
+    Every JD is pre-scored from cached profiles; only the best `shortlist`
+    JDs are analyzed with `scoring_mode` (defaults to SCORING_MODE).
+    """
+    scoring_mode = resolve_scoring_mode(scoring_mode)
+    try:
+        resume_data = await run_in_threadpool(storage.get_resume, candidate_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Resume not found: {candidate_id}")
+    
+    top_n = max(1, min(top_n, 1000))
+    shortlist = max(1, min(shortlist, 1000))
+    return await run_in_threadpool(rank_jobs_for_resume, resume_data, top_n, shortlist, scoring_mode)
+
+
+@app.post("/api/match/index/sync")
+async def sync_candidate_index():
+    """Add stored resumes missing from the candidate index and drop deleted ones."""
+    return await run_in_threadpool(candidate_retriever.sync)
+
+
+@app.get("/api/storage/resumes/clusters")
+async def list_resume_clusters(min_size: int = 2):
+    """List groups of near-duplicate resumes (versions of the same CV), newest version first."""
+    clusters = storage.resume_clusters(max(1, min_size))
+    return {"total_clusters": len(clusters), "clusters": clusters}
+
+
+@app.get("/api/storage/resumes/{file_id}/similar")
+async def list_similar_resumes(file_id: str):
+    """List stored resumes that are near-duplicates of the given resume file."""
+    if not (storage.resumes_dir / file_id).exists():
+        raise HTTPException(status_code=404, detail=f"Resume not found: {file_id}")
+    return storage.similar_resumes(file_id)
 
 
 @app.get("/api/storage/search")
@@ -567,10 +1456,11 @@ async def delete_file(file_id: str, file_type: str):
 @app.get("/api/export/csv")
 async def export_csv():
     """Export results to CSV."""
-    if processing_state["status"] != "completed":
+    latest = result_store.latest()
+    if latest is None:
         raise HTTPException(status_code=400, detail="Processing not completed")
     
-    csv_path = csv_exporter.export_results(processing_state["results"])
+    csv_path = csv_exporter.export_results(latest.iter_ranked())
     
     return FileResponse(
         csv_path,
@@ -0,0 +1,4 @@
+"""Monitoring module."""
+from .metrics import MetricsRegistry, RunStageTimings, current_run_timings, metrics
+
+__all__ = ["MetricsRegistry", "RunStageTimings", "current_run_timings", "metrics"]
@@ -0,0 +1,214 @@
+"""Lightweight in-process metrics with Prometheus text exposition."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import bisect
+import threading
+import time
+
+# Latency buckets in seconds (covers sub-millisecond parsing up to slow LLM calls)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Help text for the metrics emitted by the application
+METRIC_HELP = {
+    "talent_stage_duration_seconds": ("histogram", "Time spent in each pipeline stage"),
+    "talent_llm_requests_total": ("counter", "LLM provider calls by outcome"),
+    "talent_llm_tokens_total": ("counter", "LLM tokens by direction (input/output)"),
+    "talent_llm_responses_total": ("counter", "Structured LLM responses by parse outcome"),
+    "talent_llm_cost_usd_total": ("counter", "Estimated LLM spend in USD per provider and model"),
+    "talent_llm_budget_rejections_total": ("counter", "LLM calls not dispatched because a budget cap was reached"),
+    "talent_llm_first_token_seconds": ("histogram", "Time to first streamed token per provider"),
+    "talent_cache_hits_total": ("counter", "Cache hits by cache name"),
+    "talent_cache_misses_total": ("counter", "Cache misses by cache name"),
+    "talent_errors_total": ("counter", "Errors by stage and exception type"),
+    "talent_http_not_modified_total": ("counter", "Conditional GETs answered with 304 Not Modified per endpoint"),
+    "talent_llm_scheduler_wait_seconds": ("histogram", "Time LLM calls wait in the scheduler queue per priority"),
+    "talent_llm_scheduler_queued": ("gauge", "LLM calls queued in the scheduler per provider and priority"),
+    "talent_llm_scheduler_running": ("gauge", "LLM calls admitted by the scheduler per provider and priority"),
+    "talent_llm_concurrency_limit": ("gauge", "Current adaptive concurrency limit per provider"),
+    "talent_llm_in_flight": ("gauge", "LLM calls currently in flight per provider"),
+    "talent_llm_queue_depth": ("gauge", "Callers waiting for a concurrency slot per provider"),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Per-run stage timings for the code currently executing (set by the pipeline workers)
+current_run_timings: ContextVar[Optional["RunStageTimings"]] = ContextVar("current_run_timings", default=None)
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    escaped = [f'{k}="{v.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in items]
+    return "{" + ",".join(escaped) + "}"
+
+
+class _Histogram:
+    """Cumulative histogram with fixed buckets."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+class RunStageTimings:
+    """Stage breakdown for a single processing run (reported in the job status)."""
+
+    def __init__(self):
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        """Add one observation for a stage."""
+        with self._lock:
+            entry = self._stages.setdefault(stage, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            entry["count"] += 1
+            entry["total_seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """JSON-friendly snapshot, slowest stage (by total time) first."""
+        with self._lock:
+            stages = {name: dict(entry) for name, entry in self._stages.items()}
+        grand_total = sum(entry["total_seconds"] for entry in stages.values()) or 1.0
+        return {
+            name: {
+                "count": int(entry["count"]),
+                "total_seconds": round(entry["total_seconds"], 4),
+                "mean_ms": round(entry["total_seconds"] / entry["count"] * 1000, 3),
+                "max_ms": round(entry["max_seconds"] * 1000, 3),
+                "share": round(entry["total_seconds"] / grand_total, 4),
+            }
+            for name, entry in sorted(stages.items(), key=lambda item: item[1]["total_seconds"], reverse=True)
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe counters, histograms and collected gauges."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize metrics registry.
+
+        Args:
+            buckets: Histogram bucket upper bounds in seconds
+        """
+        self.buckets = buckets
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, Dict[str, str], float]]]] = []
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1.0, labels: Optional[Dict[str, str]] = None):
+        """Increment a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """Record a histogram observation."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = _Histogram(self.buckets)
+            series[key].observe(value)
+
+    def register_collector(self, collector: Callable[[], List[Tuple[str, Dict[str, str], float]]]):
+        """Register a callable returning (name, labels, value) gauges at scrape time."""
+        self._collectors.append(collector)
+
+    def record_stage(self, stage: str, seconds: float, run: Optional[RunStageTimings] = None):
+        """Record a stage duration globally and in the current run, if any."""
+        self.observe("talent_stage_duration_seconds", seconds, {"stage": stage})
+        run = run or current_run_timings.get()
+        if run is not None:
+            run.record(stage, seconds)
+
+    @contextmanager
+    def time_stage(self, stage: str, run: Optional[RunStageTimings] = None) -> Iterator[None]:
+        """
+        Time a block of code as a pipeline stage.
+
+        Exceptions are counted in talent_errors_total and re-raised.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record_error(stage, e)
+            raise
+        finally:
+            self.record_stage(stage, time.perf_counter() - started, run)
+
+    def record_error(self, stage: str, error: BaseException):
+        """Count an error by stage and exception type."""
+        self.inc("talent_errors_total", labels={"stage": stage, "type": type(error).__name__})
+
+    def record_cache(self, cache: str, hit: bool):
+        """Count a cache hit or miss."""
+        name = "talent_cache_hits_total" if hit else "talent_cache_misses_total"
+        self.inc(name, labels={"cache": cache})
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def header(name: str, default_type: str):
+            metric_type, help_text = METRIC_HELP.get(name, (default_type, name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {
+                name: {key: (list(h.counts), h.total, h.count) for key, h in series.items()}
+                for name, series in self._histograms.items()
+            }
+
+        for name in sorted(counters):
+            header(name, "counter")
+            for key, value in sorted(counters[name].items()):
+                lines.append(f"{name}{_format_labels(key)} {value:g}")
+
+        for name in sorted(histograms):
+            header(name, "histogram")
+            for key, (counts, total, count) in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {count}")
+                lines.append(f"{name}_sum{_format_labels(key)} {total:.6f}")
+                lines.append(f"{name}_count{_format_labels(key)} {count}")
+
+        gauges: Dict[str, List[Tuple[LabelKey, float]]] = {}
+        for collector in self._collectors:
+            for name, labels, value in collector():
+                if value is not None:
+                    gauges.setdefault(name, []).append((_label_key(labels), value))
+        for name in sorted(gauges):
+            header(name, "gauge")
+            for key, value in gauges[name]:
+                lines.append(f"{name}{_format_labels(key)} {value:g}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
@@ -1,6 +1,7 @@
 """PDF text extraction."""
 from pathlib import Path
 from typing import Optional
+import io
 import logging
 
 try:
@@ -114,6 +115,53 @@ class PDFExtractor:
             "metadata": metadata,
         }
     
+    def extract_text_from_bytes(self, content: bytes, name: str = "upload.pdf") -> dict:
+        """
+        Extract text and metadata from PDF bytes already in memory.
+        
+        Args:
+            content: Raw PDF bytes
+            name: Original file name (for logging and metadata)
+            
+        Returns:
+            Dictionary with 'text' and 'metadata' keys
+        """
+        if not self._pdfplumber_available:
+            raise ImportError(
+                "pdfplumber is required for PDF extraction. "
+                "Install it with: pip install pdfplumber"
+            )
+        
+        logger.info(f"Extracting text from PDF bytes: {name}")
+        
+        text_parts = []
+        try:
+            with pdfplumber.open(io.BytesIO(content)) as pdf:
+                num_pages = len(pdf.pages)
+                for page_num, page in enumerate(pdf.pages, 1):
+                    page_text = page.extract_text()
+                    if page_text:
+                        text_parts.append(page_text)
+                    else:
+                        logger.warning(f"No text found on page {page_num} of {name}")
+        except Exception as e:
+            logger.error(f"Error extracting text from PDF {name}: {str(e)}")
+            raise
+        
+        full_text = "\n\n".join(text_parts)
+        if not full_text.strip():
+            raise ValueError(f"No text could be extracted from PDF: {name}")
+        
+        logger.info(f"Extracted {len(full_text)} characters from {name}")
+        return {
+            "text": full_text,
+            "metadata": {
+                "file_name": name,
+                "file_size": len(content),
+                "num_pages": num_pages,
+            },
+        }
+    
     def extract_text_from_txt(self, txt_path: str | Path) -> str:
         """
         Extract text from TXT file.
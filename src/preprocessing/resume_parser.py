@@ -185,8 +185,20 @@ class ResumeParser:
         with open(json_path, "r", encoding="utf-8") as f:
             data = json.load(f)
         
-        if not self._validate_resume_json(data):
-            raise ValueError(f"Invalid resume JSON structure: {json_path}")
+        return self.parse_from_json_data(data, source=str(json_path))
+    
+    def parse_from_json_data(self, data: Dict, source: str = "<memory>") -> Dict:
+        """
+        Validate resume JSON that has already been loaded.
+        
+        Args:
+            data: Decoded JSON object
+            source: Origin of the data (for error messages)
+            
+        Returns:
+            Structured resume JSON
+        """
+        if not isinstance(data, dict) or not self._validate_resume_json(data):
+            raise ValueError(f"Invalid resume JSON structure: {source}")
         
         return data
-
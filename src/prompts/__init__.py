@@ -1,4 +1,5 @@
 """Prompt management module."""
 from .prompt_loader import PromptLoader
+from .template import CompiledTemplate, PromptTemplateError
 
-__all__ = ["PromptLoader"]
+__all__ = ["PromptLoader", "CompiledTemplate", "PromptTemplateError"]
@@ -1,61 +1,168 @@
 """Prompt loader for managing LLM prompts."""
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Tuple
 import logging
+import threading
+import time
 
 from src.config import config
+from src.monitoring import metrics
+from .template import CompiledTemplate, PromptTemplateError
 
 logger = logging.getLogger(__name__)
 
+# Variables each known prompt is rendered with; a template using anything else cannot be rendered
+PROMPT_VARIABLES = {
+    "scoring_prompt": {"job_description", "must_have_requirements", "resume_text", "candidate_name", "candidate_skills"},
+    "scoring_system": set(),
+    "scoring_prefix": {"job_description", "must_have_requirements"},
+    "scoring_candidate": {"resume_text", "candidate_name", "candidate_skills"},
+}
+
+# Prompts making up one scoring call (see format_scoring_prompt)
+SCORING_PROMPTS = ("scoring_system", "scoring_prefix", "scoring_candidate")
+
 
 class PromptLoader:
     """Load and manage LLM prompts."""
     
-    def __init__(self, prompts_dir: str | Path = None):
+    def __init__(
+        self,
+        prompts_dir: str | Path = None,
+        hot_reload: Optional[bool] = None,
+        reload_interval: Optional[float] = None,
+    ):
         """
         Initialize prompt loader.
         
         Args:
             prompts_dir: Directory containing prompt files
+            hot_reload: Re-read prompt files when they change (defaults to PROMPT_HOT_RELOAD)
+            reload_interval: Minimum seconds between file checks per prompt
+                (defaults to PROMPT_RELOAD_INTERVAL)
         """
         self.prompts_dir = Path(prompts_dir or config.prompts_dir)
-        self._prompts: Dict[str, str] = {}
+        self.hot_reload = config.prompt_hot_reload if hot_reload is None else hot_reload
+        self.reload_interval = config.prompt_reload_interval if reload_interval is None else reload_interval
+        self._templates: Dict[str, CompiledTemplate] = {}
+        self._checked_at: Dict[str, float] = {}
+        # (path, mtime) of prompt files that failed to compile; not retried until they change again
+        self._rejected: Dict[str, Tuple[Optional[Path], Optional[float]]] = {}
+        self._lock = threading.Lock()
         
         # Ensure prompts directory exists
         self.prompts_dir.mkdir(parents=True, exist_ok=True)
         (self.prompts_dir / "templates").mkdir(parents=True, exist_ok=True)
     
-    def load_prompt(self, prompt_name: str) -> str:
+    def _find_file(self, prompt_name: str) -> Optional[Path]:
+        """Prompt file for a name, if any."""
+        for prompt_file in (
+            self.prompts_dir / f"{prompt_name}.txt",
+            # Templates directory with _template suffix
+            self.prompts_dir / "templates" / f"{prompt_name}_template.txt",
+            # Templates directory without suffix
+            self.prompts_dir / "templates" / f"{prompt_name}.txt",
+        ):
+            if prompt_file.exists():
+                return prompt_file
+        return None
+    
+    def _compile(self, prompt_name: str) -> CompiledTemplate:
         """
-        Load prompt from file or cache.
+        Read and compile a prompt, checking it against its known variables.
+        
+        Raises:
+            PromptTemplateError: If the template is malformed or uses unknown variables
+        """
+        prompt_file = self._find_file(prompt_name)
+        if prompt_file is None:
+            logger.warning(f"Prompt file not found: {prompt_name}, using default")
+            template = CompiledTemplate(prompt_name, self._get_default_prompt(prompt_name))
+        else:
+            mtime = prompt_file.stat().st_mtime
+            with open(prompt_file, "r", encoding="utf-8") as f:
+                template = CompiledTemplate(prompt_name, f.read(), prompt_file, mtime)
+        
+        expected = PROMPT_VARIABLES.get(prompt_name)
+        if expected is not None:
+            unknown = template.variables - expected
+            if unknown:
+                raise PromptTemplateError(
+                    f"Prompt {prompt_name} uses unknown variables {sorted(unknown)} (available: {sorted(expected)})"
+                )
+            unused = expected - template.variables
+            if unused:
+                logger.warning(f"Prompt {prompt_name} does not use {sorted(unused)}")
+        return template
+    
+    def _file_state(self, prompt_name: str) -> Tuple[Optional[Path], Optional[float]]:
+        """Current file and modification time of a prompt ((None, None) when it has no file)."""
+        prompt_file = self._find_file(prompt_name)
+        return prompt_file, prompt_file.stat().st_mtime if prompt_file else None
+    
+    def _is_stale(self, template: CompiledTemplate) -> bool:
+        """Whether the prompt's file was edited, added or removed since it was compiled (or last rejected)."""
+        compiled_state = (template.path, template.mtime if template.path else None)
+        return self._file_state(template.name) != self._rejected.get(template.name, compiled_state)
+    
+    def get_template(self, prompt_name: str) -> CompiledTemplate:
+        """
+        Compiled prompt, re-read when its file changed (with hot reload on).
+        
+        An edited file that fails to compile is logged and the previous
+        version stays in use.
         
         Args:
             prompt_name: Name of the prompt (without extension)
-            
+        
         Returns:
-            Prompt text
+            Compiled template
+        
+        Raises:
+            PromptTemplateError: If the prompt has never compiled successfully
         """
-        if prompt_name in self._prompts:
-            return self._prompts[prompt_name]
+        template = self._templates.get(prompt_name)
+        if template is not None:
+            due = False
+            if self.hot_reload:
+                now = time.monotonic()
+                with self._lock:
+                    due = now - self._checked_at.get(prompt_name, 0.0) >= self.reload_interval
+                    if due:
+                        self._checked_at[prompt_name] = now
+            if not due or not self._is_stale(template):
+                metrics.record_cache("prompts", hit=True)
+                return template
+        metrics.record_cache("prompts", hit=False)
         
-        # Try .txt file first
-        prompt_file = self.prompts_dir / f"{prompt_name}.txt"
-        if not prompt_file.exists():
-            # Try templates directory with _template suffix
-            prompt_file = self.prompts_dir / "templates" / f"{prompt_name}_template.txt"
-        if not prompt_file.exists():
-            # Try templates directory without suffix
-            prompt_file = self.prompts_dir / "templates" / f"{prompt_name}.txt"
+        with self._lock:
+            try:
+                compiled = self._compile(prompt_name)
+            except PromptTemplateError as e:
+                if template is None:
+                    raise
+                logger.error(f"Keeping previous version of prompt {prompt_name}: {e}")
+                # Don't retry until the file changes again (the template in use is left untouched)
+                self._rejected[prompt_name] = self._file_state(prompt_name)
+                return template
+            self._rejected.pop(prompt_name, None)
+            if template is not None:
+                logger.info(f"Reloaded prompt {prompt_name} ({template.content_hash} -> {compiled.content_hash})")
+            self._templates[prompt_name] = compiled
+            self._checked_at[prompt_name] = time.monotonic()
+            return compiled
+    
+    def load_prompt(self, prompt_name: str) -> str:
+        """
+        Load prompt from file or cache.
         
-        if prompt_file.exists():
-            with open(prompt_file, "r", encoding="utf-8") as f:
-                prompt = f.read()
-                self._prompts[prompt_name] = prompt
-                return prompt
+        Args:
+            prompt_name: Name of the prompt (without extension)
         
-        # Return default prompt if file not found
-        logger.warning(f"Prompt file not found: {prompt_name}, using default")
-        return self._get_default_prompt(prompt_name)
+        Returns:
+            Prompt text
+        """
+        return self.get_template(prompt_name).text
     
     def format_prompt(self, prompt_name: str, **kwargs) -> str:
         """
@@ -64,16 +171,77 @@ class PromptLoader:
         Args:
             prompt_name: Name of the prompt
             **kwargs: Variables to format the prompt
-            
+        
         Returns:
             Formatted prompt text
+        
+        Raises:
+            PromptTemplateError: If the prompt is invalid or a variable is missing
         """
-        prompt_template = self.load_prompt(prompt_name)
-        try:
-            return prompt_template.format(**kwargs)
-        except KeyError as e:
-            logger.warning(f"Missing variable in prompt {prompt_name}: {e}")
-            return prompt_template
+        return self.get_template(prompt_name).render(**kwargs)
+    
+    def validate(self) -> Dict[str, Dict]:
+        """
+        Compile every known prompt, failing on the first invalid one (run at startup).
+        
+        Returns:
+            Prompt name -> template summary (source, variables, content hash)
+        
+        Raises:
+            PromptTemplateError: If a prompt is malformed or uses unknown variables
+        """
+        return {name: self.get_template(name).to_dict() for name in PROMPT_VARIABLES}
+    
+    def content_hash(self, *prompt_names: str) -> str:
+        """
+        Combined content hash of prompts, for cache keys.
+        
+        Args:
+            *prompt_names: Prompts to include (defaults to the scoring prompts)
+        
+        Returns:
+            Hash string that changes whenever one of the prompts is edited
+        """
+        return "-".join(self.get_template(name).content_hash for name in (prompt_names or SCORING_PROMPTS))
+    
+    def format_scoring_prompt(
+        self,
+        job_description: str,
+        must_have_requirements: str,
+        resume_text: str,
+        candidate_name: str,
+        candidate_skills: str,
+    ) -> Dict[str, str]:
+        """
+        Format the scoring prompt as a stable prefix and a per-candidate part.
+        
+        The system instructions and the JD part are the same for every
+        candidate scored against a JD, so providers can cache them.
+        
+        Args:
+            job_description: JD text
+            must_have_requirements: Must-haves, one per line
+            resume_text: Resume text
+            candidate_name: Candidate name
+            candidate_skills: Comma-separated skills
+        
+        Returns:
+            Dict with "system", "prefix" (JD) and "candidate" texts
+        """
+        return {
+            "system": self.format_prompt("scoring_system"),
+            "prefix": self.format_prompt(
+                "scoring_prefix",
+                job_description=job_description,
+                must_have_requirements=must_have_requirements,
+            ),
+            "candidate": self.format_prompt(
+                "scoring_candidate",
+                resume_text=resume_text,
+                candidate_name=candidate_name,
+                candidate_skills=candidate_skills,
+            ),
+        }
     
     def _get_default_prompt(self, prompt_name: str) -> str:
         """Get default prompt if file not found."""
@@ -109,6 +277,42 @@ Format your response as JSON:
         "requirement": "resume_section_reference"
     }}
 }}"""
+        elif prompt_name == "scoring_system":
+            return """You are an expert recruiter analyzing candidate resumes against a job description.
+
+The job description and its must-have requirements come first; the candidate to analyze follows.
+
+Please analyze and provide:
+1. Overall match score (0-100)
+2. Similarity score (0-100)
+3. Must-have requirements matched (list)
+4. Reason codes explaining the match
+5. Specific resume sections that match JD requirements
+
+Format your response as JSON:
+{{
+    "overall_score": <float>,
+    "similarity_score": <float>,
+    "must_have_matches": [<list>],
+    "reason_codes": [<list>],
+    "matched_sections": {{
+        "requirement": "resume_section_reference"
+    }}
+}}"""
+        elif prompt_name == "scoring_prefix":
+            return """Job Description:
+{job_description}
+
+Must-Have Requirements:
+{must_have_requirements}"""
+        elif prompt_name == "scoring_candidate":
+            return """Candidate Resume:
+{resume_text}
+
+Candidate Name: {candidate_name}
+Candidate Skills: {candidate_skills}
+
+Analyze this candidate against the job description above and reply with the JSON object only."""
         else:
             return "Please analyze the provided information."
 
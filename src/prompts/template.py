@@ -0,0 +1,96 @@
+"""Compiled prompt templates."""
+from pathlib import Path
+from string import Formatter
+from typing import Dict, FrozenSet, Optional
+import hashlib
+
+
+class PromptTemplateError(ValueError):
+    """Raised when a prompt template is malformed or cannot be rendered."""
+
+
+class CompiledTemplate:
+    """
+    A prompt template parsed once, with its variables known up front.
+
+    Rendering checks the supplied variables against the parsed set, so a
+    missing variable fails before anything is sent to the LLM instead of
+    producing a prompt with raw {placeholders} in it.
+    """
+
+    def __init__(self, name: str, text: str, path: Optional[Path] = None, mtime: Optional[float] = None):
+        """
+        Compile a template.
+
+        Args:
+            name: Prompt name
+            text: Template text in str.format syntax ({{ }} for literal braces)
+            path: File the template was read from (None for built-in defaults)
+            mtime: Modification time of the file when it was read
+
+        Raises:
+            PromptTemplateError: If the text is not a valid format string
+        """
+        self.name = name
+        self.text = text
+        self.path = path
+        self.mtime = mtime
+        self.variables: FrozenSet[str] = self._parse(name, text)
+        # Identifies the template content, e.g. as part of a cache key
+        self.content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _parse(name: str, text: str) -> FrozenSet[str]:
+        variables = set()
+        try:
+            for _, field_name, format_spec, _ in Formatter().parse(text):
+                if field_name is None:
+                    continue
+                root = field_name.split(".", 1)[0].split("[", 1)[0]
+                if not root or root.isdigit():
+                    raise PromptTemplateError(
+                        f"Prompt {name}: positional field {{{field_name}}} is not supported, use a named variable"
+                    )
+                if not root.isidentifier():
+                    # Usually literal JSON in the prompt, e.g. {"score": ...}
+                    raise PromptTemplateError(
+                        f"Prompt {name}: invalid field {{{field_name}}}; use {{{{ }}}} for literal braces"
+                    )
+                if format_spec and "{" in format_spec:
+                    raise PromptTemplateError(f"Prompt {name}: nested fields in {{{field_name}}} are not supported")
+                variables.add(root)
+        except ValueError as e:
+            if isinstance(e, PromptTemplateError):
+                raise
+            raise PromptTemplateError(f"Prompt {name}: invalid template ({e}); use {{{{ }}}} for literal braces") from e
+        return frozenset(variables)
+
+    def render(self, **kwargs) -> str:
+        """
+        Render the template.
+
+        Args:
+            **kwargs: Template variables (extra ones are ignored)
+
+        Returns:
+            Rendered prompt text
+
+        Raises:
+            PromptTemplateError: If a variable used by the template is missing
+        """
+        missing = self.variables.difference(kwargs)
+        if missing:
+            raise PromptTemplateError(f"Prompt {self.name}: missing variables {sorted(missing)}")
+        try:
+            return self.text.format_map(kwargs)
+        except (AttributeError, IndexError, KeyError, ValueError) as e:
+            raise PromptTemplateError(f"Prompt {self.name}: could not render ({e})") from e
+
+    def to_dict(self) -> Dict:
+        """Summary for status endpoints and logs."""
+        return {
+            "name": self.name,
+            "source": str(self.path) if self.path else "default",
+            "variables": sorted(self.variables),
+            "content_hash": self.content_hash,
+        }
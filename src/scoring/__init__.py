@@ -1,4 +1,5 @@
 """Scoring module."""
 from .hybrid_scorer import HybridScorer
+from .score_cache import ScoreCache, jd_content_hash
 
-__all__ = ["HybridScorer"]
+__all__ = ["HybridScorer", "ScoreCache", "jd_content_hash"]
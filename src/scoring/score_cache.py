@@ -0,0 +1,140 @@
+"""Disk cache of candidate scores keyed by resume content and job description."""
+from pathlib import Path
+from typing import Callable, Dict, Optional
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from src.config import config
+from src.monitoring import metrics
+
+logger = logging.getLogger(__name__)
+
+# Fields that identify a stored copy rather than the job description content
+_JD_VOLATILE_FIELDS = {"jd_id", "_metadata"}
+
+
+def jd_content_hash(jd_data: Dict) -> str:
+    """Hash of a job description's content, independent of jd_id and storage metadata."""
+    content = {key: value for key, value in jd_data.items() if key not in _JD_VOLATILE_FIELDS}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def scoring_signature() -> str:
+    """Settings that change a score; cached entries from other settings are not reused."""
+    return json.dumps({
+        "providers": config.llm_provider_chain,
+        "models": [config.openai_model, config.gemini_model, config.anthropic_model, config.ollama_model],
+        "weights": [config.similarity_weight, config.must_have_boost_weight, config.recency_boost_weight],
+    }, sort_keys=True)
+
+
+class _InFlight:
+    """Lock serializing computations of one key, with the number of threads using it."""
+
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+class ScoreCache:
+    """Reuse scores for resume/JD pairs that were already scored, with single-flight computation."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, enabled: Optional[bool] = None, ttl: Optional[int] = None):
+        """
+        Initialize score cache.
+
+        Args:
+            cache_dir: Directory for cached scores (defaults to cache_path/scores)
+            enabled: Whether to cache (defaults to ENABLE_CACHE and CACHE_SCORES)
+            ttl: Entry lifetime in seconds (defaults to config.cache_ttl)
+        """
+        self.cache_dir = Path(cache_dir or Path(config.cache_path) / "scores")
+        self.enabled = (config.enable_cache and config.cache_scores) if enabled is None else enabled
+        self.ttl = config.cache_ttl if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _InFlight] = {}
+
+    def key(self, resume_hash: str, jd_hash: str, prompt_hash: str = "") -> str:
+        """Cache key for a resume/JD pair under the current scoring settings (and prompt version)."""
+        return hashlib.sha256(
+            f"{resume_hash}|{jd_hash}|{scoring_signature()}|{prompt_hash}".encode("utf-8")
+        ).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached score for a key, if present and not expired."""
+        path = self._path(key)
+        if not self.enabled or not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read cached score {path.name}: {e}")
+            return None
+        if self.ttl and time.time() - entry.get("cached_at", 0) > self.ttl:
+            return None
+        return entry["result"]
+
+    def set(self, key: str, result: Dict):
+        """Store a score."""
+        if not self.enabled:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path(key).with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"cached_at": time.time(), "result": result}, f, ensure_ascii=False)
+            tmp_path.replace(self._path(key))
+        except Exception as e:
+            logger.error(f"Could not cache score: {e}")
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Dict],
+        should_cache: Optional[Callable[[Dict], bool]] = None,
+    ) -> Dict:
+        """
+        Return the cached score or compute it once, even when duplicates are scored concurrently.
+
+        Args:
+            key: Cache key (see key())
+            compute: Produces the score when it is not cached
+            should_cache: Predicate deciding whether a computed score may be stored
+
+        Returns:
+            Score result (a copy tagged with `cached` when it came from the cache)
+        """
+        if not self.enabled:
+            return compute()
+
+        with self._lock:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = self._inflight[key] = _InFlight()
+            inflight.users += 1
+
+        try:
+            with inflight.lock:
+                cached = self.get(key)
+                metrics.record_cache("scores", hit=cached is not None)
+                if cached is not None:
+                    return {**cached, "cached": True}
+                result = compute()
+                if should_cache is None or should_cache(result):
+                    self.set(key, result)
+        finally:
+            # The last thread out drops the entry, so later callers cannot get a second lock while one is held
+            with self._lock:
+                inflight.users -= 1
+                if inflight.users == 0 and self._inflight.get(key) is inflight:
+                    del self._inflight[key]
+        return result
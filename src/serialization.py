@@ -0,0 +1,83 @@
+"""JSON serialization for storage, result logs and API responses (orjson when available)."""
+from pathlib import Path
+from typing import Any, Union
+import json
+import logging
+
+from src.config import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _select_backend(name: str) -> str:
+    name = name.lower()
+    if name not in ("auto", "orjson", "stdlib"):
+        raise ValueError(f"Invalid JSON_BACKEND: {name} (use auto, orjson or stdlib)")
+    if name == "stdlib" or orjson is None:
+        if name == "orjson":
+            logger.warning("JSON_BACKEND=orjson but orjson is not installed; using the json module")
+        return "stdlib"
+    return "orjson"
+
+
+BACKEND = _select_backend(config.json_backend)
+
+if orjson is not None:
+    # Non-string keys and numpy values serialize like they would after conversion with the json module
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 JSON.
+
+    Args:
+        obj: JSON-serializable object
+        pretty: Indent by 2 spaces (else compact)
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if BACKEND == "orjson":
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if pretty else 0))
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse JSON.
+
+    Raises:
+        JSONDecodeError: If the data is not valid JSON
+    """
+    if BACKEND == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: Union[str, Path]) -> Any:
+    """Read a JSON file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_json(path: Union[str, Path], obj: Any, pretty: bool = None):
+    """
+    Write a JSON file.
+
+    Args:
+        path: File path
+        obj: JSON-serializable object
+        pretty: Indent the file (defaults to not STORAGE_JSON_COMPACT)
+    """
+    if pretty is None:
+        pretty = not config.storage_json_compact
+    with open(path, "wb") as f:
+        f.write(dumps(obj, pretty=pretty))
@@ -2,10 +2,11 @@
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import hashlib
 
 from src.config import config
+from src.monitoring import metrics
 from src.pdf_processing import PDFExtractor, PDFValidator
 from src.preprocessing import ResumeParser, JDParser
 from src.storage import LocalStorage
@@ -16,13 +17,21 @@ logger = logging.getLogger(__name__)
 class AutoProcessor:
     """Automatically process raw files on startup."""
     
-    def __init__(self):
-        """Initialize auto processor."""
+    def __init__(self, storage: Optional[LocalStorage] = None):
+        """
+        Initialize auto processor.
+        
+        Args:
+            storage: Storage to save into (share the app's instance so its indexes stay current)
+        """
         self.pdf_extractor = PDFExtractor(require_pdfplumber=False)
         self.pdf_validator = PDFValidator()
         self.resume_parser = ResumeParser()
         self.jd_parser = JDParser()
-        self.storage = LocalStorage()
+        self.storage = storage or LocalStorage()
+        
+        # Resumes collapsed onto an existing stored copy
+        self.duplicates = 0
         
         # Track processed files
         self.processed_tracking_file = Path(config.cache_path) / "processed_files.json"
@@ -65,7 +74,9 @@ class AutoProcessor:
         
         # Check if file hash matches (detects changes)
         current_hash = self._get_file_hash(file_path)
-        return self.processed_files.get(file_key) == current_hash
+        is_processed = self.processed_files.get(file_key) == current_hash
+        metrics.record_cache("processed_files", hit=is_processed)
+        return is_processed
     
     def _mark_file_processed(self, file_path: Path):
         """Mark file as processed."""
@@ -80,6 +91,13 @@ class AutoProcessor:
             files.extend(directory.glob(f"*{ext}"))
         return sorted(files)
     
+    def _save_resume(self, resume_data: Dict, file_path: Path):
+        """Store a parsed resume, collapsing it onto an existing copy when the content matches."""
+        _, duplicate = self.storage.save_resume_unique(resume_data)
+        if duplicate:
+            self.duplicates += 1
+            logger.info(f"⊙ Duplicate of candidate {resume_data['candidate_id']}: {file_path.name}")
+    
     def _process_resume_file(self, file_path: Path) -> Tuple[bool, str]:
         """
         Process a single resume file.
@@ -105,7 +123,7 @@ class AutoProcessor:
                     return False, error
                 # Parse JSON directly
                 resume_data = self.resume_parser.parse_from_json(file_path)
-                self.storage.save_resume(resume_data)
+                self._save_resume(resume_data, file_path)
                 return True, ""
                 
             elif self.pdf_validator.is_txt(file_path):
@@ -123,7 +141,7 @@ class AutoProcessor:
             resume_data = self.resume_parser.parse_from_text(text)
             
             # Save to storage
-            self.storage.save_resume(resume_data)
+            self._save_resume(resume_data, file_path)
             
             logger.info(f"✓ Successfully processed resume: {file_path.name}")
             return True, ""
@@ -208,7 +226,9 @@ class AutoProcessor:
             "processed": 0,
             "skipped": 0,
             "failed": 0,
+            "duplicates": 0,
         }
+        duplicates_before = self.duplicates
         
         for file_path in resume_files:
             # Skip if already processed
@@ -229,11 +249,13 @@ class AutoProcessor:
         
         # Save tracking
         self._save_processed_files()
+        stats["duplicates"] = self.duplicates - duplicates_before
         
         logger.info("=" * 60)
         logger.info(f"Resume processing complete:")
         logger.info(f"  Total files: {stats['total']}")
         logger.info(f"  Processed: {stats['processed']}")
+        logger.info(f"  Duplicates: {stats['duplicates']}")
         logger.info(f"  Skipped: {stats['skipped']}")
         logger.info(f"  Failed: {stats['failed']}")
         logger.info("=" * 60)
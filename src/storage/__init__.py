@@ -1,4 +1,21 @@
 """Storage module."""
-from .local_storage import LocalStorage
+from .local_storage import JD_SUMMARY_FIELDS, LocalStorage
+from .resume_index import RESUME_SUMMARY_FIELDS, ResumeIndex, resume_content_hash, resume_fingerprint
+from .minhash import MinHasher, NearDuplicateIndex
+from .job_checkpoint import JobCheckpoint
+from .result_log import ResultLog, ResultLogWriter, ResultStore
 
-__all__ = ["LocalStorage"]
+__all__ = [
+    "LocalStorage",
+    "JD_SUMMARY_FIELDS",
+    "RESUME_SUMMARY_FIELDS",
+    "ResumeIndex",
+    "resume_content_hash",
+    "resume_fingerprint",
+    "MinHasher",
+    "NearDuplicateIndex",
+    "JobCheckpoint",
+    "ResultLog",
+    "ResultLogWriter",
+    "ResultStore",
+]
@@ -0,0 +1,191 @@
+"""Append-only checkpoints of ranking jobs, so interrupted jobs can be resumed."""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+import logging
+import os
+import threading
+import time
+
+from src import serialization
+
+logger = logging.getLogger(__name__)
+
+# Seconds between fsyncs of a checkpoint (every line is flushed to the OS immediately)
+FSYNC_INTERVAL = 5.0
+
+
+class JobCheckpoint:
+    """
+    One JSONL file per job: a header with the job parameters, then one line
+    per finished candidate, then the final status.
+
+    Lines are only ever appended, so a crash can at most cut off the last
+    line, which is skipped on load. Resuming the job re-scores only the
+    candidates without a line, i.e. the ones in flight at the crash.
+    """
+
+    def __init__(self, path: Path, params: Dict, completed: Optional[Set[str]] = None, status: str = "running"):
+        """
+        Initialize checkpoint (use create() or load()).
+
+        Args:
+            path: JSONL file of the job
+            params: Job parameters from the header line
+            completed: Resume files of the candidates already scored
+            status: Last recorded status
+        """
+        self.path = Path(path)
+        self.params = params
+        self.completed: Set[str] = completed or set()
+        self.status = status
+        self._lock = threading.Lock()
+        self._file = None
+        self._last_sync = time.monotonic()
+
+    @property
+    def job_id(self) -> str:
+        return self.params["job_id"]
+
+    @classmethod
+    def create(cls, jobs_dir: Path, job_id: str, params: Dict) -> "JobCheckpoint":
+        """
+        Start the checkpoint of a new job.
+
+        Args:
+            jobs_dir: Directory holding job checkpoints
+            job_id: Job id (file name)
+            params: Parameters needed to run the job again (JSON-serializable)
+
+        Returns:
+            Checkpoint
+        """
+        params = {**params, "job_id": job_id, "created_at": datetime.now().isoformat()}
+        checkpoint = cls(Path(jobs_dir) / f"{job_id}.jsonl", params)
+        checkpoint.path.parent.mkdir(parents=True, exist_ok=True)
+        checkpoint._append({"type": "job", **params}, sync=True)
+        return checkpoint
+
+    @classmethod
+    def load(cls, jobs_dir: Path, job_id: str) -> "JobCheckpoint":
+        """
+        Read a job's checkpoint.
+
+        Args:
+            jobs_dir: Directory holding job checkpoints
+            job_id: Job id
+
+        Returns:
+            Checkpoint with the job parameters and completed resume files
+
+        Raises:
+            FileNotFoundError: If the job has no checkpoint
+            ValueError: If the checkpoint has no header
+        """
+        path = Path(jobs_dir) / f"{Path(job_id).name}.jsonl"
+        params = None
+        completed = set()
+        status = "running"
+        for kind, entry in cls._read_entries(path):
+            if kind == "job":
+                params = entry
+            elif kind == "result":
+                completed.add(entry["resume_file"])
+            elif kind == "status":
+                status = entry["status"]
+        if params is None:
+            raise ValueError(f"Checkpoint {path.name} has no job header")
+        return cls(path, params, completed, status)
+
+    @staticmethod
+    def _read_entries(path: Path) -> Iterator:
+        with open(path, "rb") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = serialization.loads(line)
+                except ValueError:
+                    # Last line cut off by a crash
+                    logger.warning(f"Skipping unreadable line {line_number} of {path.name}")
+                    continue
+                yield entry.pop("type", None), entry
+
+    def iter_results(self) -> Iterator[Dict]:
+        """Results recorded so far, read back from the file (not held in memory)."""
+        for kind, entry in self._read_entries(self.path):
+            if kind == "result":
+                yield entry["result"]
+
+    @staticmethod
+    def list_jobs(jobs_dir: Path) -> List[Dict]:
+        """Summaries of the checkpointed jobs, newest first."""
+        jobs = []
+        for path in sorted(Path(jobs_dir).glob("*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True):
+            try:
+                checkpoint = JobCheckpoint.load(jobs_dir, path.stem)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping checkpoint {path.name}: {e}")
+                continue
+            jobs.append(checkpoint.summary())
+        return jobs
+
+    def summary(self) -> Dict:
+        """Job id, status and progress."""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "jd_id": self.params.get("jd_id"),
+            "scoring_mode": self.params.get("scoring_mode"),
+            "created_at": self.params.get("created_at"),
+            "total": len(self.params.get("resume_files", [])),
+            "completed": len(self.completed),
+        }
+
+    def pending(self) -> List[str]:
+        """Resume files of the job without a recorded result, in the original order."""
+        return [resume_file for resume_file in self.params.get("resume_files", []) if resume_file not in self.completed]
+
+    def record(self, resume_file: str, result: Dict):
+        """Append one finished candidate."""
+        self.completed.add(resume_file)
+        self._append({"type": "result", "resume_file": resume_file, "result": result})
+
+    def finish(self, status: str):
+        """Append the final status ("completed", "cancelled" or "error") and close the file."""
+        self.status = status
+        self._append({"type": "status", "status": status, "at": datetime.now().isoformat()}, sync=True)
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _drop_torn_line(self):
+        """Truncate a last line cut off by a crash, so the next entry starts on its own line."""
+        with open(self.path, "r+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            keep = 0
+            position = end
+            while position > 0:
+                start = max(0, position - 64 * 1024)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b"\n")
+                if newline >= 0:
+                    keep = start + newline + 1
+                    break
+                position = start
+            if keep < end:
+                logger.warning(f"Dropping {end - keep} bytes of an unfinished line at the end of {self.path.name}")
+                f.truncate(keep)
+
+    def _append(self, entry: Dict, sync: bool = False):
+        line = serialization.dumps(entry) + b"\n"
+        with self._lock:
+            if self._file is None:
+                if self.path.exists():
+                    self._drop_torn_line()
+                self._file = open(self.path, "ab")
+            self._file.write(line)
+            self._file.flush()
+            now = time.monotonic()
+            if sync or now - self._last_sync >= FSYNC_INTERVAL:
+                os.fsync(self._file.fileno())
+                self._last_sync = now
@@ -1,16 +1,24 @@
 """Local filesystem storage implementation."""
-import json
 import uuid
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 import logging
+import os
+import threading
+import time
 
 from .storage_client import StorageClient
+from .resume_index import RESUME_SUMMARY_FIELDS, ResumeIndex, resume_content_hash
+from .minhash import NearDuplicateIndex
 from src.config import config
+from src.serialization import read_json, write_json
 
 logger = logging.getLogger(__name__)
 
+# Fields of a stored JD served from the summary cache by list views
+JD_SUMMARY_FIELDS = ("file_id", "jd_id", "title", "experience_years_required", "saved_at")
+
 
 class LocalStorage(StorageClient):
     """Local filesystem storage implementation."""
@@ -29,30 +37,162 @@ class LocalStorage(StorageClient):
         # Create directories
         self.resumes_dir.mkdir(parents=True, exist_ok=True)
         self.jds_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Serializes duplicate lookup + write so concurrent ingests of one resume store it once
+        self._resume_lock = threading.RLock()
+        
+        # Content-hash index (kept outside resumes_dir so listings ignore it)
+        self.resume_index = ResumeIndex(
+            self.base_path / "resume_index.jsonl",
+            use_fingerprint=config.resume_dedup_fingerprint,
+        )
+        # MinHash/LSH index grouping near-identical versions of a CV
+        self.near_duplicates = NearDuplicateIndex(
+            self.base_path / "minhash_index.jsonl",
+            threshold=config.near_duplicate_threshold,
+        )
+        if not self.resume_index.loaded or not self.near_duplicates.loaded:
+            self._rebuild_resume_indexes()
+        
+        # Callbacks (event, filename, resume_data) for "saved"/"deleted" resumes
+        self._resume_listeners: List[Callable[[str, str, Optional[Dict]], None]] = []
+        
+        # JD list summaries by file name, with the file's mtime when they were read
+        self._jd_summaries: Dict[str, Tuple[int, Dict]] = {}
+        self._jd_summaries_lock = threading.Lock()
+        
+        # Revision counters of the stored lists (for HTTP ETags); the instance id tells restarts apart
+        self._instance_id = uuid.uuid4().hex[:8]
+        self._revisions = {"resume": 0, "jd": 0}
+        # Resume directory mtime and time of the last full resume scan (see _sync_resume_index)
+        self._resumes_dir_mtime: Optional[int] = None
+        self._resumes_synced_at = 0.0
+    
+    def add_resume_listener(self, listener: Callable[[str, str, Optional[Dict]], None]):
+        """
+        Register a callback for stored resume changes (used to keep derived indexes current).
+        
+        Args:
+            listener: Called with ("saved", filename, resume_data) or ("deleted", filename, None)
+        """
+        self._resume_listeners.append(listener)
+    
+    def _notify_resume_listeners(self, event: str, filename: str, resume_data: Optional[Dict] = None):
+        for listener in self._resume_listeners:
+            try:
+                listener(event, filename, resume_data)
+            except Exception as e:
+                logger.error(f"Resume listener failed on {event} {filename}: {e}")
+    
+    def _rebuild_resume_indexes(self):
+        """Index resumes that were stored before the indexes existed."""
+        entries = []
+        for json_file in self.resumes_dir.glob("*.json"):
+            try:
+                data = read_json(json_file)
+                entries.append({"filename": json_file.name, "data": data, "mtime": json_file.stat().st_mtime_ns})
+            except Exception as e:
+                logger.warning(f"Error reading resume {json_file}: {e}")
+        
+        entries.sort(key=lambda entry: entry["data"].get("_metadata", {}).get("saved_at", ""))
+        if not self.resume_index.loaded:
+            self.resume_index.rebuild(entries)
+        if not self.near_duplicates.loaded:
+            self.near_duplicates.rebuild(entries)
+        logger.info(f"Indexed {len(entries)} stored resumes")
     
     def save_resume(self, resume_data: Dict, filename: Optional[str] = None) -> str:
-        """Save resume JSON to storage."""
-        if not filename:
-            candidate_id = resume_data.get("candidate_id", str(uuid.uuid4()))
-            filename = f"resume_{candidate_id}.json"
+        """Save resume JSON to storage (duplicates resolve to the stored copy)."""
+        file_path, _ = self.save_resume_unique(resume_data, filename)
+        return file_path
+    
+    def save_resume_unique(self, resume_data: Dict, filename: Optional[str] = None) -> Tuple[str, bool]:
+        """
+        Save resume JSON unless the same content is already stored.
         
-        file_path = self.resumes_dir / filename
+        On a duplicate, `resume_data` takes over the stored candidate_id and
+        metadata so callers keep referring to the existing candidate.
         
-        # Ensure candidate_id exists
+        Args:
+            resume_data: Structured resume JSON
+            filename: Optional file name
+            
+        Returns:
+            Tuple of (stored file path, whether it was a duplicate)
+        """
+        with self._resume_lock:
+            return self._save_resume_unique(resume_data, filename)
+    
+    def _save_resume_unique(self, resume_data: Dict, filename: Optional[str]) -> Tuple[str, bool]:
+        """Duplicate check and write (caller holds the resume lock)."""
+        existing = self.resume_index.find(resume_data)
+        while existing and not (self.resumes_dir / existing["filename"]).exists():
+            # Stored copy was removed outside the API (another copy may take over)
+            self._forget_resume(existing["filename"])
+            existing = self.resume_index.find(resume_data)
+        if existing:
+            existing_path = self.resumes_dir / existing["filename"]
+            stored = read_json(existing_path)
+            resume_data["candidate_id"] = stored.get("candidate_id", existing["candidate_id"])
+            resume_data["_metadata"] = stored.get("_metadata", {})
+            logger.info(f"Duplicate resume, reusing {existing_path} ({resume_data['candidate_id']})")
+            return str(existing_path), True
+        
+        # Ensure candidate_id exists (and matches the generated file name)
         if "candidate_id" not in resume_data:
             resume_data["candidate_id"] = str(uuid.uuid4())
         
+        if not filename:
+            filename = f"resume_{resume_data['candidate_id']}.json"
+        
+        file_path = self.resumes_dir / filename
+        
         # Add metadata
         resume_data["_metadata"] = {
             "saved_at": datetime.now().isoformat(),
             "filename": filename,
+            "content_hash": resume_content_hash(resume_data),
         }
         
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(resume_data, f, indent=2, ensure_ascii=False)
+        write_json(file_path, resume_data)
+        
+        self.resume_index.add(resume_data, filename, file_path.stat().st_mtime_ns)
+        self.near_duplicates.add(filename, resume_data)
+        self._revisions["resume"] += 1
+        self._resumes_dir_mtime = os.stat(self.resumes_dir).st_mtime_ns
+        self._notify_resume_listeners("saved", filename, resume_data)
         
         logger.info(f"Saved resume to {file_path}")
-        return str(file_path)
+        return str(file_path), False
+    
+    def similar_resumes(self, file_id: str) -> List[Dict]:
+        """Near-duplicate versions of a stored resume (file_id is the file name)."""
+        return self.near_duplicates.similar(file_id)
+    
+    def resume_clusters(self, min_size: int = 2) -> List[Dict]:
+        """
+        Group stored resumes into near-duplicate clusters.
+        
+        Args:
+            min_size: Smallest cluster to return (1 includes singletons)
+            
+        Returns:
+            Clusters with members sorted newest first
+        """
+        return self.near_duplicates.clusters(min_size)
+    
+    def latest_resume_files(self, file_paths: List[str]) -> List[str]:
+        """
+        Drop superseded versions: keep only the newest stored file per near-duplicate cluster.
+        
+        Args:
+            file_paths: Stored resume file paths
+            
+        Returns:
+            Filtered file paths, in input order
+        """
+        latest = set(self.near_duplicates.latest_per_cluster(Path(path).name for path in file_paths))
+        return [path for path in file_paths if Path(path).name in latest]
     
     def save_jd(self, jd_data: Dict, filename: Optional[str] = None) -> str:
         """Save job description JSON to storage."""
@@ -72,8 +212,7 @@ class LocalStorage(StorageClient):
             "filename": filename,
         }
         
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(jd_data, f, indent=2, ensure_ascii=False)
+        write_json(file_path, jd_data)
         
         logger.info(f"Saved JD to {file_path}")
         return str(file_path)
@@ -83,21 +222,24 @@ class LocalStorage(StorageClient):
         # file_id can be filename or candidate_id
         file_path = self.resumes_dir / file_id
         if not file_path.exists():
-            # Try to find by candidate_id
+            # Look up the candidate's file in the resume index
+            filename = self.resume_index.filename_for(file_id)
+            if filename and (self.resumes_dir / filename).exists():
+                file_path = self.resumes_dir / filename
+        if not file_path.exists():
+            # Files written outside the API are not indexed: scan them
             for json_file in self.resumes_dir.glob("*.json"):
                 try:
-                    with open(json_file, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        if data.get("candidate_id") == file_id:
-                            return data
+                    data = read_json(json_file)
+                    if data.get("candidate_id") == file_id:
+                        return data
                 except Exception:
                     continue
         
         if not file_path.exists():
             raise FileNotFoundError(f"Resume not found: {file_id}")
         
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_json(file_path)
     
     def get_jd(self, file_id: str) -> Dict:
         """Retrieve job description JSON from storage."""
@@ -106,56 +248,200 @@ class LocalStorage(StorageClient):
             # Try to find by jd_id
             for json_file in self.jds_dir.glob("*.json"):
                 try:
-                    with open(json_file, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        if data.get("jd_id") == file_id:
-                            return data
+                    data = read_json(json_file)
+                    if data.get("jd_id") == file_id:
+                        return data
                 except Exception:
                     continue
         
         if not file_path.exists():
             raise FileNotFoundError(f"Job description not found: {file_id}")
         
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_json(file_path)
     
     def list_resumes(self) -> List[Dict]:
-        """List all stored resumes."""
-        resumes = []
+        """List all stored resumes (summaries from the resume index, newest first)."""
+        self._sync_resume_index()
+        return self.resume_index.summaries()
+    
+    def _sync_resume_index(self, force: bool = True):
+        """
+        Index resume files added, changed or removed outside the API (by name and mtime).
         
-        for json_file in self.resumes_dir.glob("*.json"):
+        Args:
+            force: Always scan; otherwise only when the directory mtime changed
+                (files added or removed) or STORAGE_SYNC_INTERVAL has passed
+                (files edited in place)
+        """
+        if not force and (
+            os.stat(self.resumes_dir).st_mtime_ns == self._resumes_dir_mtime
+            and time.monotonic() - self._resumes_synced_at < config.storage_sync_interval
+        ):
+            return
+        with self._resume_lock:
+            dir_mtime = os.stat(self.resumes_dir).st_mtime_ns
+            synced_at = time.monotonic()
+            on_disk = {
+                entry.name: entry.stat().st_mtime_ns
+                for entry in os.scandir(self.resumes_dir)
+                if entry.name.endswith(".json") and entry.is_file()
+            }
+            indexed = self.resume_index.mtimes()
+            changed = False
+            
+            for filename in indexed.keys() - on_disk.keys():
+                self._forget_resume(filename)
+                changed = True
+            
+            for filename, mtime in on_disk.items():
+                if filename in indexed and indexed[filename] == mtime:
+                    continue
+                try:
+                    data = read_json(self.resumes_dir / filename)
+                except Exception as e:
+                    logger.warning(f"Error reading resume {filename}: {e}")
+                    continue
+                if filename in indexed:
+                    self._forget_resume(filename)
+                # Exact copies of a stored resume are listed but not indexed for search again
+                existing = self.resume_index.find(data)
+                self.resume_index.add(data, filename, mtime)
+                self.near_duplicates.add(filename, data)
+                if existing is None:
+                    self._notify_resume_listeners("saved", filename, data)
+                changed = True
+            
+            if changed:
+                self._revisions["resume"] += 1
+            self._resumes_dir_mtime = dir_mtime
+            self._resumes_synced_at = synced_at
+    
+    def _forget_resume(self, filename: str):
+        """Drop a removed resume file from the indexes (caller holds the resume lock)."""
+        promoted = self.resume_index.remove(filename)
+        self.near_duplicates.remove(filename)
+        self._notify_resume_listeners("deleted", filename)
+        if promoted:
+            # A copy of the same content now stands for it
             try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    resumes.append({
-                        "file_id": json_file.name,
-                        "candidate_id": data.get("candidate_id"),
-                        "name": data.get("name", "Unknown"),
-                        "saved_at": data.get("_metadata", {}).get("saved_at"),
-                    })
+                self._notify_resume_listeners("saved", promoted, read_json(self.resumes_dir / promoted))
             except Exception as e:
-                logger.warning(f"Error reading resume {json_file}: {e}")
+                logger.warning(f"Error reading resume {promoted}: {e}")
+    
+    def revision(self, file_type: str) -> str:
+        """
+        Version of a stored list, changing whenever a file is added, changed or removed.
         
-        return sorted(resumes, key=lambda x: x.get("saved_at", ""), reverse=True)
+        Args:
+            file_type: "resume" or "jd"
+            
+        Returns:
+            Revision string (unique across restarts)
+        """
+        # Stored files may be edited outside the API: look at their mtimes (resumes only when cheap)
+        if file_type == "jd":
+            self._refresh_jd_summaries()
+        elif file_type == "resume":
+            self._sync_resume_index(force=False)
+        else:
+            raise ValueError(f"Invalid file_type: {file_type}")
+        return f"{self._instance_id}.{self._revisions[file_type]}"
     
     def list_jds(self) -> List[Dict]:
-        """List all stored job descriptions."""
-        jds = []
-        
-        for json_file in self.jds_dir.glob("*.json"):
-            try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    jds.append({
-                        "file_id": json_file.name,
+        """List all stored job descriptions (newest first; files are only parsed when they change)."""
+        summaries = self._refresh_jd_summaries()
+        jds = [dict(summary) for _, summary in summaries.values()]
+        return sorted(jds, key=lambda x: x.get("saved_at") or "", reverse=True)
+    
+    def _refresh_jd_summaries(self) -> Dict[str, Tuple[int, Dict]]:
+        """Re-read the JD files whose mtime changed; bumps the JD revision on any change."""
+        with self._jd_summaries_lock:
+            summaries = {}
+            for entry in os.scandir(self.jds_dir):
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                mtime = entry.stat().st_mtime_ns
+                cached = self._jd_summaries.get(entry.name)
+                if cached is None or cached[0] != mtime:
+                    try:
+                        data = read_json(entry.path)
+                    except Exception as e:
+                        logger.warning(f"Error reading JD {entry.path}: {e}")
+                        continue
+                    cached = (mtime, {
+                        "file_id": entry.name,
                         "jd_id": data.get("jd_id"),
                         "title": data.get("title", "Unknown"),
+                        "experience_years_required": data.get("experience_years_required"),
                         "saved_at": data.get("_metadata", {}).get("saved_at"),
                     })
-            except Exception as e:
-                logger.warning(f"Error reading JD {json_file}: {e}")
+                summaries[entry.name] = cached
+            if summaries.keys() != self._jd_summaries.keys() or any(
+                cached is not self._jd_summaries.get(name) for name, cached in summaries.items()
+            ):
+                self._revisions["jd"] += 1
+            self._jd_summaries = summaries
+            return summaries
+    
+    def page_resumes(
+        self, fields: Optional[Sequence[str]] = None, offset: int = 0, limit: Optional[int] = None
+    ) -> Tuple[List[Dict], int]:
+        """
+        A page of stored resumes, newest first, optionally projected to some fields.
+        
+        Pages of summary fields (RESUME_SUMMARY_FIELDS) come from the index
+        alone; other fields read just the files of the page.
+        
+        Args:
+            fields: Fields to return (all fields of the stored resume when None)
+            offset: Number of resumes to skip
+            limit: Maximum number of resumes (all remaining when None)
+            
+        Returns:
+            Tuple of (resumes, total number of stored resumes)
+        """
+        return self._page(self.list_resumes(), self.resumes_dir, RESUME_SUMMARY_FIELDS, fields, offset, limit)
+    
+    def page_jds(
+        self, fields: Optional[Sequence[str]] = None, offset: int = 0, limit: Optional[int] = None
+    ) -> Tuple[List[Dict], int]:
+        """
+        A page of stored job descriptions, newest first, optionally projected to some fields.
+        
+        Args:
+            fields: Fields to return (all fields of the stored JD when None)
+            offset: Number of JDs to skip
+            limit: Maximum number of JDs (all remaining when None)
+            
+        Returns:
+            Tuple of (job descriptions, total number of stored JDs)
+        """
+        return self._page(self.list_jds(), self.jds_dir, JD_SUMMARY_FIELDS, fields, offset, limit)
+    
+    @staticmethod
+    def _page(
+        summaries: List[Dict],
+        directory: Path,
+        summary_fields: Sequence[str],
+        fields: Optional[Sequence[str]],
+        offset: int,
+        limit: Optional[int],
+    ) -> Tuple[List[Dict], int]:
+        page = summaries[offset:offset + limit if limit is not None else None]
+        if fields and set(fields) <= set(summary_fields):
+            return [{field: summary.get(field) for field in fields} for summary in page], len(summaries)
         
-        return sorted(jds, key=lambda x: x.get("saved_at", ""), reverse=True)
+        items = []
+        for summary in page:
+            try:
+                data = read_json(directory / summary["file_id"])
+            except Exception as e:
+                logger.warning(f"Error reading {summary['file_id']}: {e}")
+                continue
+            if fields:
+                data = {field: data.get(field, summary.get(field)) for field in fields}
+            items.append(data)
+        return items, len(summaries)
     
     def search(self, query: str, file_type: Optional[str] = None) -> List[Dict]:
         """Search stored files."""
@@ -165,32 +451,30 @@ class LocalStorage(StorageClient):
         if file_type in [None, "resume"]:
             for json_file in self.resumes_dir.glob("*.json"):
                 try:
-                    with open(json_file, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        searchable_text = f"{data.get('name', '')} {data.get('raw_text', '')}".lower()
-                        if query_lower in searchable_text:
-                            results.append({
-                                "file_id": json_file.name,
-                                "type": "resume",
-                                "candidate_id": data.get("candidate_id"),
-                                "name": data.get("name", "Unknown"),
-                            })
+                    data = read_json(json_file)
+                    searchable_text = f"{data.get('name', '')} {data.get('raw_text', '')}".lower()
+                    if query_lower in searchable_text:
+                        results.append({
+                            "file_id": json_file.name,
+                            "type": "resume",
+                            "candidate_id": data.get("candidate_id"),
+                            "name": data.get("name", "Unknown"),
+                        })
                 except Exception:
                     continue
         
         if file_type in [None, "jd"]:
             for json_file in self.jds_dir.glob("*.json"):
                 try:
-                    with open(json_file, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        searchable_text = f"{data.get('title', '')} {data.get('description', '')}".lower()
-                        if query_lower in searchable_text:
-                            results.append({
-                                "file_id": json_file.name,
-                                "type": "jd",
-                                "jd_id": data.get("jd_id"),
-                                "title": data.get("title", "Unknown"),
-                            })
+                    data = read_json(json_file)
+                    searchable_text = f"{data.get('title', '')} {data.get('description', '')}".lower()
+                    if query_lower in searchable_text:
+                        results.append({
+                            "file_id": json_file.name,
+                            "type": "jd",
+                            "jd_id": data.get("jd_id"),
+                            "title": data.get("title", "Unknown"),
+                        })
                 except Exception:
                     continue
         
@@ -207,6 +491,11 @@ class LocalStorage(StorageClient):
         
         if file_path.exists():
             file_path.unlink()
+            if file_type == "resume":
+                with self._resume_lock:
+                    self._forget_resume(file_id)
+                    self._revisions["resume"] += 1
+                    self._resumes_dir_mtime = os.stat(self.resumes_dir).st_mtime_ns
             logger.info(f"Deleted {file_type}: {file_id}")
             return True
         
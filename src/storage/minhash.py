@@ -0,0 +1,321 @@
+"""MinHash signatures and LSH banding for near-duplicate resume detection."""
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+import base64
+import hashlib
+import json
+import logging
+import threading
+
+import numpy as np
+
+from .resume_index import normalize_text, resume_text
+
+logger = logging.getLogger(__name__)
+
+_LOW32_MASK = np.uint64((1 << 32) - 1)
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Word shingles of the normalized text (the whole text when it is shorter than one shingle)."""
+    words = normalize_text(text).split()
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """Compute fixed-length MinHash signatures with seeded hash permutations."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        """
+        Initialize MinHasher.
+
+        Args:
+            num_perm: Signature length
+            seed: Seed for the permutation parameters (must match across runs)
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        # Odd multipliers keep the multiply-xorshift mix a bijection on uint64
+        self._masks = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._multipliers = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+
+    def signature(self, tokens: Iterable[str]) -> np.ndarray:
+        """
+        MinHash signature of a set of shingles.
+
+        Args:
+            tokens: Shingles
+
+        Returns:
+            uint32 array of length num_perm (all max values for an empty set)
+        """
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little") for token in tokens),
+            dtype=np.uint64,
+        )
+        if hashes.size == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+
+        with np.errstate(over="ignore"):
+            mixed = (hashes[:, None] ^ self._masks[None, :]) * self._multipliers[None, :]
+        mixed ^= mixed >> np.uint64(29)
+        return ((mixed >> np.uint64(32)) & _LOW32_MASK).min(axis=0).astype(np.uint32)
+
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+class NearDuplicateIndex:
+    """
+    LSH index over resume MinHash signatures, persisted as an append-only JSONL log.
+
+    Signatures are split into bands; resumes sharing any band are candidate
+    pairs, which are confirmed when their estimated similarity reaches the
+    threshold. Confirmed pairs are grouped into clusters (versions of the
+    same candidate's CV).
+    """
+
+    def __init__(
+        self,
+        log_path: Path,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 3,
+    ):
+        """
+        Initialize near-duplicate index.
+
+        Args:
+            log_path: JSONL file holding signatures
+            threshold: Minimum estimated Jaccard similarity for near-duplicates
+            num_perm: Signature length
+            bands: LSH bands (num_perm must be divisible by bands)
+            shingle_size: Words per shingle
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.log_path = Path(log_path)
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._buckets: Dict[tuple, Set[str]] = {}
+        self.loaded = self._load()
+
+    def _band_keys(self, signature: np.ndarray) -> List[tuple]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def _insert(self, filename: str, entry: Dict):
+        """Add an entry to the in-memory index (caller holds the lock)."""
+        self._remove(filename)
+        self._entries[filename] = entry
+        for key in self._band_keys(entry["signature"]):
+            self._buckets.setdefault(key, set()).add(filename)
+
+    def _remove(self, filename: str):
+        """Drop an entry from the in-memory index (caller holds the lock)."""
+        entry = self._entries.pop(filename, None)
+        if entry is None:
+            return
+        for key in self._band_keys(entry["signature"]):
+            bucket = self._buckets.get(key)
+            if bucket:
+                bucket.discard(filename)
+                if not bucket:
+                    del self._buckets[key]
+
+    def _load(self) -> bool:
+        """Replay the signature log; returns False when it has to be rebuilt."""
+        if not self.log_path.exists():
+            return False
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record.get("deleted"):
+                        self._remove(record["filename"])
+                        continue
+                    signature = np.frombuffer(base64.b64decode(record["signature"]), dtype=np.uint32)
+                    if signature.size != self.hasher.num_perm:
+                        return False
+                    self._insert(record["filename"], {
+                        "candidate_id": record.get("candidate_id"),
+                        "saved_at": record.get("saved_at", ""),
+                        "signature": signature,
+                    })
+            return True
+        except Exception as e:
+            logger.warning(f"Could not load near-duplicate index: {e}")
+            self._entries, self._buckets = {}, {}
+            return False
+
+    def _append(self, records: List[Dict], truncate: bool = False):
+        """Write records to the log (caller holds the lock)."""
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, "w" if truncate else "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+        except Exception as e:
+            logger.error(f"Could not write near-duplicate index: {e}")
+
+    def _make_entry(self, resume_data: Dict) -> Dict:
+        return {
+            "candidate_id": resume_data.get("candidate_id"),
+            "saved_at": resume_data.get("_metadata", {}).get("saved_at", ""),
+            "signature": self.hasher.signature(shingles(resume_text(resume_data), self.shingle_size)),
+        }
+
+    @staticmethod
+    def _record(filename: str, entry: Dict) -> Dict:
+        return {
+            "filename": filename,
+            "candidate_id": entry["candidate_id"],
+            "saved_at": entry["saved_at"],
+            "signature": base64.b64encode(entry["signature"].tobytes()).decode("ascii"),
+        }
+
+    def add(self, filename: str, resume_data: Dict):
+        """
+        Index a stored resume.
+
+        Args:
+            filename: Stored file name
+            resume_data: Structured resume JSON
+        """
+        entry = self._make_entry(resume_data)
+        with self._lock:
+            self._insert(filename, entry)
+            self._append([self._record(filename, entry)])
+
+    def remove(self, filename: str):
+        """Forget a deleted resume file."""
+        with self._lock:
+            if filename in self._entries:
+                self._remove(filename)
+                self._append([{"filename": filename, "deleted": True}])
+
+    def rebuild(self, entries: Iterable[Dict]):
+        """
+        Rebuild the index (and compact the log) from stored resumes.
+
+        Args:
+            entries: Dicts with filename and the resume data
+        """
+        computed = [(entry["filename"], self._make_entry(entry["data"])) for entry in entries]
+        with self._lock:
+            self._entries, self._buckets = {}, {}
+            for filename, entry in computed:
+                self._insert(filename, entry)
+            self._append([self._record(filename, entry) for filename, entry in computed], truncate=True)
+
+    def similar(self, filename: str) -> List[Dict]:
+        """
+        Near-duplicates of an indexed resume.
+
+        Args:
+            filename: Stored file name
+
+        Returns:
+            List of dicts with filename, candidate_id and similarity
+        """
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is None:
+                return []
+            matches = []
+            for other in self._candidates(filename, entry):
+                similarity = estimate_similarity(entry["signature"], self._entries[other]["signature"])
+                if similarity >= self.threshold:
+                    matches.append({
+                        "filename": other,
+                        "candidate_id": self._entries[other]["candidate_id"],
+                        "similarity": round(similarity, 3),
+                    })
+        return sorted(matches, key=lambda match: match["similarity"], reverse=True)
+
+    def _candidates(self, filename: str, entry: Dict) -> Set[str]:
+        """Files sharing at least one LSH band (caller holds the lock)."""
+        candidates: Set[str] = set()
+        for key in self._band_keys(entry["signature"]):
+            candidates |= self._buckets.get(key, set())
+        candidates.discard(filename)
+        return candidates
+
+    def clusters(self, min_size: int = 2) -> List[Dict]:
+        """
+        Group indexed resumes into near-duplicate clusters.
+
+        Args:
+            min_size: Smallest cluster to return (1 includes singletons)
+
+        Returns:
+            Clusters (largest first), each with members sorted newest first
+        """
+        with self._lock:
+            parent = {filename: filename for filename in self._entries}
+
+            def find(item: str) -> str:
+                while parent[item] != item:
+                    parent[item] = parent[parent[item]]
+                    item = parent[item]
+                return item
+
+            for filename, entry in self._entries.items():
+                for other in self._candidates(filename, entry):
+                    if other > filename and estimate_similarity(
+                        entry["signature"], self._entries[other]["signature"]
+                    ) >= self.threshold:
+                        parent[find(other)] = find(filename)
+
+            groups: Dict[str, List[Dict]] = {}
+            for filename, entry in self._entries.items():
+                groups.setdefault(find(filename), []).append({
+                    "filename": filename,
+                    "candidate_id": entry["candidate_id"],
+                    "saved_at": entry["saved_at"],
+                })
+
+        clusters = []
+        for members in groups.values():
+            if len(members) < min_size:
+                continue
+            members.sort(key=lambda member: member["saved_at"] or "", reverse=True)
+            clusters.append({
+                "cluster_id": members[-1]["candidate_id"] or members[-1]["filename"],
+                "latest": members[0]["filename"],
+                "size": len(members),
+                "members": members,
+            })
+        return sorted(clusters, key=lambda cluster: cluster["size"], reverse=True)
+
+    def latest_per_cluster(self, filenames: Iterable[str]) -> List[str]:
+        """
+        Keep only the most recent version of each near-duplicate cluster.
+
+        Args:
+            filenames: Stored file names to filter (unindexed names are kept)
+
+        Returns:
+            Filtered file names, in input order
+        """
+        filenames = list(filenames)
+        wanted = set(filenames)
+        superseded = set()
+        for cluster in self.clusters(min_size=2):
+            versions = [member["filename"] for member in cluster["members"] if member["filename"] in wanted]
+            superseded.update(versions[1:])
+        return [filename for filename in filenames if filename not in superseded]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,250 @@
+"""Append-only NDJSON result logs with a sidecar index for ranked reads."""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+import os
+import threading
+
+from src import serialization
+
+logger = logging.getLogger(__name__)
+
+# Indexes of recently read runs kept loaded by ResultStore.open
+OPEN_LOG_CACHE_SIZE = 16
+
+# (byte offset, byte length) of one result line
+Span = Tuple[int, int]
+
+
+class ResultLogWriter:
+    """
+    Appends a run's results to `<job_id>.ndjson` as they finish.
+
+    Only a small entry per result (score and byte span) is kept in memory;
+    finalize() turns those into the sidecar index.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize writer (truncates an existing log of the same job).
+
+        Args:
+            path: NDJSON file of the run
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._offset = 0
+        self._lock = threading.Lock()
+        # identity (content hash or candidate id) -> (final score, span); the best copy wins
+        self._best: Dict[str, Tuple[float, Span]] = {}
+        self._by_id: Dict[str, Span] = {}
+        self.appended = 0
+        self.finalized = False
+
+    def append(self, result: Dict):
+        """Write one result line."""
+        line = serialization.dumps(result) + b"\n"
+        score = float(result.get("final_score", 0.0))
+        identity = result.get("content_hash") or result.get("candidate_id")
+        with self._lock:
+            span = (self._offset, len(line))
+            self._file.write(line)
+            self._offset += len(line)
+            self.appended += 1
+            if result.get("candidate_id"):
+                self._by_id[result["candidate_id"]] = span
+            best = self._best.get(identity)
+            if best is None or score > best[0]:
+                self._best[identity] = (score, span)
+
+    def finalize(self, meta: Dict) -> Path:
+        """
+        Close the log and write its index (`<job_id>.idx.json`).
+
+        The ranking collapses copies of the same resume (same content hash)
+        to their best-scoring entry and sorts by final score.
+
+        Args:
+            meta: Run metadata stored in the index (jd_id, timestamp, ...)
+
+        Returns:
+            Path of the index file
+        """
+        with self._lock:
+            self._file.close()
+            ranked = sorted(self._best.values(), key=lambda entry: entry[0], reverse=True)
+            collapsed = self.appended - len(ranked)
+            if collapsed:
+                logger.info(f"Collapsed {collapsed} duplicate resumes")
+            index = {
+                "log": self.path.name,
+                "meta": {**meta, "total_processed": len(ranked)},
+                "order": [span for _, span in ranked],
+                "by_id": self._by_id,
+            }
+        index_path = self.path.with_suffix(".idx.json")
+        tmp_path = index_path.with_suffix(".tmp")
+        serialization.write_json(tmp_path, index, pretty=False)
+        tmp_path.replace(index_path)
+        self.finalized = True
+        return index_path
+
+    def close(self):
+        """Release the log file; a log that was never finalized (failed run) is discarded."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        if not self.finalized:
+            self.path.unlink(missing_ok=True)
+
+
+class ResultLog:
+    """Ranked, read-only view of a finalized result log."""
+
+    def __init__(self, index_path: Path):
+        """
+        Load a log's index.
+
+        Args:
+            index_path: `<job_id>.idx.json` written by ResultLogWriter.finalize
+
+        Raises:
+            OSError, ValueError: If the index cannot be read
+        """
+        self.index_path = Path(index_path)
+        with open(self.index_path, "rb") as f:
+            # Identifies this version of the run's results (for HTTP ETags)
+            self.version = f"{self.index_path.name}.{os.fstat(f.fileno()).st_mtime_ns}"
+            index = serialization.loads(f.read())
+        self.path = self.index_path.parent / index["log"]
+        self.meta: Dict = index["meta"]
+        self._order: List[Span] = [tuple(span) for span in index["order"]]
+        self._by_id: Dict[str, Span] = {key: tuple(span) for key, span in index["by_id"].items()}
+        self._rank = {span: rank for rank, span in enumerate(self._order, 1)}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def _read(self, f, span: Span) -> Dict:
+        f.seek(span[0])
+        result = serialization.loads(f.read(span[1]))
+        rank = self._rank.get(span)
+        if rank is not None:
+            result["rank"] = rank
+        return result
+
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Results of the ranking from `offset` on (rank = offset + 1, ...).
+
+        Args:
+            offset: Number of top results to skip
+            limit: Maximum number of results (all remaining when None)
+
+        Returns:
+            Result dicts with their rank
+        """
+        spans = self._order[offset:offset + limit if limit is not None else None]
+        if not spans:
+            return []
+        with open(self.path, "rb") as f:
+            return [self._read(f, span) for span in spans]
+
+    def iter_ranked(self, batch_size: int = 500) -> Iterator[Dict]:
+        """All ranked results in order, read in batches."""
+        for start in range(0, len(self._order), batch_size):
+            yield from self.page(start, batch_size)
+
+    def get(self, candidate_id: str) -> Optional[Dict]:
+        """
+        One candidate's result (also for duplicates collapsed out of the ranking).
+
+        Args:
+            candidate_id: Candidate id
+
+        Returns:
+            Result dict, or None if the run has no such candidate
+        """
+        span = self._by_id.get(candidate_id)
+        if span is None:
+            return None
+        with open(self.path, "rb") as f:
+            return self._read(f, span)
+
+
+class ResultStore:
+    """Result logs of all runs, with a pointer to the latest finalized one."""
+
+    def __init__(self, results_dir: Path):
+        """
+        Initialize result store.
+
+        Args:
+            results_dir: Directory holding `<job_id>.ndjson` logs and their indexes
+        """
+        self.results_dir = Path(results_dir)
+        self._latest_path = self.results_dir / "latest.json"
+        self._lock = threading.Lock()
+        self._cached: Optional[Tuple[Tuple[int, int], ResultLog]] = None
+        self._open_logs: "OrderedDict[str, Tuple[int, ResultLog]]" = OrderedDict()
+
+    def writer(self, job_id: str) -> ResultLogWriter:
+        """Start the result log of a run."""
+        return ResultLogWriter(self.results_dir / f"{Path(job_id).name}.ndjson")
+
+    def publish(self, writer: ResultLogWriter, meta: Dict) -> ResultLog:
+        """
+        Finalize a run's log and make it the latest results.
+
+        Args:
+            writer: Writer of the finished run
+            meta: Run metadata (jd_id, scoring_mode, timestamp, ...)
+
+        Returns:
+            The finalized log
+        """
+        index_path = writer.finalize(meta)
+        tmp_path = self._latest_path.with_suffix(".tmp")
+        serialization.write_json(tmp_path, {"index": index_path.name}, pretty=False)
+        tmp_path.replace(self._latest_path)
+        return self.latest()
+
+    def open(self, job_id: str) -> Optional[ResultLog]:
+        """Finalized log of a specific run, if any (recently read indexes stay loaded)."""
+        index_path = self.results_dir / f"{Path(job_id).name}.idx.json"
+        try:
+            mtime = os.stat(index_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            cached = self._open_logs.get(job_id)
+            if cached is not None and cached[0] == mtime:
+                self._open_logs.move_to_end(job_id)
+                return cached[1]
+            log = ResultLog(index_path)
+            self._open_logs[job_id] = (mtime, log)
+            if len(self._open_logs) > OPEN_LOG_CACHE_SIZE:
+                self._open_logs.popitem(last=False)
+            return log
+
+    def latest(self) -> Optional[ResultLog]:
+        """Latest finalized log (index cached until another run is published)."""
+        try:
+            stat = os.stat(self._latest_path)
+        except FileNotFoundError:
+            return None
+        # publish() replaces the pointer file, so a new inode or mtime means a new run
+        version = (stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            if self._cached is not None and self._cached[0] == version:
+                return self._cached[1]
+            try:
+                pointer = serialization.read_json(self._latest_path)
+                log = ResultLog(self.results_dir / pointer["index"])
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Error loading latest results: {e}")
+                return None
+            self._cached = (version, log)
+            return log
@@ -0,0 +1,285 @@
+"""Content-hash identity for stored resumes."""
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import hashlib
+import json
+import logging
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Fields that identify a stored copy rather than the resume content
+_VOLATILE_FIELDS = {"candidate_id", "_metadata"}
+
+# Fields of a stored resume served from the index by list views (no file read)
+RESUME_SUMMARY_FIELDS = ("file_id", "candidate_id", "name", "email", "skills", "saved_at")
+
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse punctuation/whitespace so formatting changes hash equally."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def resume_text(resume_data: Dict) -> str:
+    """Text that defines a resume's content (raw text when available, else its fields)."""
+    raw_text = resume_data.get("raw_text")
+    if raw_text:
+        return raw_text
+    content = {key: value for key, value in resume_data.items() if key not in _VOLATILE_FIELDS}
+    return json.dumps(content, sort_keys=True, ensure_ascii=False)
+
+
+def resume_content_hash(resume_data: Dict) -> str:
+    """
+    Hash of a resume's normalized content, independent of file name and candidate_id.
+
+    Args:
+        resume_data: Structured resume JSON
+
+    Returns:
+        SHA-256 hex digest
+    """
+    return hashlib.sha256(normalize_text(resume_text(resume_data)).encode("utf-8")).hexdigest()
+
+
+def resume_fingerprint(resume_data: Dict) -> Optional[str]:
+    """
+    Near-duplicate fingerprint from the candidate name and skill set.
+
+    Two versions of the same CV (e.g. PDF and TXT exports) usually differ in
+    text but agree on name and skills. Returns None when the name is unknown
+    or no skills were extracted, since such fingerprints are not distinctive.
+
+    Args:
+        resume_data: Structured resume JSON
+
+    Returns:
+        SHA-256 hex digest, or None
+    """
+    name = normalize_text(str(resume_data.get("name") or ""))
+    skills = sorted({normalize_text(str(skill)) for skill in resume_data.get("skills") or [] if skill})
+    if not name or name == "unknown" or not skills:
+        return None
+    return hashlib.sha256(f"{name}|{','.join(skills)}".encode("utf-8")).hexdigest()
+
+
+class ResumeIndex:
+    """Persistent content_hash/fingerprint -> stored resume lookup (append-only JSONL log)."""
+
+    def __init__(self, index_path: Path, use_fingerprint: bool = False):
+        """
+        Initialize resume index.
+
+        Args:
+            index_path: JSONL file holding the index
+            use_fingerprint: Also collapse resumes with the same name/skill fingerprint
+        """
+        self.index_path = Path(index_path)
+        self.use_fingerprint = use_fingerprint
+        self._lock = threading.Lock()
+        # content hash -> owning copy; the owner is the first stored file with that content
+        self._hashes: Dict[str, Dict] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._files: Dict[str, str] = {}
+        # Every stored file with its content hash, and the files of each hash in storage order
+        self._file_hashes: Dict[str, str] = {}
+        self._copies: Dict[str, List[str]] = {}
+        self._candidates: Dict[str, str] = {}
+        # One list summary and file mtime per stored file (copies of the same content included)
+        self._summaries: Dict[str, Dict] = {}
+        self._mtimes: Dict[str, Optional[int]] = {}
+        self.loaded = self._load()
+
+    def _load(self) -> bool:
+        """Replay the index log; returns False when it has to be rebuilt."""
+        if not self.index_path.exists():
+            return False
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record.get("deleted"):
+                        self._remove(record["filename"])
+                    elif "summary" not in record:
+                        # Written before the index held list summaries
+                        raise ValueError("index has no summaries")
+                    else:
+                        self._register(record)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not load resume index: {e}")
+            self._reset()
+            return False
+
+    def _reset(self):
+        """Clear the in-memory maps."""
+        self._hashes, self._fingerprints, self._files, self._candidates = {}, {}, {}, {}
+        self._file_hashes, self._copies, self._summaries, self._mtimes = {}, {}, {}, {}
+
+    def _append(self, records: List[Dict], truncate: bool = False):
+        """Write records to the log (caller holds the lock)."""
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.index_path, "w" if truncate else "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(record) + "\n" for record in records)
+        except Exception as e:
+            logger.error(f"Could not save resume index: {e}")
+
+    @staticmethod
+    def _make_record(resume_data: Dict, filename: str, mtime: Optional[int] = None) -> Dict:
+        return {
+            "content_hash": resume_content_hash(resume_data),
+            "fingerprint": resume_fingerprint(resume_data),
+            "candidate_id": resume_data.get("candidate_id"),
+            "filename": filename,
+            "mtime": mtime,
+            "summary": {
+                "name": resume_data.get("name", "Unknown"),
+                "email": resume_data.get("email"),
+                "skills": resume_data.get("skills") or [],
+                "saved_at": resume_data.get("_metadata", {}).get("saved_at"),
+            },
+        }
+
+    def _register(self, record: Dict):
+        """Add a record to the in-memory maps; the first copy of some content wins (caller holds the lock)."""
+        content_hash = record["content_hash"]
+        filename = record["filename"]
+        self._remove(filename)
+        self._summaries[filename] = {"file_id": filename, "candidate_id": record["candidate_id"], **record["summary"]}
+        self._mtimes[filename] = record.get("mtime")
+        if record.get("candidate_id"):
+            self._candidates.setdefault(record["candidate_id"], filename)
+        self._file_hashes[filename] = content_hash
+        self._copies.setdefault(content_hash, []).append(filename)
+        if content_hash not in self._hashes:
+            self._hashes[content_hash] = {"candidate_id": record["candidate_id"], "filename": filename}
+            self._files[filename] = content_hash
+        fingerprint = record.get("fingerprint")
+        if fingerprint and fingerprint not in self._fingerprints:
+            self._fingerprints[fingerprint] = content_hash
+
+    def _remove(self, filename: str) -> bool:
+        """Drop a file from the in-memory maps (caller holds the lock)."""
+        summary = self._summaries.pop(filename, None)
+        if summary is None:
+            return False
+        self._mtimes.pop(filename, None)
+        if self._candidates.get(summary["candidate_id"]) == filename:
+            del self._candidates[summary["candidate_id"]]
+        content_hash = self._file_hashes.pop(filename)
+        copies = self._copies[content_hash]
+        copies.remove(filename)
+        if self._files.pop(filename, None) is None:
+            return True
+        if copies:
+            # Another copy of the same content takes over, so duplicates are still detected
+            owner = copies[0]
+            self._hashes[content_hash] = {"candidate_id": self._summaries[owner]["candidate_id"], "filename": owner}
+            self._files[owner] = content_hash
+        else:
+            del self._copies[content_hash]
+            del self._hashes[content_hash]
+            self._fingerprints = {f: h for f, h in self._fingerprints.items() if h != content_hash}
+        return True
+
+    def rebuild(self, entries: Iterable[Dict]):
+        """
+        Rebuild the index from stored resumes (oldest first, so the original copy wins).
+
+        Args:
+            entries: Dicts with filename, the resume data and optionally the file's mtime
+        """
+        records = [self._make_record(entry["data"], entry["filename"], entry.get("mtime")) for entry in entries]
+        with self._lock:
+            self._reset()
+            for record in records:
+                self._register(record)
+            self._append(records, truncate=True)
+
+    def find(self, resume_data: Dict) -> Optional[Dict]:
+        """
+        Find a stored resume with the same content (or fingerprint, if enabled).
+
+        Args:
+            resume_data: Structured resume JSON
+
+        Returns:
+            Dict with content_hash, candidate_id and filename, or None
+        """
+        content_hash = resume_content_hash(resume_data)
+        with self._lock:
+            entry = self._hashes.get(content_hash)
+            if entry is None and self.use_fingerprint:
+                fingerprint = resume_fingerprint(resume_data)
+                if fingerprint and fingerprint in self._fingerprints:
+                    content_hash = self._fingerprints[fingerprint]
+                    entry = self._hashes.get(content_hash)
+        if entry is None:
+            return None
+        return {"content_hash": content_hash, **entry}
+
+    def add(self, resume_data: Dict, filename: str, mtime: Optional[int] = None) -> str:
+        """
+        Register a newly stored (or changed) resume file.
+
+        Args:
+            resume_data: Structured resume JSON
+            filename: Stored file name
+            mtime: File modification time in ns (lets listings notice outside edits)
+
+        Returns:
+            Content hash
+        """
+        record = self._make_record(resume_data, filename, mtime)
+        with self._lock:
+            self._register(record)
+            self._append([record])
+        return record["content_hash"]
+
+    def filename_for(self, candidate_id: str) -> Optional[str]:
+        """Stored file of a candidate, or None if the candidate is not indexed."""
+        with self._lock:
+            return self._candidates.get(candidate_id)
+
+    def summaries(self) -> List[Dict]:
+        """List summaries (RESUME_SUMMARY_FIELDS) of the stored resumes, newest first."""
+        with self._lock:
+            summaries = [dict(summary) for summary in self._summaries.values()]
+        return sorted(summaries, key=lambda x: x.get("saved_at") or "", reverse=True)
+
+    def filenames(self) -> List[str]:
+        """Stored files with distinct content."""
+        with self._lock:
+            return list(self._files)
+
+    def mtimes(self) -> Dict[str, Optional[int]]:
+        """Modification time (ns) recorded for every indexed file (None when unknown)."""
+        with self._lock:
+            return dict(self._mtimes)
+
+    def remove(self, filename: str) -> Optional[str]:
+        """
+        Forget a deleted resume file.
+
+        Args:
+            filename: Stored file name
+
+        Returns:
+            The copy that took over the file's content hash, if the file owned
+            it and another copy is stored
+        """
+        with self._lock:
+            owned = filename in self._files
+            content_hash = self._file_hashes.get(filename)
+            if not self._remove(filename):
+                return None
+            self._append([{"filename": filename, "deleted": True}])
+            if owned and content_hash in self._hashes:
+                return self._hashes[content_hash]["filename"]
+            return None
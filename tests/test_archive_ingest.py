@@ -0,0 +1,120 @@
+"""Tests for streamed ZIP/tar archive ingestion."""
+import io
+import sys
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ingestion import ArchiveIngestor, UploadProcessor
+from src.ingestion.archive_ingest import ArchiveError, iter_archive_members
+from src.storage import LocalStorage
+
+RESUME_PATH = Path(__file__).parent.parent / "data" / "resumes" / "raw" / "resume_001_maria_garcia.json"
+
+
+class NonSeekableWriter(io.RawIOBase):
+    """Forces zipfile to write data descriptors, like streaming archivers do."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+
+def make_zip(files, streamed=False) -> bytes:
+    target = NonSeekableWriter() if streamed else io.BytesIO()
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return bytes(target.buffer) if streamed else target.getvalue()
+
+
+def make_tar(files) -> bytes:
+    target = io.BytesIO()
+    with tarfile.open(fileobj=target, mode="w:gz") as archive:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    return target.getvalue()
+
+
+FILES = {
+    "cvs/maria.json": RESUME_PATH.read_bytes(),
+    "cvs/plain.txt": b"John Smith\nPython developer with 5 years of experience\n",
+    "notes.docx": b"not a resume",
+}
+
+
+def test_iter_members_zip_and_tar():
+    """ZIP (with and without data descriptors) and tar.gz yield the same members."""
+    for payload in (make_zip(FILES), make_zip(FILES, streamed=True), make_tar(FILES)):
+        members = {name: content for name, content, _ in iter_archive_members(io.BytesIO(payload))}
+        assert members == FILES
+
+
+def test_archive_ingestion_job(tmp_path):
+    """Members are parsed in parallel while the archive is fed in chunks."""
+    processor = UploadProcessor(LocalStorage(str(tmp_path / "storage")), tmp_path / "hashes.jsonl")
+    ingestor = ArchiveIngestor(processor, max_workers=2)
+    payload = make_zip(FILES, streamed=True)
+
+    job = ingestor.start("cvs.zip")
+    for start in range(0, len(payload), 1000):
+        job.stream.put(payload[start:start + 1000])
+    job.stream.close()
+
+    deadline = time.time() + 30
+    while job.finished_at is None and time.time() < deadline:
+        time.sleep(0.05)
+
+    status = job.to_dict()
+    assert status["status"] == "completed"
+    assert status["counts"] == {"total": 3, "ingested": 2, "skipped": 1}
+    assert ingestor.get_job(job.job_id) is job
+
+
+def wait_finished(job, timeout=30):
+    deadline = time.time() + timeout
+    while job.finished_at is None and time.time() < deadline:
+        time.sleep(0.05)
+
+
+def test_oversized_upload_stops_extraction(tmp_path):
+    """The 413 path (abort, then close) ends the job instead of leaving it extracting."""
+    processor = UploadProcessor(LocalStorage(str(tmp_path / "storage")), tmp_path / "hashes.jsonl")
+    ingestor = ArchiveIngestor(processor, max_workers=1)
+    payload = make_zip(FILES, streamed=True)
+
+    job = ingestor.start("cvs.zip")
+    job.stream.max_bytes = len(payload) // 2
+    with pytest.raises(ArchiveError):
+        for start in range(0, len(payload), 100):
+            job.stream.put(payload[start:start + 100])
+    job.stream.abort()
+    job.stream.close()
+
+    wait_finished(job, timeout=5)
+    assert job.status == "error"
+
+
+def test_zip_bomb_members_are_capped():
+    """A member inflating past the limit is rejected whatever its header claims."""
+    bomb = b"\0" * (2 * 1024 * 1024)
+    for payload in (make_zip({"bomb.txt": bomb}), make_zip({"bomb.txt": bomb}, streamed=True)):
+        payload = bytearray(payload)
+        if payload[6] & 0x08 == 0:
+            # Lie about the uncompressed size in the local header
+            payload[22:26] = (100).to_bytes(4, "little")
+        members = list(iter_archive_members(io.BytesIO(bytes(payload)), max_member_size=1024 * 1024))
+        assert members == [("bomb.txt", None, "Member too large (max 1MB)")]
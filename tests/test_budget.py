@@ -0,0 +1,49 @@
+"""Tests for LLM token/cost accounting and budget caps."""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import Config
+from src.llm import Budget, BudgetExceeded, LLMClient, current_budget
+from src.llm.budget import BudgetTracker, DailyBudget, PriceTable, parse_price_overrides
+
+
+def test_cost_uses_longest_prefix_and_cached_price():
+    prices = PriceTable()
+    usage = {"input_tokens": 1_000_000, "output_tokens": 100_000, "input_token_details": {"cache_read": 400_000}}
+    # gpt-4o-mini, not gpt-4o: 600k input at 0.15 + 400k cached at 0.075 + 100k output at 0.60
+    assert prices.cost("openai", "gpt-4o-mini-2024-07-18", usage) == pytest.approx(0.09 + 0.03 + 0.06)
+    assert prices.cost("ollama", "llama2", usage) == 0.0
+    assert parse_price_overrides('{"llama2": [1, 2]}') == {"llama2": (1.0, 1.0, 2.0)}
+
+
+def test_job_cap_stops_dispatching_calls(tmp_path):
+    client = LLMClient(Config(llm_provider="mock", llm_providers="", mock_llm_latency_ms=0.0, cache_path=str(tmp_path)))
+    budget = Budget("job", max_tokens=1)
+    token = current_budget.set(budget)
+    try:
+        client.invoke("Return a JSON object")
+        with pytest.raises(BudgetExceeded):
+            client.invoke("Return a JSON object")
+    finally:
+        current_budget.reset(token)
+
+    assert budget.calls == 1 and budget.tokens > 1 and budget.rejected == 1
+    # Other jobs are not affected
+    client.invoke("Return a JSON object")
+
+
+def test_daily_usage_survives_restart(tmp_path):
+    config = Config(llm_prices='{"mock": [1000, 1000]}', daily_max_cost_usd=0.5, cache_path=str(tmp_path))
+    tracker = BudgetTracker(config)
+
+    class Message:
+        usage_metadata = {"input_tokens": 400, "output_tokens": 100, "total_tokens": 500}
+
+    assert tracker.record("mock", "mock", Message()) == pytest.approx(0.5)
+    with pytest.raises(BudgetExceeded, match="daily"):
+        BudgetTracker(config).check()
+    assert isinstance(tracker.daily, DailyBudget) and tracker.daily.to_dict()["exhausted"]
@@ -0,0 +1,66 @@
+"""Tests for the local embedding similarity engine."""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.embeddings import EmbeddingCache, HashingTextEmbedder, SemanticScorer, tokenize
+
+JD = {
+    "jd_id": "JD1",
+    "title": "Senior Backend Developer - Python",
+    "must_have_requirements": ["Experiencia sólida con FastAPI o Django", "Conocimiento de Kubernetes y Helm"],
+    "description": "Backend Python developer building FastAPI microservices on PostgreSQL and Docker.",
+}
+BACKEND = {"candidate_id": "a", "raw_text": "Python backend engineer. FastAPI, Django, PostgreSQL, Docker, Redis."}
+FRONTEND = {"candidate_id": "b", "raw_text": "Frontend developer: React, TypeScript, CSS, Figma design systems."}
+
+
+def test_tokenize_strips_accents_and_stopwords():
+    """Accents and function words do not affect matching; tech terms survive."""
+    assert tokenize("Experiencia sólida con C++ y Node.js") == ["experiencia", "solida", "c++", "node.js"]
+
+
+def test_embeddings_are_normalized_and_deterministic():
+    """Vectors are unit length and identical across embedder instances."""
+    first = HashingTextEmbedder(256).embed(BACKEND["raw_text"])
+    second = HashingTextEmbedder(256).embed(BACKEND["raw_text"])
+    assert np.isclose(np.linalg.norm(first), 1.0)
+    assert np.array_equal(first, second)
+    assert not HashingTextEmbedder(256).embed("").any()
+
+
+def test_pool_similarity_ranks_relevant_resume_first(tmp_path):
+    """The matching resume scores higher, and must-have coverage is detected."""
+    scorer = SemanticScorer(HashingTextEmbedder(1024), EmbeddingCache(tmp_path, enabled=True))
+    backend, frontend = scorer.analyze_pool(JD, [BACKEND, FRONTEND])
+
+    assert backend["similarity_score"] > frontend["similarity_score"]
+    assert backend["must_have_matches"] == ["Experiencia sólida con FastAPI o Django"]
+    assert frontend["must_have_matches"] == []
+
+
+def test_vectors_are_cached_on_disk(tmp_path):
+    """Each document is embedded once; later scorers read the cached vector."""
+    SemanticScorer(HashingTextEmbedder(64), EmbeddingCache(tmp_path, enabled=True)).embed(BACKEND)
+    assert len(list(tmp_path.rglob("*.npy"))) == 1
+
+    class FailingEmbedder(HashingTextEmbedder):
+        def embed(self, text):
+            raise AssertionError("vector should come from the cache")
+
+    vector = SemanticScorer(FailingEmbedder(64), EmbeddingCache(tmp_path, enabled=True)).embed(BACKEND)
+    assert vector.shape == (64,)
+
+
+def test_similarity_matrix_matches_pool_scores(tmp_path):
+    """The JD x resume matrix agrees with scoring each JD's pool separately."""
+    scorer = SemanticScorer(HashingTextEmbedder(512), EmbeddingCache(tmp_path, enabled=False))
+    frontend_jd = {"jd_id": "JD2", "description": "React and TypeScript frontend developer"}
+    matrix = scorer.similarity_matrix([JD, frontend_jd], [BACKEND, FRONTEND])
+
+    assert matrix.shape == (2, 2)
+    assert np.allclose(matrix[0], scorer.similarities(JD, [BACKEND, FRONTEND]))
+    assert matrix[0, 0] > matrix[0, 1] and matrix[1, 1] > matrix[1, 0]
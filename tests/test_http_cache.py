@@ -0,0 +1,105 @@
+"""Tests for ETags, conditional GETs and response compression."""
+import os
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import config
+from src.api import CompressionMiddleware, conditional_get, etag_matches, make_etag
+from src.storage import LocalStorage
+
+
+def make_app(state):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/items")
+    async def items(request: Request, response: Response):
+        not_modified = conditional_get(request, response, "items", state["revision"])
+        if not_modified is not None:
+            return not_modified
+        state["built"] += 1
+        return [{"id": i, "text": "x" * 20} for i in range(100)]
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    return app
+
+
+def test_etag_comparison_is_weak():
+    etag = make_etag("results", "v1")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag[2:]}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(make_etag("results", "v2"), etag)
+    assert not etag_matches(None, etag)
+
+
+def test_unchanged_revision_gets_304():
+    state = {"revision": 1, "built": 0}
+    client = TestClient(make_app(state))
+    first = client.get("/items")
+    etag = first.headers["etag"]
+
+    again = client.get("/items", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    assert state["built"] == 1
+
+    state["revision"] = 2
+    changed = client.get("/items", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+
+def test_large_responses_are_gzipped():
+    client = TestClient(make_app({"revision": 1, "built": 0}))
+    response = client.get("/items", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()) == 100
+    raw = client.get("/items", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+    assert int(response.headers["content-length"]) < len(raw.content)
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_storage_revisions_change_with_the_stored_files(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    resumes, jds = storage.revision("resume"), storage.revision("jd")
+    assert storage.revision("resume") == resumes and storage.revision("jd") == jds
+
+    storage.save_resume({"candidate_id": "c1", "name": "A", "raw_text": "a"})
+    assert storage.revision("resume") != resumes
+
+    path = Path(storage.save_jd({"jd_id": "jd1", "title": "T"}))
+    after_save = storage.revision("jd")
+    assert after_save != jds
+    path.unlink()
+    assert storage.revision("jd") != after_save
+
+
+def test_resume_revision_does_not_rescan_unchanged_storage(tmp_path, monkeypatch):
+    storage = LocalStorage(str(tmp_path))
+    path = Path(storage.save_resume({"candidate_id": "c1", "name": "A", "raw_text": "a"}))
+    revision = storage.revision("resume")
+
+    scans = []
+    original = storage.resume_index.mtimes
+    monkeypatch.setattr(storage.resume_index, "mtimes", lambda: scans.append(1) or original())
+    assert storage.revision("resume") == revision
+    assert scans == []
+
+    # Edited in place: picked up once the sync interval has passed
+    stat = path.stat()
+    path.write_text('{"candidate_id": "c1", "name": "B", "raw_text": "b"}')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    monkeypatch.setattr(config, "storage_sync_interval", 0.0)
+    assert storage.revision("resume") != revision
+    assert scans == [1]
@@ -0,0 +1,51 @@
+"""Tests for checkpointed, resumable processing runs."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.storage import JobCheckpoint
+
+
+def test_resume_skips_completed_candidates(tmp_path):
+    params = {"resume_files": ["a.json", "b.json", "c.json"], "jd_file": "jd.json", "scoring_mode": "llm"}
+    checkpoint = JobCheckpoint.create(tmp_path, "job1", params)
+    checkpoint.record("b.json", {"candidate_id": "b", "final_score": 70.0})
+
+    # A crash cuts off the line being written
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write('{"type": "result", "resume_file": "c.json", "res')
+
+    loaded = JobCheckpoint.load(tmp_path, "job1")
+    assert loaded.status == "running"
+    assert loaded.completed == {"b.json"}
+    assert list(loaded.iter_results()) == [{"candidate_id": "b", "final_score": 70.0}]
+    assert loaded.pending() == ["a.json", "c.json"]
+    assert loaded.params["jd_file"] == "jd.json"
+
+
+def test_finished_jobs_are_listed_with_status(tmp_path):
+    checkpoint = JobCheckpoint.create(tmp_path, "job2", {"resume_files": ["a.json"], "scoring_mode": "llm"})
+    checkpoint.record("a.json", {"final_score": 50.0})
+    checkpoint.finish("completed")
+
+    (job,) = JobCheckpoint.list_jobs(tmp_path)
+    assert job["job_id"] == "job2" and job["status"] == "completed"
+    assert job["total"] == job["completed"] == 1
+
+
+def test_resumed_job_does_not_append_to_a_torn_line(tmp_path):
+    params = {"resume_files": ["a.json", "b.json"], "scoring_mode": "llm"}
+    checkpoint = JobCheckpoint.create(tmp_path, "job3", params)
+    checkpoint.record("a.json", {"final_score": 60.0})
+    with open(checkpoint.path, "ab") as f:
+        f.write(b'{"type": "result", "resume_file": "b.json", "res')
+
+    resumed = JobCheckpoint.load(tmp_path, "job3")
+    resumed.record("b.json", {"final_score": 40.0})
+    resumed.finish("completed")
+
+    loaded = JobCheckpoint.load(tmp_path, "job3")
+    assert loaded.status == "completed"
+    assert loaded.completed == {"a.json", "b.json"}
+    assert loaded.pending() == []
@@ -0,0 +1,48 @@
+"""Tests for reverse matching (shortlisting JDs for a candidate)."""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.embeddings import EmbeddingCache, HashingTextEmbedder, JobMatcher, SemanticScorer
+from src.storage import LocalStorage
+
+
+def make_matcher(tmp_path):
+    storage = LocalStorage(str(tmp_path / "storage"))
+    scorer = SemanticScorer(HashingTextEmbedder(256), EmbeddingCache(tmp_path / "vectors", enabled=False))
+    return storage, JobMatcher(storage, scorer)
+
+
+def test_shortlist_ranks_fitting_roles_first(tmp_path):
+    storage, matcher = make_matcher(tmp_path)
+    storage.save_jd({"jd_id": "backend", "title": "Backend", "raw_text": "Python FastAPI PostgreSQL backend",
+                     "must_have_requirements": ["Python", "PostgreSQL"]})
+    storage.save_jd({"jd_id": "design", "title": "Designer", "raw_text": "Figma UX research visual design",
+                     "must_have_requirements": ["Figma"]})
+
+    resume = {"candidate_id": "c1", "raw_text": "Backend developer: Python, FastAPI and PostgreSQL"}
+    shortlist = matcher.shortlist(resume, top_n=2)
+
+    assert [entry["profile"]["jd_id"] for entry in shortlist] == ["backend", "design"]
+    assert shortlist[0]["must_have_matches"] == ["Python", "PostgreSQL"]
+    assert shortlist[0]["prescore"] > shortlist[1]["prescore"]
+    assert len(matcher.shortlist(resume, top_n=1)) == 1
+
+
+def test_profiles_follow_storage_changes(tmp_path):
+    storage, matcher = make_matcher(tmp_path)
+    path = Path(storage.save_jd({"jd_id": "a", "raw_text": "Java Spring"}))
+    storage.save_jd({"jd_id": "b", "raw_text": "React TypeScript"})
+    assert matcher.refresh() == 2
+
+    # Edited JDs are re-profiled, deleted ones dropped
+    storage.save_jd({"jd_id": "a", "raw_text": "Go Kubernetes"}, filename=path.name)
+    os.utime(path, (0, 0))
+    matcher.refresh()
+    shortlist = matcher.shortlist({"raw_text": "Go and Kubernetes engineer"}, top_n=1)
+    assert shortlist[0]["profile"]["jd_id"] == "a"
+
+    storage.delete(path.name, "jd")
+    assert matcher.refresh() == 1
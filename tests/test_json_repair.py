@@ -0,0 +1,104 @@
+"""Tests for tolerant JSON parsing and the structured scoring call."""
+import sys
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import AIMessage
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import Config
+from src.llm import AnalysisError, ChatRequest, IncrementalJSONParser, JSONRepairError, LLMAnalyzer, LLMClient, repair_json
+from src.prompts import PromptLoader
+
+ANALYSIS = {
+    "overall_score": 82.5,
+    "similarity_score": 75,
+    "must_have_matches": ["Python"],
+    "reason_codes": ["SKILL_MATCH: Python"],
+    "matched_sections": {"Python": "skills"},
+}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('```json\n{"a": 1, "b": [1, 2,],}\n```', {"a": 1, "b": [1, 2]}),
+    ("Here you go:\n{'score': 85.5, 'ok': True, 'note': None} Hope it helps!", {"score": 85.5, "ok": True, "note": None}),
+    ('{score: 80, codes: ["A" "B"], // comment\n "text": "line1\nline2"}', {"score": 80, "codes": ["A", "B"], "text": "line1\nline2"}),
+    ('{"a": {"b": {"c": {"d": [1, {"e": 2}]}}}}', {"a": {"b": {"c": {"d": [1, {"e": 2}]}}}}),
+    ('{"score": 82, "codes": ["SKILL_MATCH: Py', {"score": 82, "codes": ["SKILL_MATCH: Py"]}),
+    ('{"score": 82, "reason_co', {"score": 82}),
+])
+def test_repair_json(text, expected):
+    """Common LLM formatting mistakes and truncation are repaired."""
+    assert repair_json(text, roots="{") == expected
+
+
+def test_no_json_raises():
+    with pytest.raises(JSONRepairError):
+        repair_json("I cannot help with that.")
+
+
+def test_incremental_snapshots_are_always_valid():
+    """Every prefix of a streamed object yields a parseable snapshot."""
+    text = '{"overall_score": 82.5, "must_have_matches": ["Python", "SQL"], "matched_sections": {"Python": "skills"}}'
+    parser = IncrementalJSONParser()
+    for char in text:
+        parser.feed(char)
+        assert parser.snapshot() is None or parser.partial() is not None
+    assert parser.done and parser.result() == repair_json(text)
+
+
+class ScriptedClient(LLMClient):
+    """Mock-provider client whose responses are replaced by a fixed script."""
+
+    def __init__(self, responses):
+        super().__init__(Config(llm_provider="mock", llm_providers="", mock_llm_latency_ms=0.0))
+        self.responses = list(responses)
+        self.histories = []
+
+    def _generate_with_failover(self, backends, template, variables, schema=None):
+        self.histories.append(template.history)
+        return AIMessage(content=self.responses.pop(0))
+
+
+def test_unusable_answer_is_reasked_once():
+    """A broken answer triggers one targeted re-ask that includes the problem."""
+    client = ScriptedClient(['{"overall_score": "high"}', str(ANALYSIS)])
+    analysis = LLMAnalyzer(client, PromptLoader()).analyze_candidate({"raw_text": "Python"}, {"description": "Python"})
+
+    assert analysis["overall_score"] == 82.5 and analysis["similarity_score"] == 75.0
+    assert "overall_score must be a number" in client.histories[1][1][1]
+
+
+def test_failed_analysis_raises_instead_of_scoring_zero():
+    """Two unusable answers raise, so the candidate is reported as failed rather than ranked."""
+    client = ScriptedClient(["no idea", "still no JSON"])
+    with pytest.raises(AnalysisError):
+        LLMAnalyzer(client, PromptLoader()).analyze_candidate({"raw_text": "Python"}, {"description": "Python"})
+
+
+def test_streamed_scores_are_published_before_completion():
+    """With streaming on, the provisional analysis arrives before the final one and matches its scores."""
+    client = LLMClient(Config(llm_provider="mock", llm_providers="", mock_llm_latency_ms=0.0, llm_streaming=True))
+    partials = []
+    analysis = LLMAnalyzer(client, PromptLoader()).analyze_candidate(
+        {"raw_text": "Python and SQL", "skills": ["Python"]},
+        {"description": "Backend", "must_have_requirements": ["Python", "SQL"]},
+        on_provisional=partials.append,
+    )
+
+    assert len(partials) == 1
+    assert partials[0]["overall_score"] == analysis["overall_score"]
+    assert partials[0]["similarity_score"] == analysis["similarity_score"]
+
+
+def test_shared_prefix_is_marked_cacheable():
+    """The JD prefix comes before the candidate and carries Anthropic's cache breakpoint."""
+    request = ChatRequest("Candidate Resume: ...", system="Score candidates.", prefix="Job Description: ...")
+    anthropic = request.template("anthropic").format_messages()[1].content
+    assert anthropic[0]["cache_control"] == {"type": "ephemeral"}
+    assert [block["text"] for block in anthropic] == ["Job Description: ...", "Candidate Resume: ..."]
+
+    openai = request.template("openai").format_messages()[1].content
+    assert openai.startswith("Job Description: ...") and openai.endswith("Candidate Resume: ...")
+    assert request.cache_key == ChatRequest("Another candidate", system="Score candidates.", prefix="Job Description: ...").cache_key
@@ -0,0 +1,46 @@
+"""Tests for the in-process metrics registry."""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.monitoring import MetricsRegistry, RunStageTimings
+
+
+def test_time_stage_records_histogram_and_run():
+    """Stage timings go to the global histogram and the run breakdown."""
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    run = RunStageTimings()
+
+    with registry.time_stage("scoring", run):
+        pass
+    registry.record_stage("llm_call", 0.5, run)
+
+    text = registry.render_prometheus()
+    assert 'talent_stage_duration_seconds_bucket{stage="llm_call",le="1"} 1' in text
+    assert 'talent_stage_duration_seconds_bucket{stage="llm_call",le="0.1"} 0' in text
+    assert 'talent_stage_duration_seconds_count{stage="scoring"} 1' in text
+
+    breakdown = run.as_dict()
+    assert list(breakdown)[0] == "llm_call"
+    assert breakdown["llm_call"]["count"] == 1
+
+
+def test_errors_counted_by_type():
+    """Exceptions inside a stage are counted and re-raised."""
+    registry = MetricsRegistry()
+    with pytest.raises(KeyError):
+        with registry.time_stage("load"):
+            raise KeyError("missing")
+    assert 'talent_errors_total{stage="load",type="KeyError"} 1' in registry.render_prometheus()
+
+
+def test_collectors_render_gauges():
+    """Registered collectors are rendered as gauges at scrape time."""
+    registry = MetricsRegistry()
+    registry.register_collector(lambda: [("talent_llm_queue_depth", {"provider": "mock"}, 3)])
+    text = registry.render_prometheus()
+    assert "# TYPE talent_llm_queue_depth gauge" in text
+    assert 'talent_llm_queue_depth{provider="mock"} 3' in text
@@ -0,0 +1,98 @@
+"""Tests for the offline mock LLM provider."""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import Config
+from src.llm import LLMClient, LLMAnalyzer
+from src.llm.mock_llm import MockChatModel, MockRateLimitError, build_mock_analysis
+from src.prompts import PromptLoader
+
+RESUME = {
+    "candidate_id": "mock-001",
+    "name": "Maria Garcia",
+    "skills": ["Python", "FastAPI", "Docker"],
+    "raw_text": "Senior backend engineer with 6 years of Python and PostgreSQL experience.",
+}
+
+JD = {
+    "jd_id": "jd-mock",
+    "description": "Backend engineer to build Python APIs.",
+    "must_have_requirements": ["Python", "PostgreSQL", "Kubernetes"],
+}
+
+
+def make_client(**overrides) -> LLMClient:
+    """LLM client backed by the mock provider with no simulated latency."""
+    settings = {"llm_provider": "mock", "llm_providers": "", "mock_llm_latency_ms": 0.0}
+    settings.update(overrides)
+    return LLMClient(Config(**settings))
+
+
+def test_analysis_is_deterministic_and_schema_valid():
+    """The same resume/JD pair always yields the same valid analysis."""
+    analyzer = LLMAnalyzer(make_client(), PromptLoader())
+
+    first = analyzer.analyze_candidate(RESUME, JD)
+    second = analyzer.analyze_candidate(RESUME, JD)
+
+    assert first == second
+    assert 0.0 <= first["similarity_score"] <= 100.0
+    assert 0.0 <= first["overall_score"] <= 100.0
+    assert first["must_have_matches"] == ["Python", "PostgreSQL"]
+    assert first["matched_sections"]["Python"] == "skills"
+
+
+def test_missing_requirements_lower_the_score():
+    """Candidates covering fewer must-haves score lower."""
+    prompt_template = PromptLoader()
+    strong = build_mock_analysis(prompt_template.format_prompt(
+        "scoring_prompt",
+        job_description="", must_have_requirements="Python\nSQL",
+        resume_text="Python and SQL", candidate_name="A", candidate_skills="",
+    ))
+    weak = build_mock_analysis(prompt_template.format_prompt(
+        "scoring_prompt",
+        job_description="", must_have_requirements="Python\nSQL",
+        resume_text="Marketing", candidate_name="A", candidate_skills="",
+    ))
+    assert strong["similarity_score"] > weak["similarity_score"]
+
+
+def test_simulated_rate_limits():
+    """A rate-limit probability of 1 always raises a 429."""
+    model = MockChatModel(latency_ms=0.0, rate_limit_rate=1.0)
+    with pytest.raises(MockRateLimitError):
+        model.invoke("return json")
+
+
+def test_plain_text_prompt():
+    """Non-JSON prompts get a short text answer."""
+    assert "OK" in make_client().invoke("Say OK", parse_json=False)
+
+
+def test_overloads_fail_over_and_retry_only_the_last_provider(monkeypatch):
+    """A 429 moves on to the next provider at once; the last one is retried via its limiter."""
+    client = make_client(llm_overload_retries=2)
+    primary, backup = SimpleNamespace(name="primary"), SimpleNamespace(name="backup")
+    outcomes = {"primary": [MockRateLimitError("429")], "backup": [MockRateLimitError("429"), "answer"]}
+    calls = []
+
+    def generate(backend, template, variables, schema=None):
+        calls.append(backend.name)
+        outcome = outcomes[backend.name].pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(client, "_generate", generate)
+    assert client._generate_with_failover([primary, backup], None, {}) == "answer"
+    assert calls == ["primary", "backup", "backup"]
+
+    outcomes["backup"] = [ValueError("bad request")]
+    with pytest.raises(ValueError):
+        client._generate_with_failover([backup], None, {})
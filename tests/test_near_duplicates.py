@@ -0,0 +1,57 @@
+"""Tests for MinHash/LSH near-duplicate resume clustering."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.storage import LocalStorage, MinHasher
+from src.storage.minhash import estimate_similarity, shingles
+
+BASE_CV = (
+    "Maria Garcia Senior Backend Engineer Madrid. Eight years building Python services with "
+    "Django, FastAPI and PostgreSQL. Led the migration of a payments platform to AWS using "
+    "Docker and Kubernetes, reducing infrastructure cost by thirty percent. Mentored five "
+    "engineers and introduced code review guidelines. Previously worked at Telefonica on "
+    "data pipelines with Kafka and Spark. Education: MSc Computer Science, Universidad "
+    "Politecnica de Madrid. Languages: Spanish native, English C1."
+)
+UPDATED_CV = BASE_CV + " Recently completed the AWS Solutions Architect certification."
+OTHER_CV = (
+    "John Smith Frontend Developer London. Four years of React, TypeScript and GraphQL "
+    "experience building design systems for e-commerce. Strong focus on accessibility and "
+    "performance budgets. BSc Mathematics, University of Leeds."
+)
+
+
+def resume(text):
+    return {"name": " ".join(text.split()[:2]), "raw_text": text}
+
+
+def test_signature_similarity_tracks_jaccard():
+    """Small edits keep a high estimated similarity; unrelated CVs score near zero."""
+    hasher = MinHasher()
+    base = hasher.signature(shingles(BASE_CV))
+    assert estimate_similarity(base, hasher.signature(shingles(UPDATED_CV))) > 0.8
+    assert estimate_similarity(base, hasher.signature(shingles(OTHER_CV))) < 0.2
+    assert (hasher.signature(shingles(BASE_CV)) == base).all()
+
+
+def test_clusters_and_latest_version(tmp_path):
+    """Versions of one CV form a cluster whose newest member is kept for scoring."""
+    storage = LocalStorage(str(tmp_path))
+    old_path = storage.save_resume(resume(BASE_CV))
+    new_path = storage.save_resume(resume(UPDATED_CV))
+    other_path = storage.save_resume(resume(OTHER_CV))
+
+    clusters = storage.resume_clusters()
+    assert len(clusters) == 1
+    assert clusters[0]["latest"] == Path(new_path).name
+    assert [match["filename"] for match in storage.similar_resumes(Path(old_path).name)] == [Path(new_path).name]
+
+    assert storage.latest_resume_files([old_path, new_path, other_path]) == [new_path, other_path]
+
+    # The signature log is replayed on restart and honours deletions
+    storage.delete(Path(other_path).name, "resume")
+    reloaded = LocalStorage(str(tmp_path))
+    assert len(reloaded.near_duplicates) == 2
+    assert len(reloaded.resume_clusters()) == 1
@@ -0,0 +1,77 @@
+"""Tests for compiled prompt templates and hot reload."""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.prompts import CompiledTemplate, PromptLoader, PromptTemplateError
+
+
+def write_prompt(tmp_path, name, text, mtime):
+    path = tmp_path / "templates" / f"{name}.txt"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_variables_are_parsed_once_and_checked():
+    template = CompiledTemplate("greeting", "Hello {name}, {{literal}} {user.title}")
+    assert template.variables == {"name", "user"}
+
+    with pytest.raises(PromptTemplateError, match="name"):
+        template.render(user="x")
+    with pytest.raises(PromptTemplateError):
+        CompiledTemplate("broken", "JSON: {\"score\": 1}")
+
+
+def test_missing_variable_raises_instead_of_returning_raw_template(tmp_path):
+    loader = PromptLoader(tmp_path)
+    with pytest.raises(PromptTemplateError):
+        loader.format_prompt("scoring_prefix", job_description="Backend")
+
+
+def test_edited_prompt_is_reloaded(tmp_path):
+    loader = PromptLoader(tmp_path, hot_reload=True, reload_interval=0)
+    write_prompt(tmp_path, "scoring_prefix", "JD: {job_description}\n{must_have_requirements}", 1000)
+    before = loader.content_hash()
+    assert loader.format_prompt("scoring_prefix", job_description="A", must_have_requirements="B") == "JD: A\nB"
+
+    write_prompt(tmp_path, "scoring_prefix", "Role: {job_description}\n{must_have_requirements}", 2000)
+    assert loader.format_prompt("scoring_prefix", job_description="A", must_have_requirements="B") == "Role: A\nB"
+    assert loader.content_hash() != before
+
+    # A broken edit is rejected and the last good version stays in use
+    write_prompt(tmp_path, "scoring_prefix", "Role: {job_title}", 3000)
+    assert loader.format_prompt("scoring_prefix", job_description="A", must_have_requirements="B") == "Role: A\nB"
+
+
+def test_rejected_edit_leaves_the_template_in_use_untouched(tmp_path, monkeypatch):
+    loader = PromptLoader(tmp_path, hot_reload=True, reload_interval=0)
+    write_prompt(tmp_path, "scoring_prefix", "JD: {job_description}\n{must_have_requirements}", 1000)
+    path = tmp_path / "templates" / "scoring_prefix.txt"
+    template = loader.get_template("scoring_prefix")
+
+    write_prompt(tmp_path, "scoring_prefix", "Role: {job_title}", 2000)
+    assert loader.get_template("scoring_prefix") is template
+    assert (template.path, template.mtime) == (path, 1000)
+
+    # Not recompiled until the file changes again
+    compiles = []
+    original = loader._compile
+    monkeypatch.setattr(loader, "_compile", lambda name: compiles.append(name) or original(name))
+    assert loader.get_template("scoring_prefix") is template
+    assert compiles == []
+
+    write_prompt(tmp_path, "scoring_prefix", "Role: {job_description}\n{must_have_requirements}", 3000)
+    assert loader.get_template("scoring_prefix").text.startswith("Role:")
+    assert compiles == ["scoring_prefix"]
+
+
+def test_validate_rejects_unknown_variables(tmp_path):
+    write_prompt(tmp_path, "scoring_candidate", "{resume_text} {years_of_experience}", 1000)
+    with pytest.raises(PromptTemplateError, match="years_of_experience"):
+        PromptLoader(tmp_path).validate()
+    assert set(PromptLoader().validate()) >= {"scoring_system", "scoring_prefix", "scoring_candidate"}
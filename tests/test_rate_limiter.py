@@ -0,0 +1,84 @@
+"""Tests for the LLM rate limiter and AIMD concurrency controller."""
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.llm.rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ProviderRateLimiter,
+    TokenBucket,
+    is_overload_error,
+)
+
+
+class RateLimitError(Exception):
+    """Stand-in for the provider SDK rate limit error."""
+
+
+def test_token_bucket_wait_time():
+    """An empty bucket reports how long until enough tokens refill."""
+    bucket = TokenBucket(rate_per_minute=60)
+    now = time.monotonic()
+    assert bucket.wait_time(60, now) == 0.0
+    bucket.consume(60)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0, abs=0.05)
+
+
+def test_disabled_bucket_never_waits():
+    """A rate of 0 disables the bucket."""
+    bucket = TokenBucket(rate_per_minute=0)
+    bucket.consume(1000)
+    assert bucket.wait_time(1000, time.monotonic()) == 0.0
+    assert bucket.available is None
+
+
+def test_aimd_backs_off_and_ramps_up():
+    """Overload halves the limit; successes grow it back additively."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, min_limit=1, max_limit=8, cooldown_seconds=0)
+    limiter.acquire()
+    limiter.release("overload")
+    assert int(limiter.limit) == 4
+
+    for _ in range(40):
+        limiter.acquire()
+        limiter.release("success")
+    assert int(limiter.limit) == 8
+
+
+def test_slot_classifies_errors():
+    """429-style errors count as overloads, other errors do not touch the limit."""
+    limiter = ProviderRateLimiter("test", initial_concurrency=4, max_concurrency=4)
+
+    with pytest.raises(RateLimitError):
+        with limiter.slot(10):
+            raise RateLimitError("Error code: 429 - rate limit exceeded")
+    assert limiter.metrics()["overloads"] == 1
+    assert limiter.metrics()["concurrency_limit"] == 2
+
+    with pytest.raises(ValueError):
+        with limiter.slot(10):
+            raise ValueError("bad prompt")
+    metrics = limiter.metrics()
+    assert metrics["errors"] == 1
+    assert metrics["concurrency_limit"] == 2
+    assert metrics["in_flight"] == 0
+
+
+def test_slot_refunds_unused_tokens():
+    """Actual usage reported by the provider replaces the estimate."""
+    limiter = ProviderRateLimiter("test", tokens_per_minute=1000)
+    with limiter.slot(500) as slot:
+        slot.record_tokens(100)
+    assert limiter.metrics()["tokens"] == 100
+    assert limiter.token_bucket.available == pytest.approx(900, abs=5)
+
+
+def test_is_overload_error():
+    """Timeouts and 429s are overloads, generic errors are not."""
+    assert is_overload_error(TimeoutError())
+    assert is_overload_error(RateLimitError("too many requests"))
+    assert not is_overload_error(ValueError("invalid json"))
@@ -0,0 +1,87 @@
+"""Tests for append-only result logs and their index."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.storage import ResultStore
+
+
+def result(candidate_id, score, content_hash=None):
+    return {"candidate_id": candidate_id, "final_score": score, "content_hash": content_hash or candidate_id}
+
+
+def test_ranked_pages_and_lookup(tmp_path):
+    store = ResultStore(tmp_path)
+    writer = store.writer("job1")
+    for candidate_id, score in [("a", 40.0), ("b", 90.0), ("c", 65.0), ("d", 10.0)]:
+        writer.append(result(candidate_id, score))
+    store.publish(writer, {"jd_id": "jd1"})
+
+    latest = store.latest()
+    assert len(latest) == 4 and latest.meta["jd_id"] == "jd1"
+    assert [(r["candidate_id"], r["rank"]) for r in latest.page(1, 2)] == [("c", 2), ("a", 3)]
+    assert latest.page(10, 5) == []
+    assert latest.get("d")["rank"] == 4
+    assert latest.get("missing") is None
+    assert [r["candidate_id"] for r in latest.iter_ranked(batch_size=3)] == ["b", "c", "a", "d"]
+
+
+def test_duplicates_rank_once_with_best_score(tmp_path):
+    store = ResultStore(tmp_path)
+    writer = store.writer("job2")
+    writer.append(result("a", 50.0, "same"))
+    writer.append(result("a-copy", 70.0, "same"))
+    writer.append(result("b", 60.0))
+    latest = store.publish(writer, {})
+
+    assert [r["candidate_id"] for r in latest.page()] == ["a-copy", "b"]
+    assert latest.meta["total_processed"] == 2
+    # The collapsed copy can still be looked up, without a rank
+    assert "rank" not in latest.get("a")
+
+
+def test_latest_follows_the_last_published_run(tmp_path):
+    store = ResultStore(tmp_path)
+    first = store.writer("run1")
+    first.append(result("a", 10.0))
+    store.publish(first, {"jd_id": "jd1"})
+    assert store.latest().meta["jd_id"] == "jd1"
+
+    # A run still being written does not replace the published results
+    second = store.writer("run2")
+    second.append(result("b", 20.0))
+    assert store.latest().meta["jd_id"] == "jd1"
+
+    store.publish(second, {"jd_id": "jd2"})
+    assert store.latest().meta["jd_id"] == "jd2"
+    assert store.open("run1").get("a")["final_score"] == 10.0
+    assert ResultStore(tmp_path / "empty").latest() is None
+
+
+def test_detail_reads_do_not_change_stored_results(tmp_path):
+    store = ResultStore(tmp_path)
+    writer = store.writer("job3")
+    writer.append(result("a", 80.0))
+    store.publish(writer, {})
+
+    log = store.open("job3")
+    detail = log.get("a")
+    detail["full_resume"] = {"name": "A"}
+    assert "full_resume" not in log.get("a") and "full_resume" not in log.page()[0]
+    assert store.open("job3") is log
+    assert store.open("missing") is None
+
+
+def test_closing_an_unpublished_log_discards_it(tmp_path):
+    store = ResultStore(tmp_path)
+    failed = store.writer("failed")
+    failed.append(result("a", 10.0))
+    failed.close()
+    assert not failed.path.exists() and store.open("failed") is None
+
+    published = store.writer("ok")
+    published.append(result("a", 10.0))
+    store.publish(published, {})
+    published.close()
+    assert len(store.open("ok")) == 1
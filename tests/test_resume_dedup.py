@@ -0,0 +1,142 @@
+"""Tests for content-hash resume deduplication and the score cache."""
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scoring import ScoreCache
+from src.storage import LocalStorage, resume_content_hash
+
+RESUME_TEXT = "Maria Garcia\nSenior Python developer\nSkills: Python, Django, AWS\n"
+
+
+def make_resume(text=RESUME_TEXT, **fields):
+    return {"name": "Maria Garcia", "skills": ["Python", "Django"], "raw_text": text, **fields}
+
+
+def test_content_hash_ignores_formatting_and_ids():
+    """Whitespace, case and candidate_id do not change the content hash."""
+    original = make_resume(candidate_id="a")
+    reformatted = make_resume("  MARIA GARCIA\r\n\nSenior Python developer.\nSkills: Python,Django, AWS", candidate_id="b")
+    assert resume_content_hash(original) == resume_content_hash(reformatted)
+    assert resume_content_hash(original) != resume_content_hash(make_resume("Someone else"))
+
+
+def test_duplicate_resume_reuses_stored_record(tmp_path):
+    """Saving the same content twice keeps one file and one candidate_id."""
+    storage = LocalStorage(str(tmp_path))
+    first_path, first_duplicate = storage.save_resume_unique(make_resume())
+    second = make_resume()
+    second_path, second_duplicate = storage.save_resume_unique(second)
+
+    assert (first_duplicate, second_duplicate) == (False, True)
+    assert second_path == first_path
+    assert len(storage.list_resumes()) == 1
+    assert second["candidate_id"] == storage.list_resumes()[0]["candidate_id"]
+
+    # The index is rebuilt from stored files when missing
+    (tmp_path / "resume_index.jsonl").unlink()
+    assert LocalStorage(str(tmp_path)).save_resume_unique(make_resume())[1] is True
+
+
+def test_fingerprint_dedup_is_optional(tmp_path):
+    """Same name and skills with different text only collapse when fingerprints are enabled."""
+    storage = LocalStorage(str(tmp_path))
+    storage.save_resume(make_resume())
+    assert storage.save_resume_unique(make_resume("Maria Garcia - PDF export"))[1] is False
+
+    storage = LocalStorage(str(tmp_path / "fp"))
+    storage.resume_index.use_fingerprint = True
+    storage.save_resume(make_resume())
+    assert storage.save_resume_unique(make_resume("Maria Garcia - PDF export"))[1] is True
+
+
+def test_resume_lookup_by_candidate_id_uses_index(tmp_path, monkeypatch):
+    """A candidate's resume is found through the index, without scanning the directory."""
+    storage = LocalStorage(str(tmp_path))
+    resume = make_resume(candidate_id="cand-1")
+    storage.save_resume(resume, "custom_name.json")
+
+    monkeypatch.setattr(Path, "glob", lambda *args: (_ for _ in ()).throw(AssertionError("scanned")))
+    assert storage.get_resume("cand-1")["candidate_id"] == "cand-1"
+    assert LocalStorage(str(tmp_path)).get_resume("cand-1")["name"] == "Maria Garcia"
+
+    monkeypatch.undo()
+    storage.delete("custom_name.json", "resume")
+    assert storage.resume_index.filename_for("cand-1") is None
+
+
+def test_remaining_copy_takes_over_a_removed_original(tmp_path):
+    """Deleting the stored original keeps duplicates detected through another copy."""
+    storage = LocalStorage(str(tmp_path))
+    original = Path(storage.save_resume(make_resume(candidate_id="cand-1")))
+    copy = storage.resumes_dir / "copy.json"
+    copy.write_bytes(original.read_bytes())
+    storage.list_resumes()
+
+    original.unlink()
+    storage.list_resumes()
+    assert storage.resume_index.find(make_resume())["filename"] == "copy.json"
+    path, duplicate = storage.save_resume_unique(make_resume(candidate_id="cand-2"))
+    assert duplicate and Path(path) == copy
+    assert storage.resume_index.filenames() == ["copy.json"]
+
+    storage.delete("copy.json", "resume")
+    assert storage.resume_index.find(make_resume()) is None
+
+
+def test_score_cache_computes_once_for_concurrent_duplicates(tmp_path):
+    """Concurrent requests for the same key share one computation."""
+    cache = ScoreCache(tmp_path, enabled=True, ttl=0)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"final_score": 80.0}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sum(1 for result in results if result.get("cached")) == 3
+
+    # Failed scores are not cached
+    cache.get_or_compute("bad", lambda: {"final_score": 0.0}, should_cache=lambda result: False)
+    assert cache.get("bad") is None
+
+
+def test_uncached_scores_are_still_computed_one_at_a_time(tmp_path):
+    """Without a cached result, waiters and late callers never compute concurrently."""
+    cache = ScoreCache(tmp_path, enabled=True, ttl=0)
+    running, overlaps = [], []
+
+    def compute():
+        running.append(1)
+        if len(running) > 1:
+            overlaps.append(1)
+        time.sleep(0.02)
+        running.pop()
+        return {"final_score": 0.0}
+
+    def call(delay):
+        time.sleep(delay)
+        cache.get_or_compute("k", compute, should_cache=lambda result: False)
+
+    threads = [threading.Thread(target=call, args=(i * 0.01,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == []
+    assert cache._inflight == {}
@@ -0,0 +1,56 @@
+"""Tests for the JSON serializer layer."""
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import serialization
+from src.api import json_response
+
+RECORD = {"name": "María García", "skills": ["Python", "Go"], "score": 87.5, "nested": {"ok": True, "none": None}}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "orjson" and serialization.orjson is None:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(serialization, "BACKEND", request.param)
+    return request.param
+
+
+def test_backends_produce_the_same_json(backend):
+    compact = serialization.dumps(RECORD)
+    assert compact == json.dumps(RECORD, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert serialization.dumps(RECORD, pretty=True) == json.dumps(RECORD, indent=2, ensure_ascii=False).encode("utf-8")
+    assert serialization.loads(compact) == serialization.loads(compact.decode("utf-8")) == RECORD
+
+
+def test_numpy_scores_serialize_as_numbers(backend):
+    if backend == "stdlib":
+        pytest.skip("the json module needs plain floats")
+    assert serialization.loads(serialization.dumps({"score": np.float64(0.5)})) == {"score": 0.5}
+
+
+def test_files_are_pretty_unless_compact_storage(tmp_path, backend, monkeypatch):
+    path = tmp_path / "record.json"
+    serialization.write_json(path, RECORD)
+    assert b"\n  " in path.read_bytes()
+    monkeypatch.setattr(serialization.config, "storage_json_compact", True)
+    serialization.write_json(path, RECORD)
+    assert b"\n" not in path.read_bytes()
+    assert serialization.read_json(path) == RECORD
+
+
+def test_json_response_keeps_endpoint_headers(backend):
+    from starlette.responses import Response
+
+    endpoint_response = Response()
+    endpoint_response.headers["ETag"] = 'W/"abc"'
+    response = json_response([RECORD], endpoint_response)
+    assert response.headers["etag"] == 'W/"abc"'
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.body) == [RECORD]
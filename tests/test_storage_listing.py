@@ -0,0 +1,93 @@
+"""Tests for paged, projected listings of stored resumes and JDs."""
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.storage import LocalStorage
+
+
+def save_resumes(storage, count):
+    for i in range(count):
+        storage.save_resume({
+            "candidate_id": f"cand-{i}",
+            "name": f"Candidate {i}",
+            "skills": ["Python"],
+            "raw_text": f"Candidate {i} " + "x" * 1000,
+        })
+
+
+def test_summary_pages_come_from_the_index(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    save_resumes(storage, 5)
+    # Summary pages do not read the resume files (unchanged mtimes)
+    for path in storage.resumes_dir.glob("*.json"):
+        stat = path.stat()
+        path.write_text("not json")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    page, total = storage.page_resumes(["candidate_id", "name"], offset=1, limit=2)
+    assert total == 5
+    assert page == [{"candidate_id": "cand-3", "name": "Candidate 3"}, {"candidate_id": "cand-2", "name": "Candidate 2"}]
+
+
+def test_other_fields_read_only_the_page(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    save_resumes(storage, 3)
+
+    page, total = storage.page_resumes(["name", "raw_text"], limit=1)
+    assert total == 3 and len(page) == 1
+    assert page[0]["name"] == "Candidate 2" and page[0]["raw_text"].startswith("Candidate 2")
+    full, _ = storage.page_resumes()
+    assert [resume["candidate_id"] for resume in full] == ["cand-2", "cand-1", "cand-0"]
+
+
+def test_index_without_summaries_is_rebuilt(tmp_path):
+    save_resumes(LocalStorage(str(tmp_path)), 2)
+    index_path = tmp_path / "resume_index.jsonl"
+    records = [json.loads(line) for line in index_path.read_text().splitlines()]
+    index_path.write_text("".join(json.dumps({k: v for k, v in r.items() if k != "summary"}) + "\n" for r in records))
+
+    storage = LocalStorage(str(tmp_path))
+    assert {summary["name"] for summary in storage.list_resumes()} == {"Candidate 0", "Candidate 1"}
+
+
+def test_files_changed_outside_the_api_are_listed(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    save_resumes(storage, 2)
+    revision = storage.revision("resume")
+
+    # A copy of a stored resume and a new resume dropped into the directory
+    copy = storage.resumes_dir / "copy_of_cand_0.json"
+    copy.write_bytes((storage.resumes_dir / "resume_cand-0.json").read_bytes())
+    (storage.resumes_dir / "manual.json").write_text(json.dumps({"candidate_id": "manual", "name": "Manual"}))
+
+    _, total = storage.page_resumes(["file_id"])
+    assert total == len(list(storage.resumes_dir.glob("*.json"))) == 4
+    assert storage.revision("resume") != revision
+    assert {s["file_id"] for s in storage.list_resumes()} >= {"copy_of_cand_0.json", "manual.json"}
+
+    copy.unlink()
+    assert storage.page_resumes(["file_id"])[1] == 3
+    # The copy's removal keeps the original indexed for duplicate detection
+    _, duplicate = storage.save_resume_unique({"candidate_id": "x", "name": "Candidate 0", "skills": ["Python"],
+                                               "raw_text": "Candidate 0 " + "x" * 1000})
+    assert duplicate
+
+    reloaded = LocalStorage(str(tmp_path))
+    assert reloaded.page_resumes(["file_id"])[1] == 3
+
+
+def test_jd_summaries_follow_file_changes(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    path = Path(storage.save_jd({"jd_id": "jd1", "title": "Backend engineer", "raw_text": "..."}))
+    assert storage.page_jds(["jd_id", "title"]) == ([{"jd_id": "jd1", "title": "Backend engineer"}], 1)
+
+    data = json.loads(path.read_text())
+    data["title"] = "Platform engineer"
+    path.write_text(json.dumps(data))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert storage.list_jds()[0]["title"] == "Platform engineer"
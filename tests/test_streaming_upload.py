@@ -0,0 +1,72 @@
+"""Tests for single-pass upload reading and hash-based upload deduplication."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ingestion import UploadProcessor, UploadReader, UploadRejected
+from src.ingestion.streaming_upload import MAX_UPLOAD_SIZES, sniff_file_type
+from src.storage import LocalStorage
+
+RESUME_PATH = Path(__file__).parent.parent / "data" / "resumes" / "raw" / "resume_001_maria_garcia.json"
+
+
+def read_bytes(filename: str, content: bytes, chunk_size: int = 7):
+    """Feed content through an UploadReader in small chunks."""
+    reader = UploadReader(filename)
+    for start in range(0, len(content), chunk_size):
+        reader.feed(content[start:start + chunk_size])
+    return reader.finish()
+
+
+def test_sniff_file_type():
+    """PDF magic wins over the extension; unknown extensions are sniffed."""
+    assert sniff_file_type(b"%PDF-1.4", "cv.txt") == "pdf"
+    assert sniff_file_type(b'{"name": "x"}', "cv.json") == "json"
+    assert sniff_file_type(b'  {"name": "x"}', "upload") == "json"
+    assert sniff_file_type(b"Maria Garcia", "cv.txt") == "txt"
+    assert sniff_file_type(b"MZ", "setup.exe") is None
+    with pytest.raises(UploadRejected):
+        sniff_file_type(b"hello", "cv.pdf")
+
+
+def test_hash_is_computed_while_reading():
+    """The digest matches a one-shot hash of the content."""
+    import hashlib
+
+    content = RESUME_PATH.read_bytes()
+    upload = read_bytes("cv.json", content)
+    assert upload.sha256 == hashlib.sha256(content).hexdigest()
+    assert upload.size == len(content)
+
+
+def test_size_limit_enforced_while_streaming():
+    """Oversized uploads are rejected as soon as the limit is crossed."""
+    reader = UploadReader("big.txt")
+    reader.feed(b"a" * MAX_UPLOAD_SIZES["txt"])
+    with pytest.raises(UploadRejected):
+        reader.feed(b"a")
+
+
+def test_duplicate_upload_reuses_stored_resume(tmp_path):
+    """Re-uploading identical bytes returns the stored record without reprocessing."""
+    processor = UploadProcessor(LocalStorage(str(tmp_path / "storage")), tmp_path / "hashes.jsonl")
+    content = RESUME_PATH.read_bytes()
+
+    first = processor.ingest_resume(read_bytes("a.json", content))
+    second = processor.ingest_resume(read_bytes("copy.json", content))
+
+    assert first["duplicate"] is False
+    assert second["duplicate"] is True
+    assert second["path"] == first["path"]
+    assert json.loads(Path(first["path"]).read_text(encoding="utf-8"))["candidate_id"] == first["id"]
+
+
+def test_invalid_json_rejected(tmp_path):
+    """Malformed JSON is reported as a rejected upload."""
+    processor = UploadProcessor(LocalStorage(str(tmp_path / "storage")), tmp_path / "hashes.jsonl")
+    with pytest.raises(UploadRejected):
+        processor.ingest_resume(read_bytes("bad.json", b"{not json"))
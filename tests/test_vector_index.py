@@ -0,0 +1,82 @@
+"""Tests for the memory-mapped vector matrix, IVF search and candidate retrieval."""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.embeddings import CandidateRetriever, EmbeddingCache, HashingTextEmbedder, SemanticScorer, VectorIndex
+from src.storage import LocalStorage
+
+
+def clustered_vectors(n, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(40, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, 40, n)] + 0.3 * rng.normal(size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_ivf_search_matches_exact_search(tmp_path):
+    """Once trained, IVF search finds (nearly) the same neighbours as a full scan."""
+    vectors = clustered_vectors(5000, 32)
+    index = VectorIndex(tmp_path, dim=32)
+    index.add_many([(f"r{i}", vector, {"candidate_id": f"c{i}"}) for i, vector in enumerate(vectors)])
+    assert index._centroids is not None
+
+    query = vectors[123]
+    approximate = index.search(query, top_n=10, nprobe=8)
+    exact = index.search(query, top_n=10, exact=True)
+    assert approximate[0]["id"] == "r123" and approximate[0]["candidate_id"] == "c123"
+    assert len({hit["id"] for hit in approximate} & {hit["id"] for hit in exact}) >= 8
+
+
+def test_index_persists_and_handles_deletes(tmp_path):
+    """Rows survive a reopen; deleted ids are never returned."""
+    vectors = clustered_vectors(100, 16)
+    index = VectorIndex(tmp_path, dim=16, signature="v1")
+    index.add_many([(f"r{i}", vector, {}) for i, vector in enumerate(vectors)])
+    index.remove("r5")
+
+    reopened = VectorIndex(tmp_path, dim=16, signature="v1")
+    assert len(reopened) == 99
+    assert "r5" not in {hit["id"] for hit in reopened.search(vectors[5], top_n=5)}
+    assert reopened.search(vectors[7], top_n=1)[0]["id"] == "r7"
+
+    # A different embedder signature starts a fresh index
+    assert len(VectorIndex(tmp_path, dim=16, signature="v2")) == 0
+
+
+def test_retriever_tracks_storage(tmp_path):
+    """Saved resumes are indexed on save and found for a matching JD."""
+    storage = LocalStorage(str(tmp_path / "storage"))
+    scorer = SemanticScorer(HashingTextEmbedder(256), EmbeddingCache(tmp_path / "vectors", enabled=False))
+    retriever = CandidateRetriever(storage, scorer, tmp_path / "index")
+
+    storage.save_resume({"candidate_id": "py", "name": "Py Dev", "raw_text": "Python FastAPI PostgreSQL backend"})
+    storage.save_resume({"candidate_id": "fe", "name": "Fe Dev", "raw_text": "React TypeScript CSS frontend"})
+
+    result = retriever.top_candidates({"raw_text": "Backend engineer: Python, FastAPI"}, top_n=2)
+    assert result["total_indexed"] == 2
+    assert result["candidates"][0]["candidate_id"] == "py"
+
+    # A retriever started later picks up existing resumes through sync()
+    fresh = CandidateRetriever(storage, scorer, tmp_path / "fresh_index")
+    assert fresh.sync() == {"added": 2, "removed": 0, "total": 2}
+
+
+def test_hits_read_ids_and_info_back_from_the_id_log(tmp_path):
+    """Replaced rows return their latest info, also after a reopen."""
+    vectors = clustered_vectors(20, 16)
+    index = VectorIndex(tmp_path, dim=16)
+    index.add_many([(f"r{i}", vector, {"name": f"v1-{i}"}) for i, vector in enumerate(vectors)])
+    index.add("r3", vectors[3], {"name": "v2-3"})
+    index.remove("r4")
+    (hit,) = index.search(vectors[3], top_n=1)
+    assert (hit["id"], hit["name"]) == ("r3", "v2-3")
+    index.close()
+
+    reopened = VectorIndex(tmp_path, dim=16)
+    assert len(reopened) == 19
+    assert reopened.search(vectors[3], top_n=1)[0]["name"] == "v2-3"
+    assert "r4" not in {hit["id"] for hit in reopened.search(vectors[4], top_n=20)}